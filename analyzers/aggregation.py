@@ -0,0 +1,60 @@
+"""
+섹터 점수 집계 - 청크 단위로 누적 (메모리는 섹터 수에만 비례)
+"""
+from typing import Dict, Iterable
+
+class SectorScoreAccumulator:
+    """섹터별 Simple / Weighted 평균을 누적 합계로 계산"""
+
+    def __init__(self):
+        self._totals: Dict[str, Dict] = {}
+
+    def add(self, analyzed_news: Iterable[Dict]):
+        """분석된 뉴스 누적"""
+        for news in analyzed_news:
+            sector = news.get('sector', 'Unknown')
+            sentiment = news.get('sentiment_score', 0.0)
+            weight = news.get('weight', 1.0) or 0.0
+
+            totals = self._totals.get(sector)
+            if totals is None:
+                totals = self._totals[sector] = {
+                    'etf': news.get('etf', ''),
+                    'sum': 0.0,
+                    'weighted_sum': 0.0,
+                    'weight_sum': 0.0,
+                    'count': 0
+                }
+
+            totals['sum'] += sentiment
+            totals['weighted_sum'] += sentiment * weight
+            totals['weight_sum'] += weight
+            totals['count'] += 1
+
+    def scores(self) -> Dict[str, Dict]:
+        """섹터별 점수 {'etf', 'simple', 'weighted', 'count'}"""
+        result = {}
+        for sector, totals in self._totals.items():
+            if totals['count'] == 0:
+                continue
+
+            simple = totals['sum'] / totals['count']
+            weighted = (totals['weighted_sum'] / totals['weight_sum']
+                        if totals['weight_sum'] > 0 else simple)
+
+            result[sector] = {
+                'etf': totals['etf'],
+                'simple': round(simple, 4),
+                'weighted': round(weighted, 4),
+                'count': totals['count']
+            }
+
+        return result
+
+    def totals(self) -> Dict[str, Dict]:
+        """섹터별 누적 합계 {'etf', 'sum', 'weighted_sum', 'weight_sum', 'count'} (재집계용)"""
+        return {sector: dict(t) for sector, t in self._totals.items()}
+
+    @property
+    def total_count(self) -> int:
+        return sum(t['count'] for t in self._totals.values())
@@ -0,0 +1,226 @@
+"""
+유사 중복 뉴스 탐지 - MinHash + LSH
+"""
+import hashlib
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.instrumentation import record_cache
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_WORD_RE = re.compile(r'[a-z0-9]+')
+_TAG_RE = re.compile(r'<[^>]+>')  # RSS 요약의 HTML 태그 (속성/URL이 단어로 섞이지 않게)
+
+class NearDuplicateDetector:
+    """제목/요약 shingle의 MinHash 서명을 LSH 밴드 버킷에 색인
+
+    삽입 시 같은 버킷에 있는 후보만 비교하므로 누적 문서 수가 늘어도
+    삽입 비용은 후보 수에만 비례합니다.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.5,
+                 shingle_size: int = 2, seed: int = 1):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm은 bands로 나누어 떨어져야 합니다")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+        self._b = rng.randint(0, _MERSENNE_PRIME, size=num_perm, dtype=np.int64)
+
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[int, np.ndarray] = {}
+        self._cluster_of: Dict[int, int] = {}
+        self._date_of: Dict[int, str] = {}
+        self._next_id = 0
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def _shingles(self, title: str, summary: str = '') -> set:
+        """제목 + 요약의 단어 n-gram shingle (요약이 제목으로 시작하면 제목을 한 번만 포함)"""
+        words = _WORD_RE.findall(title.lower())
+        summary_words = _WORD_RE.findall(_TAG_RE.sub(' ', summary).lower())
+        if summary_words[:len(words)] == words:
+            words = summary_words
+        else:
+            words = words + summary_words
+
+        n = self.shingle_size
+        if len(words) < n:
+            return {' '.join(words)} if words else set()
+        return {' '.join(words[i:i + n]) for i in range(len(words) - n + 1)}
+
+    def signature(self, title: str, summary: str = '') -> Optional[np.ndarray]:
+        """MinHash 서명 (shingle이 없으면 None)"""
+        shingles = self._shingles(title, summary)
+        if not shingles:
+            return None
+
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest(), 'little')
+             for s in shingles),
+            dtype=np.int64, count=len(shingles)
+        ) % _MERSENNE_PRIME
+
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes()
+                for i in range(self.bands)]
+
+    def insert(self, title: str, summary: str = '', date: str = '') -> Tuple[int, bool]:
+        """문서 삽입 → (클러스터 ID, 새 클러스터 여부)"""
+        signature = self.signature(title, summary)
+        doc_id = self._next_id
+        self._next_id += 1
+
+        if signature is None:
+            self._cluster_of[doc_id] = doc_id
+            return doc_id, True
+
+        keys = self._band_keys(signature)
+
+        # 같은 버킷 후보 중 추정 Jaccard가 가장 높은 문서
+        best_doc, best_sim = None, self.threshold
+        seen = set()
+        for band, key in enumerate(keys):
+            for candidate in self._buckets[band].get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+
+                similarity = float(np.mean(self._signatures[candidate] == signature))
+                if similarity >= best_sim:
+                    best_doc, best_sim = candidate, similarity
+
+        for band, key in enumerate(keys):
+            self._buckets[band].setdefault(key, []).append(doc_id)
+
+        self._signatures[doc_id] = signature
+        self._date_of[doc_id] = date
+
+        if best_doc is None:
+            self._cluster_of[doc_id] = doc_id
+            return doc_id, True
+
+        cluster_id = self._cluster_of[best_doc]
+        self._cluster_of[doc_id] = cluster_id
+        return cluster_id, False
+
+    def clusters(self) -> set:
+        """색인에 남아 있는 클러스터 ID"""
+        return set(self._cluster_of.values())
+
+    def prune_before(self, date: str) -> int:
+        """date 이전 문서를 색인에서 제거 (장기 실행 시 윈도우 유지)"""
+        expired = [doc for doc, d in self._date_of.items() if d and d < date]
+        if not expired:
+            return 0
+
+        expired_set = set(expired)
+        for doc in expired:
+            for band, key in enumerate(self._band_keys(self._signatures[doc])):
+                bucket = self._buckets[band].get(key)
+                if bucket is None:
+                    continue
+                bucket[:] = [d for d in bucket if d not in expired_set]
+                if not bucket:
+                    del self._buckets[band][key]
+
+            del self._signatures[doc]
+            del self._date_of[doc]
+            del self._cluster_of[doc]
+
+        return len(expired)
+
+def sector_key(news: Dict) -> str:
+    """중복 제거 단위 - 섹터 (섹터 정보가 없으면 티커)"""
+    return news.get('sector') or news.get('ticker', '')
+
+def drop_sector_duplicates(news_list: List[Dict], seen: Optional[set] = None) -> List[Dict]:
+    """같은 섹터에 이미 있는 클러스터의 뉴스 제거 ('cluster_id'가 있는 뉴스)
+
+    여러 종목에 실린 같은 기사가 섹터 평균을 부풀리지 않게 섹터당 1건만 남깁니다.
+    seen: 이전 결과의 (클러스터 ID, 섹터) 집합 - 읽기만 하므로 저장 후 호출자가 갱신
+    """
+    kept = []
+    keys = set()
+    for news in news_list:
+        key = (news.get('cluster_id'), sector_key(news))
+        if key[0] is not None and (key in keys or (seen is not None and key in seen)):
+            continue
+        keys.add(key)
+        kept.append(news)
+    return kept
+
+def analyze_deduplicated(analyzer, news_list: List[Dict],
+                         detector: Optional[NearDuplicateDetector] = None,
+                         verbose: bool = True, deadline=None) -> List[Dict]:
+    """유사 중복을 묶어 클러스터당 대표 1건만 분석하고 점수를 공유
+
+    - 모든 뉴스에 'cluster_id'를 기록
+    - 같은 섹터 안의 중복은 종목이 달라도 제거 (섹터 평균 부풀림 방지)
+    - 섹터 정보가 없는 뉴스는 티커 단위로 제거 (소속 연결 후 drop_sector_duplicates 사용)
+    - 다른 섹터에 실린 같은 기사는 점수만 공유하고 유지
+    - detector는 호출마다 새로 만드는 것이 기본 (수집 데몬처럼 누적 실행할 때만 공유)
+    - deadline이 끝나 대표 기사가 분석되지 않은 클러스터는 빼고 해당 종목을 skipped에 기록
+    """
+    detector = detector or NearDuplicateDetector()
+
+    representatives: Dict[int, Dict] = {}
+    kept: List[Dict] = []
+    seen_in_sector = set()
+
+    for news in news_list:
+        cluster_id, _ = detector.insert(
+            news.get('title', ''),
+            news.get('summary', ''),
+            news.get('published_at', '')[:10]
+        )
+        news['cluster_id'] = cluster_id
+
+        key = (cluster_id, sector_key(news))
+        if key in seen_in_sector:
+            continue
+        seen_in_sector.add(key)
+
+        representatives.setdefault(cluster_id, news)
+        kept.append(news)
+
+    analyzer.batch_analyze(list(representatives.values()), verbose=verbose, deadline=deadline)
+
+    if deadline is not None:
+        scored = []
+        for news in kept:
+            if 'sentiment_score' in representatives[news['cluster_id']]:
+                scored.append(news)
+            else:
+                deadline.skip(news.get('ticker', ''))
+        kept = scored
+        representatives = {cid: rep for cid, rep in representatives.items()
+                           if 'sentiment_score' in rep}
+
+    # 대표 기사의 점수를 재사용한 건수 = 분석 캐시 적중
+    record_cache('dedup', hit=True, count=len(kept) - len(representatives))
+    record_cache('dedup', hit=False, count=len(representatives))
+
+    for news in kept:
+        representative = representatives[news['cluster_id']]
+        if news is not representative:
+            news['sentiment_score'] = representative['sentiment_score']
+            news['category'] = analyzer.categorize_news(news.get('title', ''))
+
+    if verbose:
+        print(f"  유사 중복 제거: {len(news_list)}개 → {len(kept)}개 "
+              f"(분석 {len(representatives)}건)")
+
+    return kept
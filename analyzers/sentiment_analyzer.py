@@ -1,11 +1,12 @@
 """
 감성 분석기 - FinBERT + VADER 하이브리드
 """
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import torch
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 from typing import List, Dict
 import re
+import time
+
+from src.instrumentation import record_analysis
 
 class SentimentAnalyzer:
     """FinBERT + VADER 하이브리드 감성 분석"""
@@ -19,6 +20,9 @@ class SentimentAnalyzer:
         # FinBERT 초기화 (옵션)
         if use_finbert:
             try:
+                # torch/transformers는 FinBERT를 쓸 때만 로드 (VADER만 쓰면 수 초 절약)
+                from transformers import AutoTokenizer, AutoModelForSequenceClassification
+                
                 print("📊 FinBERT 모델 로드 중...")
                 self.finbert_tokenizer = AutoTokenizer.from_pretrained("ProsusAI/finbert")
                 self.finbert_model = AutoModelForSequenceClassification.from_pretrained("ProsusAI/finbert")
@@ -31,6 +35,8 @@ class SentimentAnalyzer:
     def analyze_with_finbert(self, text: str) -> float:
         """FinBERT로 감성 분석"""
         try:
+            import torch
+            
             # 텍스트 전처리
             text = self._preprocess_text(text)
             
@@ -62,6 +68,35 @@ class SentimentAnalyzer:
             print(f"  ⚠️ FinBERT 분석 실패: {e}")
             return 0.0
     
+    def analyze_with_finbert_batch(self, texts: List[str], batch_size: int = 32) -> List[float]:
+        """FinBERT 배치 분석 (batch_size건씩 패딩해서 한 번에 추론)"""
+        import torch
+
+        scores = []
+        for start in range(0, len(texts), batch_size):
+            batch = [self._preprocess_text(t) for t in texts[start:start + batch_size]]
+            try:
+                inputs = self.finbert_tokenizer(
+                    batch,
+                    return_tensors="pt",
+                    truncation=True,
+                    max_length=512,
+                    padding=True
+                )
+
+                with torch.no_grad():
+                    outputs = self.finbert_model(**inputs)
+                    predictions = torch.nn.functional.softmax(outputs.logits, dim=-1)
+
+                # FinBERT: [positive, negative, neutral]
+                scores.extend((predictions[:, 0] - predictions[:, 1]).tolist())
+
+            except Exception as e:
+                print(f"  ⚠️ FinBERT 배치 분석 실패: {e}")
+                scores.extend([0.0] * len(batch))
+
+        return scores
+
     def analyze_with_vader(self, text: str) -> float:
         """VADER로 감성 분석"""
         try:
@@ -149,19 +184,33 @@ class SentimentAnalyzer:
         
         return news
     
-    def batch_analyze(self, news_list: List[Dict]) -> List[Dict]:
-        """뉴스 리스트 일괄 분석"""
+    def batch_analyze(self, news_list: List[Dict], verbose: bool = True,
+                      deadline=None) -> List[Dict]:
+        """뉴스 리스트 일괄 분석
+        
+        deadline(src.deadline.Deadline)이 끝나면 멈추고 분석한 뉴스까지만 반환하며,
+        남은 뉴스의 종목은 deadline.skipped에 기록합니다.
+        """
         analyzed = []
         
         total = len(news_list)
+        start = time.perf_counter()
         
         for idx, news in enumerate(news_list):
-            if (idx + 1) % 10 == 0:
+            if deadline is not None and deadline.expired():
+                for rest in news_list[idx:]:
+                    deadline.skip(rest.get('ticker', ''))
+                break
+            
+            if verbose and (idx + 1) % 10 == 0:
                 print(f"  분석 중... {idx + 1}/{total}")
             
             analyzed_news = self.analyze_news(news)
             analyzed.append(analyzed_news)
         
-        print(f"✅ {total}개 뉴스 분석 완료")
+        record_analysis(len(analyzed), time.perf_counter() - start)
+        
+        if verbose:
+            print(f"✅ {len(analyzed)}개 뉴스 분석 완료")
         
         return analyzed
@@ -0,0 +1,199 @@
+"""
+감성 트렌드 엔진 - 날짜×티커 행렬 기반 롤링/감쇠 점수
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+class SentimentTrendEngine:
+    """티커/섹터별 롤링 평균, 시간 감쇠 점수, 기간별 변화량 계산"""
+
+    def __init__(self, windows: Sequence[int] = (1, 7, 30), half_life_days: float = 7,
+                 signal_window: int = 7):
+        self.windows = tuple(sorted(set(int(w) for w in windows)))
+        self.half_life_days = half_life_days
+        self.signal_window = signal_window
+
+    @classmethod
+    def from_config(cls) -> 'SentimentTrendEngine':
+        """Config 설정값으로 엔진 생성"""
+        from config.config import Config
+        return cls(
+            windows=Config.TREND_WINDOWS,
+            half_life_days=Config.TREND_HALF_LIFE_DAYS,
+            signal_window=Config.TREND_SIGNAL_WINDOW
+        )
+
+    @staticmethod
+    def frame_from_news(analyzed_news: List[Dict]) -> pd.DataFrame:
+        """분석된 뉴스 리스트를 히스토리 저장소와 같은 형태의 DataFrame으로 변환"""
+        return pd.DataFrame([{
+            'ticker': n.get('ticker', ''),
+            'company_name': n.get('company_name', ''),
+            'sector': n.get('sector', ''),
+            'published_at': n.get('published_at', '')[:10],
+            'sentiment_score': n.get('sentiment_score', 0.0)
+        } for n in analyzed_news],
+            columns=['ticker', 'company_name', 'sector', 'published_at', 'sentiment_score'])
+
+    def build_matrix(self, frame: pd.DataFrame, as_of: Optional[str] = None) -> Optional[Dict]:
+        """날짜×티커 밀집 행렬 생성 (일별 감성 합계 / 뉴스 수)"""
+        frame = frame[frame['ticker'].astype(bool)]
+        dates = pd.to_datetime(frame['published_at'].str[:10], format='%Y-%m-%d', errors='coerce')
+        frame = frame.assign(date=dates).dropna(subset=['date'])
+
+        if frame.empty:
+            return None
+
+        end = pd.Timestamp(as_of) if as_of else frame['date'].max()
+        frame = frame[frame['date'] <= end]
+        if frame.empty:
+            return None
+
+        date_index = pd.date_range(frame['date'].min(), end, freq='D')
+
+        # 티커 메타데이터 (가장 최근 값)
+        meta = (frame.sort_values('date')
+                .groupby('ticker')[['company_name', 'sector']]
+                .last())
+        tickers = meta.index
+
+        grouped = frame.groupby(['date', 'ticker'])['sentiment_score'].agg(['sum', 'count'])
+        sums = (grouped['sum'].unstack('ticker')
+                .reindex(index=date_index, columns=tickers, fill_value=0.0)
+                .fillna(0.0))
+        counts = (grouped['count'].unstack('ticker')
+                  .reindex(index=date_index, columns=tickers, fill_value=0)
+                  .fillna(0))
+
+        return {
+            'dates': date_index,
+            'tickers': tickers,
+            'meta': meta,
+            'sums': sums.to_numpy(dtype=np.float64),
+            'counts': counts.to_numpy(dtype=np.float64)
+        }
+
+    @staticmethod
+    def _sector_matrix(matrix: Dict):
+        """티커→섹터 원-핫 행렬 (T×K)"""
+        sectors = matrix['meta']['sector'].fillna('Unknown').astype(str)
+        codes, sector_names = pd.factorize(sectors, sort=True)
+        onehot = np.zeros((len(codes), len(sector_names)), dtype=np.float64)
+        onehot[np.arange(len(codes)), codes] = 1.0
+        return onehot, pd.Index(sector_names)
+
+    @staticmethod
+    def _rolling(sums: np.ndarray, counts: np.ndarray, window: int):
+        """누적합 기반 롤링 평균 (뉴스 없는 구간은 NaN)"""
+        zero = np.zeros((1, sums.shape[1]))
+        cum_sums = np.vstack([zero, np.cumsum(sums, axis=0)])
+        cum_counts = np.vstack([zero, np.cumsum(counts, axis=0)])
+
+        n = sums.shape[0]
+        upper = np.arange(1, n + 1)
+        lower = np.maximum(upper - window, 0)
+
+        window_sums = cum_sums[upper] - cum_sums[lower]
+        window_counts = cum_counts[upper] - cum_counts[lower]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(window_counts > 0, window_sums / window_counts, np.nan)
+
+        return means, window_counts
+
+    def _decayed(self, sums: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """지수 시간 감쇠 점수 (반감기 기준, 뉴스 수 가중)"""
+        alpha = 1 - 0.5 ** (1.0 / self.half_life_days)
+        decayed_sums = pd.DataFrame(sums).ewm(alpha=alpha, adjust=True).mean().to_numpy()
+        decayed_counts = pd.DataFrame(counts).ewm(alpha=alpha, adjust=True).mean().to_numpy()
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(decayed_counts > 0, decayed_sums / decayed_counts, np.nan)
+
+    def _summarize(self, sums: np.ndarray, counts: np.ndarray, index: pd.Index) -> Dict:
+        """최신일 기준 윈도우별 평균/변화량 + 일별 시계열"""
+        summary = pd.DataFrame(index=index)
+        series = {}
+
+        for window in self.windows:
+            means, window_counts = self._rolling(sums, counts, window)
+            series[window] = means
+
+            latest = means[-1]
+            previous = means[-1 - window] if means.shape[0] > window else np.full(means.shape[1], np.nan)
+
+            summary[f'mean_{window}d'] = latest
+            summary[f'change_{window}d'] = latest - previous
+            summary[f'count_{window}d'] = window_counts[-1]
+
+        decayed = self._decayed(sums, counts)
+        summary['decayed'] = decayed[-1]
+
+        return {'summary': summary, 'rolling': series, 'decayed': decayed}
+
+    def compute(self, frame: pd.DataFrame, as_of: Optional[str] = None) -> Optional[Dict]:
+        """티커/섹터 트렌드 계산
+
+        Returns:
+            {
+                'as_of': 기준일,
+                'tickers': 티커별 요약 DataFrame,
+                'sectors': 섹터별 요약 DataFrame,
+                'sector_decayed': 날짜×섹터 감쇠 점수 DataFrame (차트용),
+                'sector_rolling': {윈도우: 날짜×섹터 롤링 평균 DataFrame}
+            }
+        """
+        matrix = self.build_matrix(frame, as_of)
+        if matrix is None:
+            return None
+
+        dates = matrix['dates']
+        sums, counts = matrix['sums'], matrix['counts']
+
+        # 티커별
+        ticker_result = self._summarize(sums, counts, matrix['tickers'])
+        tickers = matrix['meta'].join(ticker_result['summary'])
+
+        # 섹터별 (행렬 곱으로 티커 → 섹터 집계)
+        onehot, sector_names = self._sector_matrix(matrix)
+        sector_result = self._summarize(sums @ onehot, counts @ onehot, sector_names)
+
+        tickers['trend'] = self._trend_labels(tickers)
+        sectors = sector_result['summary']
+        sectors['trend'] = self._trend_labels(sectors)
+
+        return {
+            'as_of': dates[-1].strftime('%Y-%m-%d'),
+            'windows': self.windows,
+            'tickers': tickers,
+            'sectors': sectors,
+            'sector_decayed': pd.DataFrame(sector_result['decayed'], index=dates, columns=sector_names),
+            'sector_rolling': {
+                window: pd.DataFrame(values, index=dates, columns=sector_names)
+                for window, values in sector_result['rolling'].items()
+            }
+        }
+
+    def compute_from_store(self, store, as_of: str, lookback_days: int = 365) -> Optional[Dict]:
+        """히스토리 저장소에서 기간 데이터를 읽어 트렌드 계산"""
+        start = (datetime.strptime(as_of, '%Y-%m-%d')
+                 - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
+        frame = store.load_frame(
+            start_date=start,
+            end_date=as_of,
+            columns=['ticker', 'company_name', 'sector', 'published_at', 'sentiment_score'],
+            unique_news=True
+        )
+        return self.compute(frame, as_of=as_of)
+
+    def _trend_labels(self, summary: pd.DataFrame) -> pd.Series:
+        """변화량 기반 트렌드 아이콘 (신호 윈도우 → 가장 짧은 윈도우 순으로 대체)"""
+        signal = f'change_{self.signal_window}d'
+        change = summary[signal] if signal in summary else pd.Series(np.nan, index=summary.index)
+        change = change.fillna(summary[f'change_{self.windows[0]}d'])
+
+        labels = np.where(change > 0.1, "📈", np.where(change < -0.1, "📉", "➡️"))
+        return pd.Series(labels, index=summary.index)
@@ -4,18 +4,21 @@
 """
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime
 import numpy as np
-import io
 import sys
+import time
 from pathlib import Path
 
 # 프로젝트 경로 설정
 BASE_DIR = Path(__file__).parent
 sys.path.insert(0, str(BASE_DIR))
 
+from config.config import Config
+from reporters.export_utils import (
+    FRAME_COLUMNS, dataset_version, to_csv_bytes, to_xlsx_bytes, to_parquet_bytes, to_arrow_ipc_bytes
+)
+
 # 페이지 설정
 st.set_page_config(
     page_title="섹터 ETF 감성분석",
@@ -50,27 +53,167 @@ st.markdown("""
 # 메인 파이프라인 실행
 # ========================================
 
-def run_analysis_pipeline():
-    """전체 분석 파이프라인 실행"""
+@st.cache_resource(ttl=Config.HOLDINGS_CACHE_TTL_HOURS * 3600, show_spinner="ETF Holdings 수집 중...")
+def load_sector_holdings(top_n=5):
+    """섹터 ETF Holdings (프로세스 공용, 읽기 전용으로 사용)"""
+    from collectors.sector_collector import SectorETFCollector
+    return SectorETFCollector().collect_all_sector_holdings(top_n=top_n)
+
+@st.cache_resource(show_spinner="감성 분석기 로딩 중...")
+def load_analyzer():
+    """감성 분석기 (프로세스 공용)"""
+    from analyzers.sentiment_analyzer import SentimentAnalyzer
+    return SentimentAnalyzer(use_finbert=False)
+
+@st.cache_data(ttl=Config.REFRESH_INTERVAL_MINUTES * 60, show_spinner=False, max_entries=64)
+def collect_news_stage(portfolio, news_days, window_date, _deadline=None):
+    """최근 news_days일 뉴스 - 섹터 단위 (window_date가 바뀌면 새로 수집)
+    
+    _deadline이 끝나 일부 종목만 수집하면 IncompleteResult로 부분 결과를 넘깁니다 (캐시하지 않음).
+    """
+    from collectors.news_collector import NewsCollector
+    from src.deadline import raise_if_cut
+    
+    # st.cache_data는 예외로 끝난 호출을 저장하지 않음
+    news = NewsCollector(days=news_days, deadline=_deadline).collect_all_news(portfolio, verbose=False)
+    return raise_if_cut(news, [item['ticker'] for item in portfolio], _deadline)
+
+@st.cache_data(ttl=Config.REFRESH_INTERVAL_MINUTES * 60, show_spinner=False, max_entries=64)
+def score_news_stage(all_news, _deadline=None):
+    """감성 분석 (같은 뉴스 목록이면 재사용, 마감으로 일부만 분석하면 IncompleteResult)"""
+    from analyzers.dedup import NearDuplicateDetector, analyze_deduplicated
+    from src.deadline import raise_if_cut
+    
+    analyzer = load_analyzer()
+    if Config.DEDUP_ENABLED:
+        detector = NearDuplicateDetector(threshold=Config.DEDUP_THRESHOLD)
+        analyzed = analyze_deduplicated(analyzer, all_news, detector, verbose=False,
+                                        deadline=_deadline)
+    else:
+        analyzed = analyzer.batch_analyze(all_news, verbose=False, deadline=_deadline)
+    return raise_if_cut(analyzed, [n.get('ticker', '') for n in all_news], _deadline)
+
+@st.cache_data(ttl=Config.REFRESH_INTERVAL_MINUTES * 60, show_spinner="히스토리 저장 중...", max_entries=4)
+def persist_stage(analyzed_news, _sector_holdings, today):
+    """히스토리/아카이브 저장 + 트렌드 (같은 분석 결과면 한 번만)"""
+    from analyzers.trend_engine import SentimentTrendEngine
+    from storage.history_store import SentimentHistoryStore
+    from storage.report_archive import ReportArchive
+    
+    store = SentimentHistoryStore(Config.HISTORY_DB_PATH)
+    store.save_news(analyzed_news)
+    ReportArchive(Config.ARCHIVE_DIR).write_day(today, analyzed_news, _sector_holdings)
+    return SentimentTrendEngine.from_config().compute_from_store(
+        store, today, lookback_days=Config.TREND_LOOKBACK_DAYS
+    )
+
+@st.cache_resource
+def get_pipeline_flight():
+    """세션 간 파이프라인 실행 합치기 (같은 파라미터의 동시 실행은 한 번만)"""
+    from src.single_flight import SingleFlight
+    return SingleFlight(min_interval_seconds=Config.PIPELINE_MIN_INTERVAL_SECONDS)
+
+def clear_pipeline_cache(holdings=False):
+    """뉴스/점수 단계 캐시 비우기 (holdings=True면 Holdings도)"""
+    get_pipeline_flight().forget()
+    collect_news_stage.clear()
+    score_news_stage.clear()
+    persist_stage.clear()
+    if holdings:
+        load_sector_holdings.clear()
+
+@st.cache_resource
+def get_refresher():
+    """프로세스 공용 백그라운드 새로 고침 (모든 세션이 같은 스냅샷을 읽음)"""
+    from src.refresher import SnapshotRefresher
+    return SnapshotRefresher(interval_seconds=Config.REFRESH_INTERVAL_MINUTES * 60).start()
+
+def attach_snapshot(snapshot):
+    """세션을 공용 스냅샷 버전에 연결 (세션에는 참조(lease)만 저장, 이전 버전은 반납)"""
+    from src.snapshot_store import get_snapshot_store
+    
+    store = get_snapshot_store()
+    store.publish(snapshot)  # 같은 버전이 이미 있으면 기존 객체를 그대로 사용
+    
+    previous = st.session_state.get('snapshot_lease')
+    st.session_state.snapshot_lease = store.lease(snapshot.version)
+    if previous is not None:
+        previous.release()
+
+def current_snapshot():
+    lease = st.session_state.get('snapshot_lease')
+    return lease.snapshot if lease is not None else None
+
+def run_shared_pipeline(progress_callback=None):
+    """run_analysis_pipeline을 세션 간 합쳐서 실행 → (결과 6-튜플, 공유 여부)
+    
+    다른 세션이 같은 파라미터로 실행 중이면 그 결과를 기다려 받고,
+    최소 간격 안에 끝난 실행이 있으면 그 결과를 그대로 사용합니다.
+    """
+    key = ('dashboard', 5, Config.NEWS_DAYS, datetime.now().strftime('%Y-%m-%d'))
+    
+    def run():
+        result = run_analysis_pipeline(progress_callback)
+        if result[0] is None:
+            # 실패한 결과는 공유/재사용하지 않음 (오류는 실행한 세션에 이미 표시)
+            raise RuntimeError("파이프라인 실행 실패")
+        return result
+    
+    try:
+        return get_pipeline_flight().run(key, run)
+    except RuntimeError:
+        return (None, None, None, None, None, None), False
+
+def run_analysis_pipeline(progress_callback=None, budget_seconds=None):
+    """전체 분석 파이프라인 실행 (단계별 캐시 사용)
+    
+    섹터 단위로 수집/분석하며, 섹터가 끝날 때마다
+    progress_callback(메시지, 진행률 0~1, {'sector', 'scores', 'news_count'})를 호출합니다.
+    
+    뉴스 수집/분석은 budget_seconds(기본 Config.DASHBOARD_BUDGET_SECONDS) 안에서만 하고,
+    넘으면 남은 종목을 건너뛰어 부분 결과로 화면을 그립니다.
+    반환: (df, 섹터 점수, 분석 뉴스, Holdings, 트렌드, 섹터별 수집률)
+    """
     try:
-        from config.config import Config
         from collectors.sector_collector import SectorETFCollector
-        from collectors.news_collector import NewsCollector
-        from analyzers.sentiment_analyzer import SentimentAnalyzer
-        from reporters.excel_generator_sector import SectorETFExcelGenerator
+        from analyzers.aggregation import SectorScoreAccumulator
+        from src.deadline import Deadline, IncompleteResult, sector_coverage
+        
+        today = datetime.now().strftime('%Y-%m-%d')
+        deadline = Deadline(budget_seconds or Config.DASHBOARD_BUDGET_SECONDS)
+        fetch_deadline = deadline.stage(Config.BUDGET_FETCH_SHARE)
+        
+        def report(message, progress, partial=None):
+            if progress_callback:
+                progress_callback(message, progress, partial)
         
         # 1. Holdings 수집
+        report("📊 섹터 ETF Holdings 수집 중...", 0.0)
+        sector_holdings = load_sector_holdings(top_n=5)
         sector_collector = SectorETFCollector()
-        sector_holdings = sector_collector.collect_all_sector_holdings(top_n=5)
-        portfolio = sector_collector.get_portfolio_for_news(sector_holdings)
         
-        # 2. 뉴스 수집
-        news_collector = NewsCollector(days=3)
-        all_news = news_collector.collect_all_news(portfolio)
+        # 2~3. 섹터별 뉴스 수집 + 감성 분석
+        analyzed_news = []
+        accumulator = SectorScoreAccumulator()
+        for idx, (sector, data) in enumerate(sector_holdings.items()):
+            portfolio = sector_collector.get_portfolio_for_news({sector: data})
+            try:
+                sector_news = collect_news_stage(portfolio, Config.NEWS_DAYS, today, _deadline=fetch_deadline)
+            except IncompleteResult as partial:
+                sector_news = partial.result
+            try:
+                analyzed = score_news_stage(sector_news, _deadline=deadline)
+            except IncompleteResult as partial:
+                analyzed = partial.result
+            
+            analyzed_news.extend(analyzed)
+            accumulator.add(analyzed)
+            report(f"📰 {sector} 완료 ({idx + 1}/{len(sector_holdings)})",
+                   0.9 * (idx + 1) / len(sector_holdings),
+                   {'sector': sector, 'scores': accumulator.scores(), 'news_count': len(analyzed_news)})
         
-        # 3. 감성 분석
-        analyzer = SentimentAnalyzer(use_finbert=False)
-        analyzed_news = analyzer.batch_analyze(all_news)
+        coverage = sector_coverage(sector_collector.get_portfolio_for_news(sector_holdings),
+                                   deadline.skipped)
         
         # 4. DataFrame 생성
         df_list = []
@@ -117,22 +260,28 @@ def run_analysis_pipeline():
                     'Sentiment': news.get('sentiment_score', 0.0)
                 })
         
-        df = pd.DataFrame(df_list)
+        df = pd.DataFrame(df_list, columns=FRAME_COLUMNS)
         
-        return df, sector_scores, analyzed_news, sector_holdings
+        # 5. 히스토리 저장 + 트렌드
+        report("💾 히스토리 저장 및 트렌드 계산 중...", 0.9)
+        trend = persist_stage(analyzed_news, sector_holdings, today)
+        report("✅ 분석 완료!", 1.0)
+        
+        return df, sector_scores, analyzed_news, sector_holdings, trend, coverage
         
     except Exception as e:
         st.error(f"파이프라인 실행 오류: {e}")
         import traceback
         st.code(traceback.format_exc())
-        return None, None, None, None
+        return None, None, None, None, None, None
 
 # ========================================
 # 차트 함수들
 # ========================================
 
-def create_sector_chart(df):
-    sector_avg = df.groupby('Sector')['Sentiment'].mean().sort_values()
+def create_sector_chart(sector_avg):
+    import plotly.graph_objects as go
+    
     colors = ['#f44336' if x < -0.2 else '#4CAF50' if x > 0.2 else '#FFC107' for x in sector_avg]
     
     fig = go.Figure()
@@ -144,12 +293,176 @@ def create_sector_chart(df):
     fig.update_layout(title="섹터별 평균 Sentiment", height=500)
     return fig
 
-def create_category_pie(df):
-    category_dist = df['Category'].value_counts()
+def create_score_chart(scores):
+    """섹터 점수 딕셔너리로 그리는 Weighted 막대 (진행 중 부분 결과용)"""
+    import plotly.graph_objects as go
+    
+    ordered = sorted(scores.items(), key=lambda item: item[1]['weighted'])
+    values = [info['weighted'] for _, info in ordered]
+    colors = ['#f44336' if x < -0.2 else '#4CAF50' if x > 0.2 else '#FFC107' for x in values]
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        y=[sector for sector, _ in ordered], x=values, orientation='h',
+        marker=dict(color=colors), text=[f"{v:.4f}" for v in values], textposition='outside'
+    ))
+    fig.add_vline(x=0, line_dash="dash", line_color="gray")
+    fig.update_layout(title="섹터별 Weighted Sentiment (진행 중)", height=400)
+    return fig
+
+def create_category_pie(category_dist):
+    import plotly.graph_objects as go
+    
     fig = go.Figure(data=[go.Pie(labels=category_dist.index, values=category_dist.values, hole=0.4)])
     fig.update_layout(title="카테고리 분포", height=400)
     return fig
 
+def create_trend_chart(trend, days=30):
+    import plotly.graph_objects as go
+    
+    decayed = trend['sector_decayed'].tail(days)
+    fig = go.Figure()
+    for sector in decayed.columns:
+        fig.add_trace(go.Scatter(x=decayed.index, y=decayed[sector], mode='lines', name=sector))
+    fig.add_hline(y=0, line_dash="dash", line_color="gray")
+    fig.update_layout(title=f"섹터별 감쇠 Sentiment 추이 (최근 {days}일)", height=450)
+    return fig
+
+def render_sector_cards(scores):
+    cols = st.columns(4)
+    for idx, (sector, info) in enumerate(sorted(scores.items())):
+        with cols[idx % 4]:
+            weighted = info['weighted']
+            card_class = "sector-card-positive" if weighted > 0.3 else "sector-card-negative" if weighted < -0.3 else "sector-card-neutral"
+            emoji = "🟢" if weighted > 0.3 else "🔴" if weighted < -0.3 else "🟡"
+            
+            st.markdown(f"""
+            <div class="{card_class}">
+                <div style="font-size: 1.3em;">{emoji}</div>
+                <div style="font-size: 1.1em; font-weight: bold;">{info['etf']} | {sector}</div>
+                <div style="font-size: 0.85em; margin: 5px 0;">Simple: {info['simple']:.4f}</div>
+                <div style="font-size: 1.6em; font-weight: bold;">{weighted:.4f}</div>
+                <div style="font-size: 0.8em;">Weighted</div>
+            </div>
+            """, unsafe_allow_html=True)
+
+def render_coverage(coverage):
+    """실행 예산 초과로 일부 종목만 반영된 섹터 표시"""
+    from src.deadline import is_partial
+    
+    if not is_partial(coverage):
+        return
+    collected = sum(c['collected'] for c in coverage.values())
+    expected = sum(c['expected'] for c in coverage.values())
+    lines = [f"- {c['etf']} | {sector}: {c['collected']}/{c['expected']}개 종목"
+             for sector, c in sorted(coverage.items()) if not c['complete']]
+    st.warning(f"⏱️ 시간 예산({Config.DASHBOARD_BUDGET_SECONDS}초) 안에 {collected}/{expected}개 "
+               f"종목만 수집/분석한 부분 결과입니다. 다음 새로 고침에서 채워집니다.\n\n" + "\n".join(lines))
+
+def render_partial(container, partial):
+    """진행 중 부분 결과 (섹터 카드 + 막대 차트)"""
+    if not partial or not partial['scores']:
+        return
+    with container.container():
+        st.caption(f"📰 지금까지 {len(partial['scores'])}개 섹터, 뉴스 {partial['news_count']}개")
+        render_sector_cards(partial['scores'])
+        st.plotly_chart(create_score_chart(partial['scores']), use_container_width=True)
+
+# ========================================
+# 집계/차트 캐시 (데이터 버전별 1회 계산, 카드와 차트가 공유)
+# ========================================
+
+@st.cache_data(max_entries=8)
+def compute_aggregates(version, _df):
+    """대시보드 공용 집계 (뉴스가 없으면 count 0, top_sector None)"""
+    sentiment = _df['Sentiment']
+    positive = sentiment > Config.SENTIMENT_THRESHOLD_POSITIVE
+    sector_stats = pd.DataFrame({
+        'count': _df.groupby('Sector').size(),
+        'mean': sentiment.groupby(_df['Sector']).mean(),
+        'positive': positive.groupby(_df['Sector']).sum()
+    })
+    
+    return {
+        'count': len(_df),
+        'mean': sentiment.mean(),
+        'positive_ratio': positive.mean() * 100,
+        'sector_stats': sector_stats,
+        'sector_avg': sector_stats['mean'].sort_values(),
+        'top_sector': sector_stats['mean'].idxmax() if len(sector_stats) else None,
+        'category_counts': _df['Category'].value_counts()
+    }
+
+# 그림 객체는 세션 간 공유 (st.plotly_chart는 그림을 수정하지 않음)
+@st.cache_resource(max_entries=8)
+def get_sector_chart(version, _aggregates):
+    return create_sector_chart(_aggregates['sector_avg'])
+
+@st.cache_resource(max_entries=8)
+def get_category_pie(version, _aggregates):
+    return create_category_pie(_aggregates['category_counts'])
+
+@st.cache_resource(max_entries=8)
+def get_trend_chart(version, as_of, _trend, days=30):
+    return create_trend_chart(_trend, days=days)
+
+# ========================================
+# 섹터별 뉴스 색인 (데이터 버전별 1회 그룹핑)
+# ========================================
+
+NEWS_SORT_OPTIONS = {
+    "최신순": ('Pub Date', True),
+    "Sentiment 높은순": ('Sentiment', True),
+    "Sentiment 낮은순": ('Sentiment', False),
+    "비중 높은순": ('Weight (%)', True),
+}
+
+@st.cache_data(max_entries=8)
+def build_sector_index(version, _df):
+    """{섹터: 행 위치 배열}"""
+    return {sector: positions for sector, positions in _df.groupby('Sector').indices.items()}
+
+@st.cache_data(max_entries=64)
+def sorted_sector_positions(version, sector, sort_label, _df, _index):
+    """섹터 행 위치를 정렬 기준대로 (섹터/정렬 조합당 1회)"""
+    column, descending = NEWS_SORT_OPTIONS[sort_label]
+    positions = _index[sector]
+    values = _df[column].to_numpy()[positions]
+    order = np.argsort(values, kind='stable')
+    if descending:
+        order = order[::-1]
+    return positions[order]
+
+def render_news_page(df, positions, page, page_size):
+    """현재 페이지 행만 렌더링"""
+    start = (page - 1) * page_size
+    for row in df.iloc[positions[start:start + page_size]].to_dict('records'):
+        emoji = "🟢" if row['Sentiment'] > 0.2 else "🔴" if row['Sentiment'] < -0.2 else "🟡"
+        with st.expander(f"{emoji} {row['Company']} - {row['Pub Date']}"):
+            st.markdown(f"**{row['Title']}**")
+            st.markdown(f"카테고리: {row['Category']} | Sentiment: {row['Sentiment']:.4f} | 비중: {row['Weight (%)']}%")
+            st.markdown(f"[링크]({row['URL']})")
+
+# ========================================
+# 내보내기 캐시 (데이터 버전별 1회 생성)
+# ========================================
+
+@st.cache_data(show_spinner="CSV 생성 중...", max_entries=8)
+def build_csv_export(version, _df):
+    return to_csv_bytes(_df)
+
+@st.cache_data(show_spinner="Excel 생성 중...", max_entries=8)
+def build_xlsx_export(version, _df, _scores):
+    return to_xlsx_bytes(_df, _scores)
+
+@st.cache_data(show_spinner="Parquet 생성 중...", max_entries=8)
+def build_parquet_export(version, _df):
+    return to_parquet_bytes(_df)
+
+@st.cache_data(show_spinner="Arrow 생성 중...", max_entries=8)
+def build_arrow_export(version, _df):
+    return to_arrow_ipc_bytes(_df)
+
 # ========================================
 # 메인 앱
 # ========================================
@@ -170,8 +483,47 @@ def main():
         st.title("⚙️ 설정")
         st.markdown("---")
         
-        if st.button("🔄 데이터 수집 및 분석 실행", use_container_width=True, type="primary"):
-            st.session_state.run_analysis = True
+        if Config.DASHBOARD_SHARED_REFRESH:
+            refresher = get_refresher()
+            if st.button("🔄 지금 새로 고침", use_container_width=True, type="primary"):
+                if refresher.refresh_now():
+                    st.toast("새로 고침을 요청했습니다 (완료 후 화면을 다시 불러오면 반영)")
+                else:
+                    st.toast("이미 진행 중이거나 방금 새로 고침되었습니다")
+            
+            with st.expander("🧹 캐시 관리"):
+                st.caption(f"뉴스 캐시 {Config.REFRESH_INTERVAL_MINUTES}분, "
+                           f"Holdings 캐시 {Config.HOLDINGS_CACHE_TTL_HOURS}시간 유지 "
+                           f"(새로 고침은 유효한 캐시를 재사용)")
+                if st.button("뉴스/점수 새로 수집", use_container_width=True):
+                    refresher.invalidate()
+                    st.toast("뉴스 캐시를 비우고 새로 고침을 요청했습니다")
+                if st.button("Holdings 포함 전체 새로 수집", use_container_width=True):
+                    refresher.invalidate(holdings=True)
+                    st.toast("Holdings/뉴스 캐시를 비우고 새로 고침을 요청했습니다")
+            
+            status = refresher.status()
+            if status['running']:
+                st.caption("⏳ 데이터 수집/분석 중...")
+            elif status['created_at']:
+                next_run = status['next_run_in']
+                st.caption(f"마지막 갱신: {status['created_at']}"
+                           + (f" | 다음 갱신: {next_run / 60:.0f}분 후" if next_run is not None else ""))
+            if status['last_error']:
+                st.warning(f"최근 새로 고침 실패: {status['last_error']}")
+        else:
+            if st.button("🔄 데이터 수집 및 분석 실행", use_container_width=True, type="primary"):
+                st.session_state.run_analysis = True
+            
+            with st.expander("🧹 캐시 관리"):
+                st.caption(f"뉴스/점수 캐시 {Config.REFRESH_INTERVAL_MINUTES}분, "
+                           f"Holdings 캐시 {Config.HOLDINGS_CACHE_TTL_HOURS}시간 유지")
+                if st.button("뉴스/점수 새로 수집", use_container_width=True):
+                    clear_pipeline_cache()
+                    st.toast("뉴스/점수 캐시를 비웠습니다")
+                if st.button("Holdings 포함 전체 새로 수집", use_container_width=True):
+                    clear_pipeline_cache(holdings=True)
+                    st.toast("Holdings/뉴스/점수 캐시를 비웠습니다")
         
         st.markdown("---")
         st.info("""
@@ -184,31 +536,79 @@ def main():
         - 카테고리: 자동 분류
         """)
     
-    # 세션 상태
-    if 'df_news' not in st.session_state:
-        st.session_state.df_news = None
-        st.session_state.sector_scores = None
-        st.session_state.analyzed_news = None
-        st.session_state.sector_holdings = None
+    # 공용 스냅샷 사용 (세션별 파이프라인 실행 없음)
+    if Config.DASHBOARD_SHARED_REFRESH:
+        refresher = get_refresher()
+        snapshot = refresher.latest()
+        if snapshot is None:
+            # 첫 스냅샷을 기다리는 동안 섹터별 부분 결과를 계속 표시
+            progress_bar = st.progress(0.0, text="첫 데이터 수집 및 분석 중...")
+            partial_area = st.empty()
+            shown_count = 0
+            deadline = time.monotonic() + Config.SNAPSHOT_WAIT_SECONDS
+            while snapshot is None and time.monotonic() < deadline:
+                partial = refresher.progress()
+                progress_bar.progress(partial['progress'], text=partial['message'] or "첫 데이터 수집 및 분석 중...")
+                if len(partial['scores']) != shown_count:
+                    shown_count = len(partial['scores'])
+                    render_partial(partial_area, partial)
+                snapshot = refresher.wait_for_snapshot(timeout=0.5)
+            progress_bar.empty()
+            partial_area.empty()
+        lease = st.session_state.get('snapshot_lease')
+        if snapshot is not None and (lease is None or lease.version != snapshot.version):
+            attach_snapshot(snapshot)
     
     # 분석 실행
     if st.session_state.get('run_analysis', False):
         st.session_state.run_analysis = False
         
-        with st.spinner("데이터 수집 및 분석 중... (약 30초 소요)"):
-            df, scores, analyzed, holdings = run_analysis_pipeline()
+        progress_bar = st.progress(0.0, text="데이터 수집 및 분석 중...")
+        partial_area = st.empty()
+        
+        def update_progress(message, progress, partial=None):
+            progress_bar.progress(progress, text=message)
+            if partial:
+                render_partial(partial_area, partial)
+        
+        (df, scores, analyzed, holdings, trend, coverage), shared = run_shared_pipeline(update_progress)
+        progress_bar.empty()
+        partial_area.empty()
+        
+        if shared and df is not None:
+            st.info("ℹ️ 진행 중이던(또는 방금 끝난) 분석 결과를 함께 사용했습니다")
+        
+        if df is not None:
+            from src.refresher import DashboardSnapshot
+            from reporters.report_jobs import get_report_queue
             
-            if df is not None:
-                st.session_state.df_news = df
-                st.session_state.sector_scores = scores
-                st.session_state.analyzed_news = analyzed
-                st.session_state.sector_holdings = holdings
-                
-                st.success(f"✅ 분석 완료! 총 {len(df)}개 뉴스")
-                st.balloons()
+            # 서식 리포트는 백그라운드에서 생성 (결과 화면은 바로 표시)
+            report_job_id = get_report_queue().submit(
+                analyzed, holdings, datetime.now().strftime('%Y-%m-%d'), trend=trend
+            )
+            
+            # 같은 결과를 받은 세션들은 저장소의 같은 객체를 공유
+            attach_snapshot(DashboardSnapshot(
+                version=dataset_version(df),
+                created_at=datetime.now().isoformat(timespec='seconds'),
+                df=df,
+                sector_scores=scores,
+                sector_holdings=holdings,
+                trend=trend,
+                report_job_id=report_job_id,
+                coverage=coverage
+            ))
+            
+            st.success(f"✅ 분석 완료! 총 {len(df)}개 뉴스")
+            st.balloons()
+    
+    snapshot = current_snapshot()
     
     # 데이터 없을 때
-    if st.session_state.df_news is None:
+    if snapshot is None and Config.DASHBOARD_SHARED_REFRESH:
+        st.info("⏳ 첫 데이터를 준비하고 있습니다. 잠시 후 새로 고침해 주세요.")
+        return
+    if snapshot is None:
         st.info("""
         ### 👋 시작하기
         
@@ -225,8 +625,18 @@ def main():
         """)
         return
     
-    df = st.session_state.df_news
-    scores = st.session_state.sector_scores
+    df = snapshot.df
+    scores = snapshot.sector_scores
+    version = snapshot.version
+    aggregates = compute_aggregates(version, df)
+    render_coverage(snapshot.coverage)
+    
+    if aggregates['count'] == 0:
+        # 시간 예산 안에 분석된 뉴스가 없으면 카드/차트 대신 수집률 안내만 표시
+        from src.deadline import is_partial
+        if not is_partial(snapshot.coverage):
+            st.info("수집된 뉴스가 없습니다. 잠시 후 다시 새로 고침해 주세요.")
+        return
     
     # 탭
     tab1, tab2, tab3, tab4 = st.tabs(["📊 개요", "🏢 섹터 분석", "📈 시각화", "💾 다운로드"])
@@ -234,22 +644,7 @@ def main():
     with tab1:
         st.header("📊 섹터별 감성 점수")
         
-        cols = st.columns(4)
-        for idx, (sector, info) in enumerate(sorted(scores.items())):
-            with cols[idx % 4]:
-                weighted = info['weighted']
-                card_class = "sector-card-positive" if weighted > 0.3 else "sector-card-negative" if weighted < -0.3 else "sector-card-neutral"
-                emoji = "🟢" if weighted > 0.3 else "🔴" if weighted < -0.3 else "🟡"
-                
-                st.markdown(f"""
-                <div class="{card_class}">
-                    <div style="font-size: 1.3em;">{emoji}</div>
-                    <div style="font-size: 1.1em; font-weight: bold;">{info['etf']} | {sector}</div>
-                    <div style="font-size: 0.85em; margin: 5px 0;">Simple: {info['simple']:.4f}</div>
-                    <div style="font-size: 1.6em; font-weight: bold;">{weighted:.4f}</div>
-                    <div style="font-size: 0.8em;">Weighted</div>
-                </div>
-                """, unsafe_allow_html=True)
+        render_sector_cards(scores)
         
         st.markdown("---")
         
@@ -258,13 +653,13 @@ def main():
         with col1:
             st.markdown(f"""
             <div class="metric-card">
-                <div class="metric-value">{len(df)}</div>
+                <div class="metric-value">{aggregates['count']}</div>
                 <div style="opacity: 0.9;">총 뉴스</div>
             </div>
             """, unsafe_allow_html=True)
         
         with col2:
-            avg = df['Sentiment'].mean()
+            avg = aggregates['mean']
             color = "#4CAF50" if avg > 0 else "#f44336"
             st.markdown(f"""
             <div class="metric-card" style="background: {color};">
@@ -274,7 +669,7 @@ def main():
             """, unsafe_allow_html=True)
         
         with col3:
-            pos = (df['Sentiment'] > 0.2).sum() / len(df) * 100
+            pos = aggregates['positive_ratio']
             st.markdown(f"""
             <div class="metric-card" style="background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);">
                 <div class="metric-value">{pos:.1f}%</div>
@@ -283,7 +678,7 @@ def main():
             """, unsafe_allow_html=True)
         
         with col4:
-            top = df.groupby('Sector')['Sentiment'].mean().idxmax()
+            top = aggregates['top_sector']
             st.markdown(f"""
             <div class="metric-card" style="background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);">
                 <div class="metric-value" style="font-size: 1.5em;">{top[:15]}</div>
@@ -294,32 +689,47 @@ def main():
     with tab2:
         st.header("🏢 섹터별 상세 분석")
         
-        sector = st.selectbox("섹터 선택", sorted(df['Sector'].unique()))
-        sector_df = df[df['Sector'] == sector]
+        sector_stats = aggregates['sector_stats']
+        sector = st.selectbox("섹터 선택", sorted(sector_stats.index))
+        stats = sector_stats.loc[sector]
         
         col1, col2, col3 = st.columns(3)
-        col1.metric("뉴스 개수", f"{len(sector_df)}개")
-        col2.metric("평균 Sentiment", f"{sector_df['Sentiment'].mean():.4f}")
-        col3.metric("긍정 뉴스", f"{(sector_df['Sentiment']>0.2).sum()}개")
+        col1.metric("뉴스 개수", f"{int(stats['count'])}개")
+        col2.metric("평균 Sentiment", f"{stats['mean']:.4f}")
+        col3.metric("긍정 뉴스", f"{int(stats['positive'])}개")
         
         st.markdown("---")
-        st.subheader("📰 최근 뉴스")
-        
-        for _, row in sector_df.head(10).iterrows():
-            emoji = "🟢" if row['Sentiment'] > 0.2 else "🔴" if row['Sentiment'] < -0.2 else "🟡"
-            with st.expander(f"{emoji} {row['Company']} - {row['Pub Date']}"):
-                st.markdown(f"**{row['Title']}**")
-                st.markdown(f"카테고리: {row['Category']} | Sentiment: {row['Sentiment']:.4f}")
-                st.markdown(f"[링크]({row['URL']})")
+        st.subheader("📰 뉴스")
+        
+        sort_col, size_col, page_col = st.columns([2, 1, 1])
+        sort_label = sort_col.selectbox("정렬", list(NEWS_SORT_OPTIONS))
+        page_size = size_col.selectbox("페이지당", [10, 25, 50, 100])
+        
+        positions = sorted_sector_positions(
+            version, sector, sort_label, df, build_sector_index(version, df)
+        )
+        total_pages = max(1, -(-len(positions) // page_size))
+        page = page_col.number_input(
+            f"페이지 (/{total_pages})", min_value=1, max_value=total_pages, value=1,
+            key=f"news_page_{sector}_{sort_label}_{page_size}"
+        )
+        
+        render_news_page(df, positions, page, page_size)
     
     with tab3:
         st.header("📈 시각화")
         
         col1, col2 = st.columns(2)
         with col1:
-            st.plotly_chart(create_sector_chart(df), use_container_width=True)
+            st.plotly_chart(get_sector_chart(version, aggregates), use_container_width=True)
         with col2:
-            st.plotly_chart(create_category_pie(df), use_container_width=True)
+            st.plotly_chart(get_category_pie(version, aggregates), use_container_width=True)
+        
+        trend = snapshot.trend
+        if trend is not None:
+            st.plotly_chart(get_trend_chart(version, trend['as_of'], trend), use_container_width=True)
+            sector_trend = trend['sectors'].reset_index(names='Sector')
+            st.dataframe(sector_trend, use_container_width=True, hide_index=True)
         
         st.markdown("---")
         st.subheader("📋 상세 데이터")
@@ -329,34 +739,83 @@ def main():
     with tab4:
         st.header("💾 데이터 다운로드")
         
+        # 내보내기는 분석 결과(버전)당 한 번만, 사용자가 요청할 때 생성
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
         col1, col2 = st.columns(2)
         
         with col1:
-            csv = df.to_csv(index=False).encode('utf-8-sig')
-            st.download_button(
-                "📥 CSV 다운로드",
-                csv,
-                f"market_monitor_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                "text/csv",
-                use_container_width=True
-            )
+            if (st.session_state.get('csv_export_version') == version
+                    or st.button("📄 CSV 파일 준비", use_container_width=True)):
+                st.session_state.csv_export_version = version
+                st.download_button(
+                    "📥 CSV 다운로드",
+                    build_csv_export(version, df),
+                    f"market_monitor_{timestamp}.csv",
+                    "text/csv",
+                    use_container_width=True
+                )
         
         with col2:
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                df.to_excel(writer, sheet_name='News', index=False)
-                pd.DataFrame([
-                    {'Sector': s, 'ETF': i['etf'], 'Simple': i['simple'], 'Weighted': i['weighted']}
-                    for s, i in scores.items()
-                ]).to_excel(writer, sheet_name='Scores', index=False)
+            if (st.session_state.get('xlsx_export_version') == version
+                    or st.button("📊 Excel 파일 준비", use_container_width=True)):
+                st.session_state.xlsx_export_version = version
+                st.download_button(
+                    "📥 Excel 다운로드",
+                    build_xlsx_export(version, df, scores),
+                    f"market_monitor_{timestamp}.xlsx",
+                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    use_container_width=True
+                )
+        
+        # 분석 도구용 타입 지정 포맷 (float32 Sentiment, dictionary 인코딩 섹터/티커/카테고리)
+        col3, col4 = st.columns(2)
+        
+        with col3:
+            if (st.session_state.get('parquet_export_version') == version
+                    or st.button("🗂️ Parquet 파일 준비", use_container_width=True)):
+                st.session_state.parquet_export_version = version
+                st.download_button(
+                    "📥 Parquet 다운로드",
+                    build_parquet_export(version, df),
+                    f"market_monitor_{timestamp}.parquet",
+                    "application/vnd.apache.parquet",
+                    use_container_width=True
+                )
+        
+        with col4:
+            if (st.session_state.get('arrow_export_version') == version
+                    or st.button("🏹 Arrow 파일 준비", use_container_width=True)):
+                st.session_state.arrow_export_version = version
+                st.download_button(
+                    "📥 Arrow IPC 다운로드",
+                    build_arrow_export(version, df),
+                    f"market_monitor_{timestamp}.arrow",
+                    "application/vnd.apache.arrow.file",
+                    use_container_width=True
+                )
+        
+        st.markdown("---")
+        st.subheader("📑 섹터 리포트 (서식 포함 Excel)")
+        job_id = snapshot.report_job_id
+        if job_id:
+            from reporters.report_jobs import get_report_queue, DONE, FAILED
+            job = get_report_queue().status(job_id) or {}
             
-            st.download_button(
-                "📥 Excel 다운로드",
-                output.getvalue(),
-                f"market_monitor_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                use_container_width=True
-            )
+            if job.get('status') == DONE:
+                report_path = Path(job['report_path'])
+                st.download_button(
+                    "📥 섹터 리포트 다운로드",
+                    report_path.read_bytes(),
+                    report_path.name,
+                    "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    use_container_width=True
+                )
+            elif job.get('status') == FAILED:
+                st.error(f"리포트 생성 실패: {job.get('error')}")
+            else:
+                st.info(f"⏳ 리포트 생성 중... ({job.get('rows', 0)}행)")
+                st.button("🔄 상태 확인", use_container_width=True)
 
 if __name__ == "__main__":
     main()
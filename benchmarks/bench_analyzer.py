@@ -0,0 +1,303 @@
+"""
+감성 분석기 벤치마크 + 정확도 평가 - 합성/기록 헤드라인 (오프라인)
+
+사용법:
+    python benchmarks/bench_analyzer.py [--texts 20000] [--corpus news.jsonl]
+        [--finbert-texts 500] [--batch-size 32]
+
+단계별(_preprocess_text, VADER, FinBERT 단건/배치, 하이브리드) 처리량(건/s),
+건별 지연 백분위(p50/p95/p99), tracemalloc 최대 메모리를 측정하고,
+정답 라벨이 있는 코퍼스로 categorize_news 정확도(혼동 행렬)와 점수 방식별
+감성 라벨 정확도/방식 간 일치율을 보여 줍니다.
+
+--corpus: JSON lines 또는 CSV (title, summary, 선택: sentiment[positive/neutral/negative],
+category). 없으면 라벨이 붙은 합성 헤드라인을 만듭니다.
+FinBERT(torch/transformers)를 불러올 수 없으면 해당 항목은 건너뜁니다.
+"""
+from pathlib import Path
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from config.config import Config
+from analyzers.sentiment_analyzer import SentimentAnalyzer
+
+LABELS = ['positive', 'neutral', 'negative']
+
+# (카테고리, 감성) → 헤드라인 템플릿
+# 일부는 일부러 다른 카테고리 키워드를 섞음 (부분 문자열 'sec' in 'sector', 'deal' in 'dealers' 등)
+TEMPLATES = {
+    ('Earnings', 'positive'): [
+        "{company} beats quarterly earnings estimates as revenue surges",
+        "{company} posts record profit and raises full-year outlook",
+        "{company} tops estimates as analysts applaud margin gains",
+    ],
+    ('Earnings', 'negative'): [
+        "{company} misses quarterly earnings forecast as revenue falls",
+        "{company} profit plunges, company warns of weak demand",
+    ],
+    ('Earnings', 'neutral'): [
+        "{company} to report quarterly results on Thursday",
+        "{company} Q3 revenue in line with expectations",
+    ],
+    ('M&A', 'positive'): [
+        "{company} wins approval for acquisition, shares jump",
+        "{company} agrees to lucrative merger with industry leader",
+    ],
+    ('M&A', 'negative'): [
+        "{company} deal collapses after buyout talks fail",
+        "{company} merger blocked, shares tumble",
+    ],
+    ('M&A', 'neutral'): [
+        "{company} to acquire regional distributor",
+        "{company} confirms merger discussions are ongoing",
+    ],
+    ('Product', 'positive'): [
+        "{company} unveils innovative product to strong reviews",
+        "{company} launch delights customers, demand soars",
+    ],
+    ('Product', 'negative'): [
+        "{company} product release delayed amid quality problems",
+        "{company} recalls faulty product after safety complaints",
+    ],
+    ('Product', 'neutral'): [
+        "{company} will release its new product next month",
+        "{company} schedules product launch event",
+        "{company} to unveil new device; analysts expect modest targets",
+    ],
+    ('Regulatory', 'positive'): [
+        "{company} wins court ruling, shares rally",
+        "FDA approves {company} drug, a major win",
+    ],
+    ('Regulatory', 'negative'): [
+        "{company} hit with lawsuit over fraud allegations",
+        "SEC charges {company} with misleading investors",
+    ],
+    ('Regulatory', 'neutral'): [
+        "{company} files regulatory paperwork with the SEC",
+        "Court hearing for {company} case set for next week",
+    ],
+    ('Analyst', 'positive'): [
+        "Analyst upgrades {company} to buy, sees strong growth",
+        "{company} price target raised on excellent outlook",
+        "Analysts lift {company} target after strong quarterly results",
+    ],
+    ('Analyst', 'negative'): [
+        "Analyst downgrades {company} to sell on weak growth",
+        "{company} price target cut amid worsening outlook",
+    ],
+    ('Analyst', 'neutral'): [
+        "Analyst maintains hold rating on {company}",
+        "{company} coverage initiated with neutral rating",
+    ],
+    ('General', 'positive'): [
+        "{company} shares soar as investors cheer strategy",
+        "{company} stock gains on optimism about growth",
+        "{company} leads sector higher for a second straight session",
+    ],
+    ('General', 'negative'): [
+        "{company} shares slump as investors worry about losses",
+        "{company} stock sinks amid layoffs and turmoil",
+        "{company} dealers report slumping sales, shares drop",
+    ],
+    ('General', 'neutral'): [
+        "{company} shares little changed in Tuesday trading",
+        "{company} holds annual shareholder meeting",
+        "{company} names new chief financial officer",
+    ],
+}
+
+SUMMARIES = [
+    "The company said it expects conditions to remain stable.",
+    "Shares moved in after-hours trading following the announcement.",
+    "The news was reported by several outlets on Monday.",
+    "Management will discuss details on a conference call.",
+]
+
+def make_corpus(n_texts: int, seed: int = 7) -> list:
+    """라벨이 붙은 합성 헤드라인 [{'title', 'summary', 'sentiment', 'category'}]"""
+    rng = random.Random(seed)
+    keys = list(TEMPLATES)
+    corpus = []
+
+    for i in range(n_texts):
+        category, sentiment = keys[i % len(keys)]
+        company = f"{rng.choice(['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark'])} {i % 997}"
+        corpus.append({
+            'title': rng.choice(TEMPLATES[(category, sentiment)]).format(company=company),
+            'summary': rng.choice(SUMMARIES),
+            'sentiment': sentiment,
+            'category': category
+        })
+
+    rng.shuffle(corpus)
+    return corpus
+
+def load_corpus(path: Path) -> list:
+    """JSON lines 또는 CSV → [{'title', 'summary', 'sentiment'?, 'category'?}]"""
+    if path.suffix == '.csv':
+        import pandas as pd
+        return pd.read_csv(path).fillna('').to_dict('records')
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def sentiment_label(score: float) -> str:
+    if score >= Config.SENTIMENT_THRESHOLD_POSITIVE:
+        return 'positive'
+    if score <= Config.SENTIMENT_THRESHOLD_NEGATIVE:
+        return 'negative'
+    return 'neutral'
+
+def _percentiles(latencies: list) -> dict:
+    ordered = sorted(latencies)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e6
+    return {'p50_us': pick(0.50), 'p95_us': pick(0.95), 'p99_us': pick(0.99)}
+
+def time_per_text(fn, texts: list) -> dict:
+    """건별 호출 → 처리량/지연 백분위 + 결과 (메모리는 tracemalloc으로 한 번 더 측정)"""
+    results, latencies = [], []
+    start = time.perf_counter()
+    for text in texts:
+        t0 = time.perf_counter()
+        results.append(fn(text))
+        latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    for text in texts[:min(len(texts), 2000)]:
+        fn(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'texts': len(texts), 'texts_per_sec': len(texts) / elapsed,
+            'peak_mb': peak / 1024 / 1024, **_percentiles(latencies), 'results': results}
+
+def time_batched(fn, texts: list, batch_size: int) -> dict:
+    """묶음 호출 (fn(list) → list) → 처리량/건당 지연 백분위(묶음 시간 / 묶음 크기)"""
+    results, latencies = [], []
+    tracemalloc.start()
+    start = time.perf_counter()
+    for i in range(0, len(texts), batch_size):
+        batch = texts[i:i + batch_size]
+        t0 = time.perf_counter()
+        results.extend(fn(batch))
+        latencies.extend([(time.perf_counter() - t0) / len(batch)] * len(batch))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {'texts': len(texts), 'texts_per_sec': len(texts) / elapsed,
+            'peak_mb': peak / 1024 / 1024, **_percentiles(latencies), 'results': results}
+
+def load_finbert():
+    """FinBERT를 쓸 수 있는 분석기 (없으면 None)"""
+    analyzer = SentimentAnalyzer(use_finbert=True)
+    return analyzer if analyzer.use_finbert else None
+
+def label_accuracy(scores: list, corpus: list) -> float:
+    pairs = [(sentiment_label(s), item['sentiment'])
+             for s, item in zip(scores, corpus) if item.get('sentiment') in LABELS]
+    return sum(a == b for a, b in pairs) / len(pairs) if pairs else None
+
+def agreement(a: list, b: list) -> dict:
+    """두 점수 목록의 라벨 일치율 + 상관계수"""
+    n = min(len(a), len(b))
+    a, b = a[:n], b[:n]
+    same = sum(sentiment_label(x) == sentiment_label(y) for x, y in zip(a, b)) / n
+    corr = statistics.correlation(a, b) if len(set(a)) > 1 and len(set(b)) > 1 else float('nan')
+    return {'label_agreement': same, 'pearson': corr}
+
+def category_report(analyzer, corpus: list):
+    labeled = [item for item in corpus if item.get('category')]
+    if not labeled:
+        print("\n(카테고리 라벨 없음 - categorize_news 분포만 표시)")
+
+    predicted = [analyzer.categorize_news(item['title']) for item in corpus]
+    counts = {}
+    for p in predicted:
+        counts[p] = counts.get(p, 0) + 1
+    print("\n[categorize_news] 예측 분포: " +
+          ", ".join(f"{k} {v / len(corpus):.0%}" for k, v in sorted(counts.items())))
+
+    if not labeled:
+        return
+
+    categories = sorted({item['category'] for item in labeled} | set(predicted))
+    matrix = {(t, p): 0 for t in categories for p in categories}
+    for item, p in zip(corpus, predicted):
+        if item.get('category'):
+            matrix[(item['category'], p)] += 1
+
+    correct = sum(matrix[(c, c)] for c in categories)
+    print(f"[categorize_news] 정확도 {correct / len(labeled):.1%} ({len(labeled)}건)")
+    print(f"{'true/pred':<12}" + ''.join(f"{c[:10]:>11}" for c in categories) + f"{'recall':>9}")
+    for t in categories:
+        row_total = sum(matrix[(t, p)] for p in categories)
+        recall = matrix[(t, t)] / row_total if row_total else 0.0
+        print(f"{t[:12]:<12}" + ''.join(f"{matrix[(t, p)]:>11}" for p in categories) + f"{recall:>9.0%}")
+
+def main():
+    parser = argparse.ArgumentParser(description="감성 분석기 벤치마크 + 정확도 평가")
+    parser.add_argument('--texts', type=int, default=20000, help="합성 코퍼스 크기")
+    parser.add_argument('--corpus', type=Path, default=None, help="기록된 코퍼스 (jsonl/csv)")
+    parser.add_argument('--finbert-texts', type=int, default=500,
+                        help="FinBERT 측정에 쓸 건수 (CPU에서는 느림)")
+    parser.add_argument('--batch-size', type=int, default=32)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else make_corpus(args.texts)
+    texts = [f"{item.get('title', '')} {item.get('summary', '')}" for item in corpus]
+    print(f"코퍼스 {len(corpus)}건 ({args.corpus or '합성'})")
+
+    analyzer = SentimentAnalyzer(use_finbert=False)
+    runs = {
+        'preprocess': time_per_text(analyzer._preprocess_text, texts),
+        'vader': time_per_text(analyzer.analyze_with_vader, texts),
+        'hybrid (vader only)': time_per_text(analyzer.analyze_hybrid, texts),
+    }
+
+    finbert = load_finbert()
+    sample = texts[:args.finbert_texts]
+    if finbert is None:
+        print("⚠️ FinBERT를 불러올 수 없어 FinBERT/하이브리드(FinBERT) 측정을 건너뜁니다")
+    else:
+        runs['finbert'] = time_per_text(finbert.analyze_with_finbert, sample)
+        runs[f'finbert batch {args.batch_size}'] = time_batched(
+            lambda batch: finbert.analyze_with_finbert_batch(batch, args.batch_size),
+            sample, args.batch_size
+        )
+        runs['hybrid (finbert)'] = time_per_text(finbert.analyze_hybrid, sample)
+
+    print(f"\n{'stage':<22}{'texts':>7}{'texts/s':>11}{'p50 us':>10}{'p95 us':>10}"
+          f"{'p99 us':>10}{'peak MB':>9}")
+    for name, r in runs.items():
+        print(f"{name:<22}{r['texts']:>7}{r['texts_per_sec']:>11.0f}{r['p50_us']:>10.0f}"
+              f"{r['p95_us']:>10.0f}{r['p99_us']:>10.0f}{r['peak_mb']:>9.2f}")
+
+    # 감성 라벨 정확도 / 방식 간 일치
+    print(f"\n[감성] 임계값 +{Config.SENTIMENT_THRESHOLD_POSITIVE} / "
+          f"{Config.SENTIMENT_THRESHOLD_NEGATIVE}")
+    scored = {name: r['results'] for name, r in runs.items() if name != 'preprocess'}
+    for name, scores in scored.items():
+        accuracy = label_accuracy(scores, corpus)
+        if accuracy is not None:
+            print(f"  {name:<22} 라벨 정확도 {accuracy:.1%}")
+
+    names = list(scored)
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            agree = agreement(scored[a], scored[b])
+            print(f"  {a} vs {b}: 라벨 일치 {agree['label_agreement']:.1%}, "
+                  f"상관 {agree['pearson']:.3f}")
+
+    category_report(analyzer, corpus)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+청크 파이프라인 메모리 벤치마크 - 합성 유니버스 (오프라인)
+
+사용법:
+    python benchmarks/bench_chunked_memory.py [--tickers 5000] [--chunk-size 100]
+
+같은 청크 크기로 소형(1/10) / 대형 유니버스의 수집→분석→저장 단계를 돌려
+tracemalloc 최대 메모리를 비교합니다. 청크 모드라면 두 값이 거의 같아야 하고, 비율이 --max-ratio를
+넘으면 종료 코드 1로 실패합니다.
+"""
+from pathlib import Path
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from config.config import Config
+from collectors.news_collector import NewsCollector
+from collectors.fetch_utils import RateLimiter
+from analyzers.sentiment_analyzer import SentimentAnalyzer
+from storage.history_store import SentimentHistoryStore
+from src.chunked import run_chunked_pipeline
+
+HEADLINES = [
+    "{company} beats quarterly earnings expectations as revenue climbs",
+    "{company} shares fall after analyst downgrade",
+    "{company} unveils new product line at annual event",
+    "Regulators open probe into {company} accounting practices",
+    "{company} agrees to acquisition deal worth billions",
+]
+
+class SyntheticNewsCollector(NewsCollector):
+    """네트워크 없이 티커별 합성 뉴스를 만드는 수집기"""
+
+    def __init__(self, news_per_ticker: int = 3):
+        # 고정 대기(0.3초)를 피하려고 사실상 무제한 limiter 사용
+        super().__init__(days=Config.NEWS_DAYS,
+                         rate_limiter=RateLimiter(rate_per_sec=1e9, burst=10**6))
+        self.news_per_ticker = news_per_ticker
+
+    def collect_news_for_ticker(self, ticker, company):
+        today = time.strftime('%Y-%m-%d')
+        return [{
+            'ticker': ticker,
+            'title': HEADLINES[(hash(ticker) + i) % len(HEADLINES)].format(company=company),
+            'url': f"https://example.com/{ticker}/{i}",
+            'published_at': today,
+            'summary': f"Synthetic summary {i} for {company}. " * 5,
+            'source': 'Synthetic',
+            'company_name': company
+        } for i in range(self.news_per_ticker)]
+
+def make_holdings(n_tickers: int) -> dict:
+    """섹터 ETF 11개에 n_tickers 종목을 나눠 담은 합성 Holdings"""
+    sectors = list(Config.SECTOR_ETFS.items())
+    holdings = {sector: {'etf': etf, 'holdings': []} for etf, sector in sectors}
+
+    for i in range(n_tickers):
+        etf, sector = sectors[i % len(sectors)]
+        holdings[sector]['holdings'].append({
+            'ticker': f"T{i:05d}",
+            'name': f"Synthetic Company {i}",
+            'weight': round(100.0 / (1 + i // len(sectors)), 4)
+        })
+
+    return holdings
+
+def measure(n_tickers: int, chunk_size: int, analyzer, report: bool = False) -> dict:
+    """유니버스 하나 실행 → (최대 메모리 증가량, 소요 시간)"""
+    holdings = make_holdings(n_tickers)
+    workdir = Path(tempfile.mkdtemp())
+    store = SentimentHistoryStore(workdir / "bench.db")
+
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+
+    result = run_chunked_pipeline(
+        chunk_size=chunk_size,
+        sector_holdings=holdings,
+        news_collector=SyntheticNewsCollector(),
+        analyzer=analyzer,
+        store=store,
+        report_dir=workdir,
+        generate_report=report,
+        verbose=False
+    )
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'tickers': n_tickers,
+        'news': result['news_count'],
+        'peak_mb': (peak - baseline) / 1024 / 1024,
+        'seconds': elapsed
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="청크 파이프라인 메모리 벤치마크")
+    parser.add_argument('--tickers', type=int, default=5000)
+    parser.add_argument('--chunk-size', type=int, default=100)
+    parser.add_argument('--max-ratio', type=float, default=1.5,
+                        help="대형/소형 최대 메모리 비율 허용치")
+    args = parser.parse_args()
+
+    analyzer = SentimentAnalyzer(use_finbert=False)
+
+    small = measure(max(args.chunk_size, args.tickers // 10), args.chunk_size, analyzer)
+    large = measure(args.tickers, args.chunk_size, analyzer)
+    unchunked = measure(args.tickers, args.tickers, analyzer)
+    # 참고용: 스트리밍 리포트 포함 (트렌드 시트는 티커당 1행이라 티커 수에 비례)
+    with_report = measure(args.tickers, args.chunk_size, analyzer, report=True)
+
+    print(f"\n{'mode':<26}{'tickers':>8}{'news':>8}{'peak MB':>10}{'sec':>8}")
+    for label, r in [('chunked (small)', small), ('chunked (large)', large),
+                     ('single chunk (large)', unchunked),
+                     ('chunked + report (large)', with_report)]:
+        print(f"{label:<26}{r['tickers']:>8}{r['news']:>8}{r['peak_mb']:>10.2f}{r['seconds']:>8.2f}")
+
+    ratio = large['peak_mb'] / small['peak_mb'] if small['peak_mb'] else float('inf')
+    print(f"\n최대 메모리 비율 (large/small): {ratio:.2f} (허용 {args.max_ratio})")
+
+    if ratio > args.max_ratio:
+        print("❌ 최대 메모리가 유니버스 크기에 따라 증가합니다")
+        sys.exit(1)
+
+    print("✅ 최대 메모리가 청크 크기로 제한됩니다")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+수집 데몬 조회 간격 벤치마크 - 가상 시계 + 합성 뉴스 흐름 (오프라인)
+
+사용법:
+    python benchmarks/bench_daemon_polling.py [--tickers 55] [--hours 24]
+
+종목마다 뉴스 발행 속도(시간당 건수, 소수 종목에 몰린 분포)를 정해 포아송 과정으로
+기사를 만들고, 같은 흐름을 두 방식으로 조회해 비교합니다.
+
+- 고정 주기: 모든 종목을 Config.REFRESH_INTERVAL_MINUTES마다 조회 (기존 일회성 실행 반복)
+- 데몬: CollectorDaemon 종목별 적응형 간격
+
+시간당 요청 수와 수집 지연(발행 → 수집, 분)을 활발한 종목(상위 10%)과 전체로 나눠 보여 줍니다.
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from config.config import Config
+from collectors.news_collector import NewsCollector
+from collectors.sector_collector import SectorETFCollector
+from analyzers.sentiment_analyzer import SentimentAnalyzer
+from storage.history_store import SentimentHistoryStore
+from src.daemon import CollectorDaemon
+
+START = 1_700_000_000.0  # 가상 시계 시작 (epoch 초)
+
+class SimClock:
+    def __init__(self):
+        self.now = START
+
+    def __call__(self) -> float:
+        return self.now
+
+class SimulatedFeed:
+    """종목별 포아송 발행 시각 목록"""
+
+    def __init__(self, rates: dict, hours: float, seed: int = 3):
+        rng = random.Random(seed)
+        self.rates = rates
+        self.articles = {}
+        for ticker, rate in rates.items():
+            times, t = [], START - 72 * 3600  # 시작 전 3일치 기사도 미리 있음
+            while rate > 0:
+                t += rng.expovariate(rate / 3600)
+                if t > START + hours * 3600:
+                    break
+                times.append(t)
+            self.articles[ticker] = times
+
+    def latest(self, ticker: str, now: float, limit: int = 10) -> list:
+        """now까지 발행된 최근 limit건 (RSS처럼 최신 N건만 보임)"""
+        published = [t for t in self.articles[ticker] if t <= now]
+        return published[-limit:]
+
+class SimNewsCollector(NewsCollector):
+    def __init__(self, feed: SimulatedFeed, clock: SimClock):
+        super().__init__(days=Config.NEWS_DAYS)
+        self.feed = feed
+        self.clock = clock
+
+    def collect_news_for_ticker(self, ticker, company):
+        self.requests += 1
+        return [{
+            'ticker': ticker,
+            'title': f"{company} headline {int(t)}",
+            'url': f"https://example.com/{ticker}/{int(t)}",
+            'published_at': datetime.fromtimestamp(t, timezone.utc).strftime('%Y-%m-%d'),
+            'published_ts': datetime.fromtimestamp(t, timezone.utc).replace(tzinfo=None).isoformat(),
+            'summary': f"Synthetic summary for {company} number {int(t)}",
+            'source': 'Synthetic',
+            'company_name': company
+        } for t in self.feed.latest(ticker, self.clock())]
+
+class SimSectorCollector(SectorETFCollector):
+    """고정 유니버스 (Holdings 요청 없음)"""
+
+    def __init__(self, tickers: list):
+        super().__init__({'SYN': 'Synthetic'})
+        self.tickers = tickers
+
+    def collect_all_sector_holdings(self, top_n=None):
+        return {'Synthetic': {'etf': 'SYN', 'holdings': [
+            {'ticker': t, 'name': f"Company {t}", 'weight': 1.0} for t in self.tickers]}}
+
+def make_rates(n_tickers: int, seed: int = 5) -> dict:
+    """시간당 발행 건수 - 소수 종목에 몰린 분포 (대략 0.05 ~ 6건/h)"""
+    rng = random.Random(seed)
+    return {f"T{i:03d}": round(min(6.0, rng.paretovariate(1.1) * 0.05), 3)
+            for i in range(n_tickers)}
+
+def lags_by_detection(feed: SimulatedFeed, poll_times: dict) -> dict:
+    """종목별 수집 지연(분) - 기사 발행 후 첫 조회까지 (최신 10건 밖으로 밀려 놓친 기사 제외)"""
+    lags = {}
+    for ticker, polls in poll_times.items():
+        seen = set()
+        for now in polls:
+            for t in feed.latest(ticker, now):
+                if t not in seen and t >= START:
+                    seen.add(t)
+                    lags.setdefault(ticker, []).append((now - t) / 60)
+    return lags
+
+def simulate_fixed(feed: SimulatedFeed, hours: float) -> tuple:
+    step = Config.REFRESH_INTERVAL_MINUTES * 60
+    rounds = int(hours * 3600 // step) + 1
+    polls = {t: [START + i * step for i in range(rounds)] for t in feed.rates}
+    return sum(len(p) for p in polls.values()), polls
+
+def simulate_daemon(feed: SimulatedFeed, hours: float) -> tuple:
+    clock = SimClock()
+    workdir = Path(tempfile.mkdtemp())
+    collector = SimNewsCollector(feed, clock)
+    daemon = CollectorDaemon(
+        analyzer=SentimentAnalyzer(use_finbert=False),
+        store=SentimentHistoryStore(workdir / "history.db"),
+        news_collector=collector,
+        sector_collector=SimSectorCollector(list(feed.rates)),
+        state_path=workdir / "state.json",
+        clock=clock
+    )
+    daemon.refresh_universe()
+
+    polls = {t: [] for t in feed.rates}
+    end = START + hours * 3600
+    while clock.now <= end:
+        ticker = daemon.run_once()
+        if ticker is None:
+            clock.now = max(clock.now + 1, daemon._queue[0][0])
+            continue
+        polls[ticker].append(clock.now)
+
+    return collector.requests, polls, daemon
+
+def summarize(label: str, requests: int, lags: dict, active: set, hours: float):
+    active_lags = [lag for t in active for lag in lags.get(t, [])]
+    all_lags = [lag for values in lags.values() for lag in values]
+    median = lambda values: statistics.median(values) if values else float('nan')
+    print(f"{label:<12}{requests / hours:>12.1f}{median(active_lags):>14.1f}"
+          f"{median(all_lags):>12.1f}{len(all_lags):>10}")
+
+def main():
+    parser = argparse.ArgumentParser(description="수집 데몬 조회 간격 벤치마크")
+    parser.add_argument('--tickers', type=int, default=55)
+    parser.add_argument('--hours', type=float, default=24)
+    args = parser.parse_args()
+
+    rates = make_rates(args.tickers)
+    feed = SimulatedFeed(rates, args.hours)
+    active = set(sorted(rates, key=lambda t: -rates[t])[:max(1, args.tickers // 10)])
+
+    fixed_requests, fixed_polls = simulate_fixed(feed, args.hours)
+    daemon_requests, daemon_polls, daemon = simulate_daemon(feed, args.hours)
+
+    print(f"\n종목 {args.tickers}개, {args.hours:.0f}시간, 발행 속도 "
+          f"{min(rates.values())}~{max(rates.values())}건/h (합계 {sum(rates.values()):.1f}건/h)")
+    print(f"\n{'mode':<12}{'requests/h':>12}{'active lag m':>14}{'all lag m':>12}{'articles':>10}")
+    summarize('fixed', fixed_requests, lags_by_detection(feed, fixed_polls), active, args.hours)
+    summarize('daemon', daemon_requests, lags_by_detection(feed, daemon_polls), active, args.hours)
+
+    busiest = sorted(active, key=lambda t: -rates[t])[:10]
+    print("\n활발한 종목의 데몬 간격 (분): " + ", ".join(
+        f"{t} {rates[t]}/h→{daemon.schedules[t].interval:.0f}" for t in busiest))
+    quiet = sorted(rates, key=lambda t: rates[t])[:5]
+    print("조용한 종목의 데몬 간격 (분): " + ", ".join(
+        f"{t} {rates[t]}/h→{daemon.schedules[t].interval:.0f}" for t in quiet))
+
+if __name__ == "__main__":
+    main()
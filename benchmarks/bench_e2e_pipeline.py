@@ -0,0 +1,164 @@
+"""
+파이프라인 end-to-end 벤치마크 - 로컬 대역 서버 기반 (오프라인)
+
+사용법:
+    python benchmarks/bench_e2e_pipeline.py [--sizes 55 500 5000] [--latency-ms 20]
+        [--jitter-ms 10] [--error-rate 0.01] [--save-baseline]
+
+크기마다 새 프로세스에서 대역 서버(standin_server.py)를 띄우고 run_pipeline()을
+Holdings 수집부터 엑셀 리포트까지 그대로 실행해 전체 시간, 처리량(종목/s, 뉴스/s),
+최대 메모리(RSS)와 단계별 시간(실행 계측 요약)을 보여 줍니다.
+
+baselines/e2e_pipeline.json과 비교해 시간이나 메모리가 --tolerance 이상 늘면
+종료 코드 1로 실패합니다. --save-baseline이면 이번 결과를 기준으로 저장합니다.
+수집기의 고정 대기(종목/ETF 간 sleep)는 --keep-delays가 없으면 0으로 둡니다.
+"""
+from pathlib import Path
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "e2e_pipeline.json"
+COMPARED = ('wall_seconds', 'peak_mb')
+
+def run_one(args) -> dict:
+    """현재 프로세스에서 한 크기 실행 (자식 프로세스용)"""
+    from config.config import Config
+    from benchmarks.standin_server import StandInServer, use_standin
+
+    workdir = Path(tempfile.mkdtemp())
+    Config.DATA_DIR = workdir
+    Config.REPORT_DIR = workdir / "reports"
+    Config.HISTORY_DB_PATH = workdir / "history.db"
+    Config.ARCHIVE_DIR = workdir / "archive"
+    Config.METRICS_DIR = workdir / "metrics"
+    Config.METRICS_ENABLED = True
+    if not args.keep_delays:
+        Config.NEWS_REQUEST_DELAY_SECONDS = 0.0
+        Config.HOLDINGS_REQUEST_DELAY_SECONDS = 0.0
+
+    from src.main import run_pipeline
+
+    with StandInServer(args.child, args.latency_ms, args.jitter_ms,
+                       args.error_rate, seed=args.seed) as server:
+        use_standin(server)
+        start = time.perf_counter()
+        report_path, analyzed_news, _, _ = run_pipeline(top_n=None)
+        wall = time.perf_counter() - start
+        served = server.stats()
+
+    metrics_file = next(Config.METRICS_DIR.glob('*.jsonl'))
+    summary = json.loads(metrics_file.read_text(encoding='utf-8').splitlines()[-1])
+
+    return {
+        'tickers': args.child,
+        'news': len(analyzed_news),
+        'wall_seconds': round(wall, 3),
+        'tickers_per_sec': round(args.child / wall, 1),
+        'news_per_sec': round(len(analyzed_news) / wall, 1),
+        'peak_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'requests': served['requests'],
+        'server_errors': served['errors'],
+        'report': report_path is not None,
+        'stages': summary['stages']
+    }
+
+def measure(size: int, args) -> dict:
+    command = [sys.executable, __file__, '--child', str(size),
+               '--latency-ms', str(args.latency_ms), '--jitter-ms', str(args.jitter_ms),
+               '--error-rate', str(args.error_rate), '--seed', str(args.seed)]
+    if args.keep_delays:
+        command.append('--keep-delays')
+
+    result = subprocess.run(command, cwd=BASE_DIR, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def settings_of(args) -> dict:
+    return {'latency_ms': args.latency_ms, 'jitter_ms': args.jitter_ms,
+            'error_rate': args.error_rate, 'seed': args.seed, 'keep_delays': args.keep_delays}
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """기준 대비 tolerance 이상 나빠진 항목 [(크기, 지표, 기준, 이번)]"""
+    regressions = []
+    for r in results:
+        base = baseline['results'].get(str(r['tickers']))
+        if base is None:
+            continue
+        for key in COMPARED:
+            if r[key] > base[key] * (1 + tolerance):
+                regressions.append((r['tickers'], key, base[key], r[key]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="파이프라인 end-to-end 벤치마크")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[55, 500, 5000])
+    parser.add_argument('--latency-ms', type=float, default=20.0)
+    parser.add_argument('--jitter-ms', type=float, default=10.0)
+    parser.add_argument('--error-rate', type=float, default=0.01)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--keep-delays', action='store_true',
+                        help="수집기 고정 대기 유지 (실제 운영 설정 그대로)")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="기준 대비 허용 증가율 (시간/메모리)")
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--child', type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(run_one(args)))
+        return
+
+    results = []
+    for size in args.sizes:
+        print(f"⏳ {size}종목 실행 중...", flush=True)
+        results.append(measure(size, args))
+
+    print(f"\n{'tickers':>8}{'news':>8}{'wall s':>9}{'tick/s':>9}{'news/s':>9}"
+          f"{'peak MB':>9}{'reqs':>7}{'503s':>6}")
+    for r in results:
+        print(f"{r['tickers']:>8}{r['news']:>8}{r['wall_seconds']:>9.2f}{r['tickers_per_sec']:>9.1f}"
+              f"{r['news_per_sec']:>9.1f}{r['peak_mb']:>9.1f}{r['requests']:>7}{r['server_errors']:>6}")
+
+    print("\n단계별 시간 (s)")
+    stage_names = list(dict.fromkeys(name for r in results for name in r['stages']))
+    print(f"{'tickers':>8}" + ''.join(f"{name:>10}" for name in stage_names))
+    for r in results:
+        print(f"{r['tickers']:>8}" + ''.join(f"{r['stages'].get(name, 0.0):>10.2f}"
+                                             for name in stage_names))
+
+    if args.save_baseline:
+        baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {'results': {}}
+        baseline['settings'] = settings_of(args)
+        baseline['python'] = sys.version.split()[0]
+        baseline['results'].update({str(r['tickers']): r for r in results})
+        BASELINE_PATH.parent.mkdir(exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=1) + '\n')
+        print(f"\n✅ 기준 저장: {BASELINE_PATH}")
+        return
+
+    if not BASELINE_PATH.exists():
+        print("\n⚠️ 기준 파일이 없습니다 (--save-baseline으로 생성)")
+        return
+
+    baseline = json.loads(BASELINE_PATH.read_text())
+    if baseline.get('settings') != settings_of(args):
+        print(f"\n⚠️ 기준과 설정이 다릅니다: {baseline.get('settings')}")
+
+    regressions = compare(results, baseline, args.tolerance)
+    for size, key, base, current in regressions:
+        print(f"❌ {size}종목 {key}: {base} → {current}")
+    if regressions:
+        sys.exit(1)
+    print(f"\n✅ 기준 대비 회귀 없음 (허용 +{args.tolerance:.0%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+엑셀 리포트 벤치마크 - 합성 뉴스 행 (오프라인)
+
+사용법:
+    python benchmarks/bench_excel_report.py [--rows 10000 40000]
+
+기본 생성기(SectorETFExcelGenerator)와 스트리밍 생성기
+(StreamingSectorExcelGenerator)를 Sentiment 색상 방식별로 (셀별 스타일 vs
+조건부 서식) 돌려 생성 시간, tracemalloc 최대 메모리, 파일 크기를 비교합니다.
+"""
+from pathlib import Path
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from config.config import Config
+from reporters.excel_generator_sector import SectorETFExcelGenerator
+from reporters.excel_streaming import StreamingSectorExcelGenerator
+
+CATEGORIES = ['Earnings', 'M&A', 'Product', 'Regulatory', 'Analyst', 'General']
+
+def make_news(n_rows: int, seed: int = 42):
+    """섹터 순으로 정렬된 합성 분석 뉴스"""
+    rng = random.Random(seed)
+    sectors = sorted(Config.SECTOR_ETFS.items(), key=lambda item: item[1])
+    news = []
+
+    for i in range(n_rows):
+        etf, sector = sectors[i * len(sectors) // n_rows]
+        ticker = f"T{i % 500:03d}"
+        news.append({
+            'etf': etf,
+            'sector': sector,
+            'ticker': ticker,
+            'company_name': f"Synthetic Company {ticker}",
+            'weight': round(rng.uniform(0.5, 20), 2),
+            'category': rng.choice(CATEGORIES),
+            'title': f"Synthetic headline {i} about {ticker} and the market outlook",
+            'url': f"https://finance.yahoo.com/news/synthetic-{i}.html",
+            'published_at': f"2024-01-{1 + i % 28:02d}",
+            'summary': "Synthetic summary text for benchmarking the report writer. " * 3,
+            'sentiment_score': round(rng.uniform(-1, 1), 4)
+        })
+
+    return news
+
+def holdings_for(news):
+    return {n['sector']: {'etf': n['etf'], 'holdings': []} for n in news}
+
+def run_once(generator, news, date_str: str, trace_memory: bool = True) -> dict:
+    """시간은 추적 없이 측정하고, 메모리는 tracemalloc으로 한 번 더 실행해 측정"""
+    start = time.perf_counter()
+    path = generator.generate_sector_report(news, holdings_for(news), date_str)
+    elapsed = time.perf_counter() - start
+
+    peak = 0
+    if trace_memory:
+        tracemalloc.start()
+        generator.generate_sector_report(news, holdings_for(news), date_str)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        'seconds': elapsed,
+        'peak_mb': peak / 1024 / 1024,
+        'size_kb': Path(path).stat().st_size / 1024
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="엑셀 리포트 벤치마크")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 40000])
+    parser.add_argument('--no-memory', action='store_true',
+                        help="tracemalloc 측정 생략 (시간만)")
+    args = parser.parse_args()
+
+    output_dir = Path(tempfile.mkdtemp())
+    backends = [
+        ('standard/cell', SectorETFExcelGenerator(output_dir, conditional_colors=False)),
+        ('standard/cf', SectorETFExcelGenerator(output_dir)),
+        ('streaming/cell', StreamingSectorExcelGenerator(output_dir, conditional_colors=False)),
+        ('streaming/cf', StreamingSectorExcelGenerator(output_dir)),
+    ]
+
+    # cell: 셀마다 색상 스타일 (기본 생성기는 변경 전 리포트와 같은 경로) / cf: 조건부 서식 규칙 3개
+    results = []
+    for n_rows in args.rows:
+        news = make_news(n_rows)
+        for name, generator in backends:
+            r = run_once(generator, news, f"bench_{name.replace('/', '_')}_{n_rows}",
+                         trace_memory=not args.no_memory)
+            results.append((name, n_rows, r))
+
+    print(f"\n{'backend':<16}{'rows':>8}{'sec':>9}{'rows/s':>10}{'peak MB':>10}{'size KB':>10}")
+    for name, n_rows, r in results:
+        print(f"{name:<16}{n_rows:>8}{r['seconds']:>9.2f}{n_rows / r['seconds']:>10.0f}"
+              f"{r['peak_mb']:>10.1f}{r['size_kb']:>10.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+내보내기 형식 벤치마크 - CSV vs Parquet vs Arrow IPC (오프라인)
+
+사용법:
+    python benchmarks/bench_export_formats.py [--rows 10000 200000]
+
+합성 뉴스 DataFrame을 형식별로 기록/재로드하는 시간과 파일 크기를 비교합니다.
+Arrow IPC 재로드는 메모리 매핑(무복사) 기준입니다.
+"""
+from pathlib import Path
+import argparse
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from reporters.export_utils import news_to_frame, write_export, read_arrow_ipc
+from benchmarks.bench_excel_report import make_news, holdings_for
+
+def _read_csv(path: Path) -> pd.DataFrame:
+    return pd.read_csv(path, encoding='utf-8-sig')
+
+def _read_parquet(path: Path) -> pd.DataFrame:
+    import pyarrow.parquet as pq
+    return pq.read_table(path).to_pandas()
+
+def _read_arrow(path: Path):
+    # 소비자가 Arrow 테이블을 그대로 쓰는 경우 (pandas 변환 없음)
+    return read_arrow_ipc(path, memory_map=True)
+
+READERS = {
+    'csv': _read_csv,
+    'parquet': _read_parquet,
+    'arrow': _read_arrow,
+}
+
+def run(df: pd.DataFrame, output_dir: Path) -> list:
+    results = []
+    for fmt, reader in READERS.items():
+        start = time.perf_counter()
+        path = write_export(df, output_dir, f"bench_{len(df)}", fmt)
+        write_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded = reader(path)
+        read_time = time.perf_counter() - start
+
+        assert len(loaded) == len(df)
+        results.append((fmt, write_time, read_time, path.stat().st_size / 1e6))
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="내보내기 형식 벤치마크")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 200000])
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            news = make_news(n_rows)
+            df = news_to_frame(news, holdings_for(news))
+
+            print(f"\n[{n_rows}행]")
+            print(f"{'형식':<10}{'기록(s)':>10}{'로드(s)':>10}{'크기(MB)':>10}")
+            for fmt, write_time, read_time, size in run(df, Path(tmp)):
+                print(f"{fmt:<10}{write_time:>10.3f}{read_time:>10.3f}{size:>10.2f}")
+
+if __name__ == "__main__":
+    main()
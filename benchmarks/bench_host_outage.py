@@ -0,0 +1,105 @@
+"""
+호스트 장애 벤치마크 - Yahoo RSS 호스트 장애 시 뉴스 수집 시간 (오프라인)
+
+사용법:
+    python benchmarks/bench_host_outage.py [--tickers 55] [--timeout 1.0] [--hang-ms 3000]
+
+대역 서버(standin_server.py) 두 개를 띄워 Yahoo RSS는 장애 서버(127.0.0.1)로,
+MarketWatch는 정상 서버(localhost)로 보내고 collect_all_news()를 실행합니다.
+호스트 이름이 달라 브레이커/동시 요청 한도도 호스트별로 따로 적용됩니다.
+
+- healthy: 장애 없음
+- 503: Yahoo가 모든 요청에 503
+- hang: Yahoo 응답이 응답 타임아웃(--timeout)보다 늦음
+
+장애마다 호스트별 상태(Config.HOST_GUARD_ENABLED) 끔/켬으로 전체 시간, 장애 호스트에
+실제로 보낸 요청 수, 수집한 뉴스 수, 브레이커 열림/거절 수를 비교합니다.
+실제 타임아웃(10초) 대신 --timeout으로 줄여서 실행 시간을 짧게 유지합니다.
+"""
+from pathlib import Path
+import argparse
+import sys
+import time
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from config.config import Config
+from collectors.fetch_utils import reset_host_guards
+from collectors.news_collector import NewsCollector
+from benchmarks.standin_server import StandInServer
+from src.instrumentation import collect_metrics
+
+SCENARIOS = {
+    'healthy': {},
+    '503': {'error_rate': 1.0},
+    'hang': {'hang': True},
+}
+
+def portfolio_of(server: StandInServer) -> list:
+    return [{'ticker': h['ticker'], 'company': h['name'], 'sector': etf, 'etf': etf,
+             'weight': h['weight']}
+            for etf, holdings in server.holdings.items() for h in holdings]
+
+def run_scenario(name: str, guard: bool, args) -> dict:
+    spec = SCENARIOS[name]
+    latency = args.hang_ms if spec.get('hang') else args.latency_ms
+    yahoo = StandInServer(args.tickers, latency_ms=latency, jitter_ms=min(10.0, latency),
+                          error_rate=spec.get('error_rate', 0.0)).start()
+    marketwatch = StandInServer(args.tickers, latency_ms=args.latency_ms).start()
+
+    try:
+        port = marketwatch.url.rsplit(':', 1)[-1]
+        Config.YAHOO_RSS_URL = yahoo.url + "/rss/headline?s={ticker}"
+        Config.MARKETWATCH_SEARCH_URL = f"http://localhost:{port}/search?q={{ticker}}"
+        Config.MARKETWATCH_BASE_URL = f"http://localhost:{port}"
+        Config.HOST_GUARD_ENABLED = guard
+        reset_host_guards()
+
+        portfolio = portfolio_of(yahoo)
+        collector = NewsCollector(days=Config.NEWS_DAYS)
+        with collect_metrics(summary=False) as metrics:
+            start = time.perf_counter()
+            news = collector.collect_all_news(portfolio, verbose=False)
+            wall = time.perf_counter() - start
+
+        breakers = metrics.summary()['breakers'].get('127.0.0.1', {})
+        return {
+            'scenario': name,
+            'guard': 'on' if guard else 'off',
+            'wall_seconds': round(wall, 2),
+            'bad_host_requests': yahoo.stats()['requests'],
+            'news': len(news),
+            'opens': breakers.get('opens', 0),
+            'rejected': breakers.get('rejected', 0)
+        }
+    finally:
+        yahoo.stop()
+        marketwatch.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="호스트 장애 벤치마크")
+    parser.add_argument('--tickers', type=int, default=55)
+    parser.add_argument('--latency-ms', type=float, default=20.0)
+    parser.add_argument('--hang-ms', type=float, default=3000.0)
+    parser.add_argument('--timeout', type=float, default=1.0, help="응답 타임아웃 (초)")
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=list(SCENARIOS))
+    args = parser.parse_args()
+
+    Config.FETCH_READ_TIMEOUT_SECONDS = args.timeout
+    Config.NEWS_REQUEST_DELAY_SECONDS = 0  # 고정 대기는 빼고 요청 시간만 비교
+
+    print(f"\n종목 {args.tickers}개, 동시 수집 {Config.NEWS_FETCH_WORKERS}, 응답 타임아웃 "
+          f"{args.timeout}s, 브레이커 연속 실패 {Config.BREAKER_FAILURE_THRESHOLD}회 / "
+          f"대기 {Config.BREAKER_COOLDOWN_SECONDS}s")
+    print(f"\n{'scenario':<10}{'guard':>6}{'wall s':>9}{'bad reqs':>10}{'news':>7}"
+          f"{'opens':>7}{'rejected':>10}")
+
+    for name in args.scenarios:
+        for guard in (False, True):
+            r = run_scenario(name, guard, args)
+            print(f"{r['scenario']:<10}{r['guard']:>6}{r['wall_seconds']:>9.2f}"
+                  f"{r['bad_host_requests']:>10}{r['news']:>7}{r['opens']:>7}{r['rejected']:>10}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+임포트 시간 벤치마크 - python -X importtime 기반 (오프라인)
+
+사용법:
+    python benchmarks/bench_import_time.py [--repeat 5] [--top 10]
+
+새 프로세스에서 모듈을 임포트해 누적 임포트 시간(중앙값)과 가장 무거운
+직접 임포트를 보여 주고, 대시보드 시작 화면(세션별 실행 모드)을
+Streamlit AppTest로 한 번 그리는 데 걸리는 시간을 측정합니다.
+"""
+from pathlib import Path
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+
+BASE_DIR = Path(__file__).parent.parent
+
+TARGETS = [
+    'app',
+    'src.main',
+    'analyzers.sentiment_analyzer',
+    'collectors.sector_collector',
+    'collectors.news_collector',
+]
+
+_LINE_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+FIRST_PAINT_SCRIPT = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+from config.config import Config
+Config.DASHBOARD_SHARED_REFRESH = False  # 네트워크 없이 시작 화면만
+at = AppTest.from_file('app.py', default_timeout=60)
+at.run()
+assert not at.exception, at.exception
+print(time.perf_counter() - start)
+"""
+
+def profile_import(module: str) -> list:
+    """[(self_us, cumulative_us, depth, name), ...] (importtime 출력 순서)"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BASE_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            rows.append((int(match.group(1)), int(match.group(2)),
+                         len(match.group(3)) // 2, match.group(4)))
+    return rows
+
+def direct_imports(rows: list, module: str) -> list:
+    """module이 직접 임포트한 모듈 (출력에서 module 줄 바로 앞의 depth 1 블록)"""
+    end = max(i for i, row in enumerate(rows) if row[3] == module and row[2] == 0)
+    start = max((i for i in range(end) if rows[i][2] == 0), default=-1) + 1
+    return [row for row in rows[start:end] if row[2] == 1]
+
+def measure_first_paint(repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-c', FIRST_PAINT_SCRIPT],
+                                cwd=BASE_DIR, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        times.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="임포트 시간 벤치마크")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=8)
+    parser.add_argument('--modules', nargs='+', default=TARGETS)
+    args = parser.parse_args(argv)
+
+    for module in args.modules:
+        try:
+            runs = [profile_import(module) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"\n[{module}] 임포트 실패: {e}")
+            continue
+
+        totals = [next(r[1] for r in rows if r[3] == module and r[2] == 0) for rows in runs]
+        print(f"\n[{module}] 누적 {statistics.median(totals) / 1000:.0f}ms (중앙값, {args.repeat}회)")
+
+        heaviest = sorted(direct_imports(runs[-1], module), key=lambda r: -r[1])[:args.top]
+        for _, cumulative, _, name in heaviest:
+            print(f"  {cumulative / 1000:>8.1f}ms  {name}")
+
+    print(f"\n[시작 화면] AppTest 첫 렌더링 {measure_first_paint(args.repeat):.2f}s (중앙값, 프로세스 시작 포함)")
+
+if __name__ == "__main__":
+    main()
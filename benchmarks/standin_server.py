@@ -0,0 +1,218 @@
+"""
+로컬 대역 서버 - Yahoo RSS / MarketWatch 검색 / Holdings 픽스처를 HTTP로 제공 (오프라인)
+
+사용법 (단독 실행):
+    python benchmarks/standin_server.py [--port 8765] [--tickers 500] [--latency-ms 20]
+
+    /rss/headline?s=TICKER   Yahoo Finance RSS (fixtures/yahoo_rss.xml, 종목마다 0~10건)
+    /search?q=TICKER         MarketWatch 검색 HTML (fixtures/marketwatch_search.html)
+    /holdings/ETF            Holdings JSON [{'ticker', 'name', 'weight'}, ...]
+
+응답마다 지연(latency ± jitter)을 주고, error_rate 확률로 503을 돌려줍니다.
+use_standin(server)로 Config의 수집 엔드포인트를 이 서버로 바꿉니다.
+"""
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import zlib
+
+BASE_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from config.config import Config
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+
+# 종목별 세부 문구 어휘 - 템플릿만 같은 다른 종목 기사가 유사 중복으로 묶이지 않게 함
+DETAIL_WORDS = (
+    "amid cloud demand chip supply pricing pressure margin outlook china sales "
+    "consumer slowdown rate cuts inflation data center ai spending energy costs "
+    "freight volumes drug trial approval loan growth deposit outflows ad revenue "
+    "subscriber gains store traffic inventory glut oil prices power demand tariffs "
+    "labor talks buyback program debt offering guidance reset patent ruling "
+    "streaming churn defense contracts housing starts travel rebound insurance claims"
+).split()
+
+def _split_items(template: str):
+    """RSS 템플릿 → (머리, [item 블록...], 꼬리)"""
+    head, _, rest = template.partition('<item>')
+    blocks = ('<item>' + rest).split('</item>')
+    items = [block + '</item>' for block in blocks[:-1]]
+    return head, items, blocks[-1]
+
+def make_universe(n_tickers: int) -> dict:
+    """{ETF: [{'ticker', 'name', 'weight'}, ...]} - n_tickers 종목을 섹터 ETF에 고르게 배분"""
+    etfs = list(Config.SECTOR_ETFS)
+    holdings = {etf: [] for etf in etfs}
+
+    for i in range(n_tickers):
+        etf = etfs[i % len(etfs)]
+        holdings[etf].append({
+            'ticker': f"T{i:05d}",
+            'name': f"Standin Company {i}",
+            'weight': round(100.0 / (1 + i // len(etfs)), 4)
+        })
+
+    return holdings
+
+class StandInServer:
+    """백그라운드 스레드에서 도는 픽스처 HTTP 서버"""
+
+    def __init__(self, n_tickers: int = 55, latency_ms: float = 20.0, jitter_ms: float = 10.0,
+                 error_rate: float = 0.0, seed: int = 0, port: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.holdings = make_universe(n_tickers)
+
+        self._rss = _split_items((FIXTURE_DIR / "yahoo_rss.xml").read_text(encoding='utf-8'))
+        self._html = (FIXTURE_DIR / "marketwatch_search.html").read_text(encoding='utf-8')
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.bytes_sent = 0
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'StandInServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True,
+                                        name='standin-server')
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---------- 응답 ----------
+
+    def _delay_and_fail(self) -> bool:
+        """지연 후 이번 요청을 실패시킬지 여부"""
+        with self._lock:
+            delay = self._random.uniform(self.latency_ms - self.jitter_ms,
+                                         self.latency_ms + self.jitter_ms)
+            fail = self._random.random() < self.error_rate
+        time.sleep(max(0.0, delay) / 1000)
+        return fail
+
+    def detail(self, ticker: str, i: int) -> str:
+        rng = random.Random(f"{ticker}-{i}")
+        return ' '.join(rng.sample(DETAIL_WORDS, 6))
+
+    def rss(self, ticker: str) -> bytes:
+        head, items, tail = self._rss
+        # 종목마다 고정된 건수 (3건 미만이면 수집기가 MarketWatch도 요청)
+        count = zlib.crc32(ticker.encode()) % (len(items) + 1)
+        now = datetime.now(timezone.utc)
+        body = [item.replace('{pub_date}', format_datetime(now - timedelta(hours=3 * i)))
+                    .replace('{detail}', self.detail(ticker, i))
+                for i, item in enumerate(items[:count])]
+        text = head.replace('{pub_date}', format_datetime(now)) + ''.join(body) + tail
+        return text.replace('{ticker}', ticker).encode('utf-8')
+
+    def search(self, ticker: str) -> bytes:
+        text = self._html
+        for i in range(text.count('{detail}')):
+            text = text.replace('{detail}', self.detail(ticker, 100 + i), 1)
+        return text.replace('{ticker}', ticker).encode('utf-8')
+
+    def holdings_json(self, etf: str) -> bytes:
+        return json.dumps(self.holdings.get(etf, [])).encode('utf-8')
+
+    def _route(self, path: str):
+        """경로 → (상태 코드, content-type, 본문)"""
+        parts = urlsplit(path)
+        query = parse_qs(parts.query)
+
+        if parts.path == '/rss/headline':
+            return 200, 'application/rss+xml', self.rss(query.get('s', [''])[0])
+        if parts.path == '/search':
+            return 200, 'text/html; charset=utf-8', self.search(query.get('q', [''])[0])
+        if parts.path.startswith('/holdings/'):
+            return 200, 'application/json', self.holdings_json(parts.path.rsplit('/', 1)[-1])
+        return 404, 'text/plain', b'not found'
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                if server._delay_and_fail():
+                    status, content_type, body = 503, 'text/plain', b'service unavailable'
+                else:
+                    status, content_type, body = server._route(self.path)
+
+                with server._lock:
+                    server.requests += 1
+                    server.errors += status != 200
+                    server.bytes_sent += len(body)
+
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # 클라이언트가 타임아웃으로 먼저 끊음
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'requests': self.requests, 'errors': self.errors, 'bytes': self.bytes_sent}
+
+def use_standin(server: StandInServer):
+    """Config의 수집 엔드포인트를 대역 서버로 교체 (같은 프로세스에서만 유효)"""
+    Config.YAHOO_RSS_URL = server.url + "/rss/headline?s={ticker}"
+    Config.MARKETWATCH_SEARCH_URL = server.url + "/search?q={ticker}"
+    Config.MARKETWATCH_BASE_URL = server.url
+    Config.HOLDINGS_URL = server.url + "/holdings/{etf}"
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 대역 서버")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--tickers', type=int, default=55)
+    parser.add_argument('--latency-ms', type=float, default=20.0)
+    parser.add_argument('--jitter-ms', type=float, default=10.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = StandInServer(args.tickers, args.latency_ms, args.jitter_ms,
+                           args.error_rate, port=args.port).start()
+    print(f"✅ 대역 서버: {server.url} (HOLDINGS_URL={server.url}/holdings/{{etf}})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+수집기 공용 유틸 - 요청 속도 제한 + 응답 캐시 + 호스트별 동시 요청 한도/서킷 브레이커 (스레드 공유)
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+class RateLimiter:
+    """토큰 버킷 방식 요청 속도 제한 (여러 스레드 공유)"""
+
+    def __init__(self, rate_per_sec: float = 3.0, burst: int = 1):
+        self.rate_per_sec = rate_per_sec
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개 확보할 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._updated) * self.rate_per_sec)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate_per_sec
+
+            time.sleep(wait)
+
+class FetchCache:
+    """키별 응답 캐시 - 동시에 같은 키를 요청하면 한 번만 가져옴"""
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        self.ttl_seconds = ttl_seconds
+        self._data: Dict[str, tuple] = {}
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            if key not in self._key_locks:
+                self._key_locks[key] = threading.Lock()
+            return self._key_locks[key]
+
+    def _lookup(self, key: str):
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+
+        stored_at, value = entry
+        if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+            return False, None
+
+        return True, value
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any],
+                     cacheable: Optional[Callable[[Any], bool]] = None) -> Any:
+        """캐시에 있으면 반환, 없으면 fetch() 결과 저장 후 반환
+
+        cacheable(결과)가 False면 저장하지 않음 (예: 실패 응답은 다음 호출에서 다시 요청)
+        """
+        found, value = self._lookup(key)
+        if found:
+            with self._lock:
+                self.hits += 1
+            return value
+
+        with self._key_lock(key):
+            # 대기하는 동안 다른 스레드가 채웠을 수 있음
+            found, value = self._lookup(key)
+            if found:
+                with self._lock:
+                    self.hits += 1
+                return value
+
+            value = fetch()
+            with self._lock:
+                if cacheable is None or cacheable(value):
+                    self._data[key] = (time.monotonic(), value)
+                self.misses += 1
+
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._key_locks.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+# ---------- 호스트별 상태 (적응형 동시 요청 수 + 서킷 브레이커) ----------
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpenError(Exception):
+    """호스트 브레이커가 열려 있어 요청하지 않음"""
+
+class AdaptiveConcurrencyLimit:
+    """AIMD 동시 요청 한도 - 성공하면 조금씩(+1/한도) 늘리고 과부하 응답(429/5xx)이면 절반으로
+
+    타임아웃/연결 오류는 한도를 줄이지 않음 (죽은 호스트를 한 건씩 기다리지 않게 브레이커가 처리)
+    """
+
+    def __init__(self, initial: int = 2, min_limit: int = 1, max_limit: int = 16):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(initial)
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, ok: bool, backoff: bool = True):
+        """ok면 한도 증가, 아니면 backoff일 때만 절반으로"""
+        with self._cond:
+            self.in_flight -= 1
+            if ok:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            elif backoff:
+                self.limit = max(self.min_limit, self.limit / 2)
+            self._cond.notify_all()
+
+class CircuitBreaker:
+    """연속 실패가 failure_threshold번이면 열림 → cooldown_seconds 동안 바로 거절
+    → 이후 시험 요청 1건(half-open) 성공 시 닫힘, 실패 시 다시 열림
+
+    열리기 전에 시작된 요청이 열린 뒤에 실패해도 대기 시간을 다시 시작하지 않습니다
+    (대기 시간은 시험 요청 실패에서만 다시 시작).
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown_seconds: float = 30.0,
+                 on_change: Optional[Callable[[str], None]] = None):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.on_change = on_change
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.opens = 0
+        self.rejected = 0
+        self._probing = False
+        self._probe_thread: Optional[int] = None  # 시험 요청을 보낸 스레드
+        self._lock = threading.Lock()
+
+    def _is_probe(self) -> bool:
+        # 잠금을 잡은 상태에서 호출 - HostGuard.call은 허용받은 스레드에서 결과를 기록
+        return self._probing and self._probe_thread == threading.get_ident()
+
+    def _set(self, state: str):
+        # 잠금을 잡은 상태에서 호출
+        if state != self.state:
+            self.state = state
+            if self.on_change is not None:
+                self.on_change(state)
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown_seconds:
+                self._set(HALF_OPEN)
+                self._probing = False
+
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                self._probe_thread = threading.get_ident()
+                return True
+
+            self.rejected += 1
+            return False
+
+    def reject_if_open(self) -> bool:
+        """한도를 기다리는 동안 열렸으면 True (거절로 집계)"""
+        with self._lock:
+            if self.state != OPEN:
+                return False
+            self.rejected += 1
+            return True
+
+    def release_probe(self):
+        """결과를 세지 않는 요청 종료 - 시험 요청이었으면 다음 요청이 다시 시험하도록"""
+        with self._lock:
+            if self._is_probe():
+                self._probing = False
+
+    def record(self, ok: bool):
+        with self._lock:
+            if ok:
+                self.failures = 0
+                self._probing = False
+                self._set(CLOSED)
+                return
+
+            if self.state == OPEN:
+                return  # 열리기 전에 시작된 요청 - 대기 시간 유지
+            if self.state == HALF_OPEN:
+                if not self._is_probe():
+                    return  # 시험 요청의 결과만 반영
+            else:
+                self.failures += 1
+                if self.failures < self.failure_threshold:
+                    return
+
+            self.opened_at = time.monotonic()
+            self.opens += 1
+            self._probing = False
+            self._set(OPEN)
+
+class HostGuard:
+    """호스트 하나의 동시 요청 한도 + 브레이커"""
+
+    def __init__(self, host: str, limit: AdaptiveConcurrencyLimit, breaker: CircuitBreaker):
+        self.host = host
+        self.limit = limit
+        self.breaker = breaker
+
+    def call(self, fetch: Callable[[], Any], is_ok: Callable[[Any], bool],
+             ignore: tuple = ()) -> Any:
+        """브레이커가 허용하면 한도 안에서 fetch() 실행
+
+        예외가 나거나 is_ok(결과)가 False면 실패로 기록합니다 (429/5xx 등).
+        ignore에 든 예외(예: 실행 예산 초과)는 호스트 실패로 세지 않습니다.
+        열려 있으면 CircuitOpenError를 바로 발생시킵니다.
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.host} 브레이커 열림")
+
+        self.limit.acquire()
+        if self.breaker.reject_if_open():
+            self.limit.release(ok=False, backoff=False)
+            raise CircuitOpenError(f"{self.host} 브레이커 열림")
+
+        ok = backoff = False
+        counted = True
+        try:
+            result = fetch()
+            ok = is_ok(result)
+            backoff = not ok  # 응답은 왔지만 과부하 (429/5xx)
+            return result
+        except ignore:
+            counted = False
+            raise
+        finally:
+            self.limit.release(ok, backoff=backoff)
+            if counted:
+                self.breaker.record(ok)
+            else:
+                self.breaker.release_probe()
+
+    def stats(self) -> Dict:
+        return {
+            'state': self.breaker.state,
+            'limit': round(self.limit.limit, 2),
+            'in_flight': self.limit.in_flight,
+            'failures': self.breaker.failures,
+            'opens': self.breaker.opens,
+            'rejected': self.breaker.rejected
+        }
+
+_host_guards: Dict[str, HostGuard] = {}
+_host_lock = threading.Lock()
+
+def get_host_guard(host: str) -> HostGuard:
+    """프로세스 공용 호스트별 상태 (처음 요청할 때 Config 값으로 생성)"""
+    from config.config import Config
+    from src.instrumentation import record_breaker
+
+    with _host_lock:
+        guard = _host_guards.get(host)
+        if guard is None:
+            guard = _host_guards[host] = HostGuard(
+                host,
+                AdaptiveConcurrencyLimit(Config.HOST_INITIAL_CONCURRENCY,
+                                         max_limit=Config.HOST_MAX_CONCURRENCY),
+                CircuitBreaker(Config.BREAKER_FAILURE_THRESHOLD, Config.BREAKER_COOLDOWN_SECONDS,
+                               on_change=lambda state: record_breaker(host, state))
+            )
+        return guard
+
+def host_guard_stats() -> Dict[str, Dict]:
+    """{호스트: {'state', 'limit', 'in_flight', 'failures', 'opens', 'rejected'}}"""
+    with _host_lock:
+        guards = list(_host_guards.values())
+    return {guard.host: guard.stats() for guard in guards}
+
+def reset_host_guards():
+    with _host_lock:
+        _host_guards.clear()
+
+def is_healthy_response(response) -> bool:
+    """요청 제한(429)과 서버 오류(5xx)만 호스트 장애로 봄 (404 등은 정상 응답)"""
+    return response.status_code != 429 and response.status_code < 500
@@ -1,27 +1,145 @@
 """
 뉴스 수집기 - Yahoo Finance RSS 기반
 """
-import feedparser
-import requests
 from datetime import datetime, timedelta
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from typing import List, Dict, Optional
+from urllib.parse import urlsplit
+import threading
 import time
-from bs4 import BeautifulSoup
+
+from config.config import Config
+from collectors.fetch_utils import (RateLimiter, FetchCache, CircuitOpenError,
+                                    get_host_guard, is_healthy_response)
+from src.deadline import Deadline, DeadlineExceeded
+from src.instrumentation import record_breaker, record_cache, record_fetch
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+def request_timeout(deadline: Optional[Deadline] = None) -> tuple:
+    """requests timeout=(연결, 응답) 초 - deadline이 있으면 남은 시간 이하로"""
+    timeout = (Config.FETCH_CONNECT_TIMEOUT_SECONDS, Config.FETCH_READ_TIMEOUT_SECONDS)
+    if deadline is None:
+        return timeout
+    return tuple(deadline.clip(t) for t in timeout)
 
 class NewsCollector:
     """뉴스 수집기"""
     
-    def __init__(self, days=3):
+    def __init__(self, days=3, start_date: Optional[datetime] = None,
+                 end_date: Optional[datetime] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 cache: Optional[FetchCache] = None,
+                 deadline: Optional[Deadline] = None):
+        """
+        start_date/end_date: 수집 기간 [start, end) - 없으면 조회 시점 기준 최근 days일
+        rate_limiter/cache: 여러 수집기(스레드)가 공유하는 속도 제한/응답 캐시
+        deadline: 실행 예산 - 마감 후에는 요청하지 않고 남은 종목을 deadline.skipped에 기록
+        """
         self.days = days
-        self.cutoff_date = datetime.now() - timedelta(days=days)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.deadline = deadline
+        self.requests = 0  # 캐시를 거치지 않은 실제 요청 수
+        self.failures = 0  # 실패 응답/오류/브레이커 거절로 결과를 받지 못한 소스 조회 수
+        self._requests_lock = threading.Lock()
+        self._local = threading.local()  # 스레드별 요청 수 (종목 간 대기 판단용)
+    
+    def _count_failure(self):
+        with self._requests_lock:
+            self.failures += 1
+    
+    @property
+    def cutoff_date(self) -> datetime:
+        """수집 기간 시작 (start_date가 없으면 매번 현재 시각 기준 - 데몬처럼 오래 쓰는 수집기도 기간이 이동)"""
+        return self.start_date or datetime.now() - timedelta(days=self.days)
+    
+    def _in_window(self, pub_datetime: datetime) -> bool:
+        """수집 기간 안의 뉴스인지"""
+        if pub_datetime < self.cutoff_date:
+            return False
+        if self.end_date is not None and pub_datetime >= self.end_date:
+            return False
+        return True
+    
+    def _fetch(self, key: str, fetch, source: str = '', ticker: str = ''):
+        """속도 제한 + 캐시 + 호스트별 상태를 거쳐 요청 (fetch()는 requests 응답을 반환)
+        
+        실제 요청마다 소스/호스트/티커별 지연과 바이트 수를 계측에 기록합니다.
+        호스트 브레이커가 열려 있으면 요청 없이 CircuitOpenError를,
+        실행 예산이 끝났으면 (요청 전이나 타임아웃 후) DeadlineExceeded를 발생시킵니다.
+        """
+        called = False
+        host = urlsplit(key).hostname or ''
+        
+        def timed():
+            if self.deadline is not None:
+                self.deadline.check()
+            with self._requests_lock:
+                self.requests += 1
+            self._local.requests = self._thread_requests() + 1
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            
+            start = time.perf_counter()
+            response = None
+            try:
+                response = fetch()
+                return response
+            except Exception as e:
+                if self.deadline is not None and self.deadline.expired():
+                    raise DeadlineExceeded(str(e)) from e
+                raise
+            finally:
+                record_fetch(source, host, time.perf_counter() - start,
+                             ticker=ticker,
+                             nbytes=len(response.content) if response is not None else 0,
+                             ok=response is not None and response.status_code == 200)
+        
+        def run():
+            nonlocal called
+            called = True
+            if not Config.HOST_GUARD_ENABLED:
+                return timed()
+            try:
+                return get_host_guard(host).call(timed, is_healthy_response,
+                                                 ignore=(DeadlineExceeded,))
+            except CircuitOpenError:
+                record_breaker(host, 'rejected')
+                raise
+        
+        if self.cache is not None:
+            # 200이 아닌 응답(429/5xx 등)은 저장하지 않음 - 같은 URL을 쓰는 다른 작업이 다시 요청
+            response = self.cache.get_or_fetch(key, run,
+                                               cacheable=lambda r: r.status_code == 200)
+            record_cache('fetch', hit=not called)
+            return response
+        return run()
     
     def collect_yahoo_finance_news(self, ticker: str) -> List[Dict]:
         """Yahoo Finance RSS에서 뉴스 수집"""
         try:
             # Yahoo Finance RSS URL
-            rss_url = f"https://finance.yahoo.com/rss/headline?s={ticker}"
+            rss_url = Config.YAHOO_RSS_URL.format(ticker=ticker)
             
-            feed = feedparser.parse(rss_url)
+            import feedparser  # 처음 사용할 때 로드
+            import requests
+            
+            # 내려받기는 requests로 (타임아웃 + 바이트 계측), 파싱만 feedparser
+            response = self._fetch(
+                rss_url,
+                lambda: requests.get(rss_url, headers=REQUEST_HEADERS, timeout=request_timeout(self.deadline)),
+                source='Yahoo Finance', ticker=ticker
+            )
+            if response.status_code != 200:
+                self._count_failure()
+                return []
+            feed = feedparser.parse(response.content)
             
             news_items = []
             
@@ -32,19 +150,22 @@ class NewsCollector:
                     if pub_date:
                         pub_datetime = datetime(*pub_date[:6])
                         
-                        # 최근 N일 이내만
-                        if pub_datetime < self.cutoff_date:
+                        # 수집 기간 이내만
+                        if not self._in_window(pub_datetime):
                             continue
                         
                         pub_date_str = pub_datetime.strftime('%Y-%m-%d')
+                        pub_ts = pub_datetime.isoformat()
                     else:
                         pub_date_str = datetime.now().strftime('%Y-%m-%d')
+                        pub_ts = None
                     
                     news_items.append({
                         'ticker': ticker,
                         'title': entry.get('title', ''),
                         'url': entry.get('link', ''),
                         'published_at': pub_date_str,
+                        'published_ts': pub_ts,  # 발행 시각 (UTC, 없으면 None)
                         'summary': entry.get('summary', ''),
                         'source': 'Yahoo Finance'
                     })
@@ -55,23 +176,37 @@ class NewsCollector:
             
             return news_items
             
+        except CircuitOpenError:
+            self._count_failure()
+            return []  # 호스트 장애 중 - 종목마다 경고하지 않음 (계측에 거절로 기록)
+        except DeadlineExceeded:
+            raise
         except Exception as e:
+            self._count_failure()
             print(f"  ⚠️ {ticker} Yahoo Finance RSS 실패: {e}")
             return []
     
     def collect_marketwatch_news(self, ticker: str) -> List[Dict]:
         """MarketWatch에서 뉴스 검색"""
+        # 검색 결과는 발행일이 없어 오늘 날짜로 기록 → 기간에 오늘이 없으면 생략
+        if not self._in_window(datetime.now()):
+            return []
+        
         try:
-            # MarketWatch 검색 URL
-            search_url = f"https://www.marketwatch.com/search?q={ticker}&ts=0&tab=All%20News"
+            import requests  # 처음 사용할 때 로드
+            from bs4 import BeautifulSoup
             
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
+            # MarketWatch 검색 URL
+            search_url = Config.MARKETWATCH_SEARCH_URL.format(ticker=ticker)
             
-            response = requests.get(search_url, headers=headers, timeout=10)
+            response = self._fetch(
+                search_url,
+                lambda: requests.get(search_url, headers=REQUEST_HEADERS, timeout=request_timeout(self.deadline)),
+                source='MarketWatch', ticker=ticker
+            )
             
             if response.status_code != 200:
+                self._count_failure()
                 return []
             
             soup = BeautifulSoup(response.text, 'html.parser')
@@ -89,7 +224,7 @@ class NewsCollector:
                     url = title_elem.get('href', '')
                     
                     if not url.startswith('http'):
-                        url = f"https://www.marketwatch.com{url}"
+                        url = f"{Config.MARKETWATCH_BASE_URL}{url}"
                     
                     news_items.append({
                         'ticker': ticker,
@@ -105,7 +240,13 @@ class NewsCollector:
             
             return news_items[:3]  # 최대 3개
             
+        except CircuitOpenError:
+            self._count_failure()
+            return []
+        except DeadlineExceeded:
+            raise
         except Exception as e:
+            self._count_failure()
             print(f"  ⚠️ {ticker} MarketWatch 실패: {e}")
             return []
     
@@ -128,17 +269,79 @@ class NewsCollector:
         
         return all_news
     
-    def collect_all_news(self, portfolio: List[Dict]) -> List[Dict]:
-        """포트폴리오 전체 뉴스 수집"""
-        all_news = []
+    def _thread_requests(self) -> int:
+        """현재 스레드가 보낸 실제 요청 수"""
+        return getattr(self._local, 'requests', 0)
+    
+    def _pace(self, requests_before: int, pacer: Optional[RateLimiter] = None):
+        """공유 limiter가 없으면 종목 간 대기 (브레이커로 요청을 건너뛴 종목은 생략)
+        
+        pacer: 동시 수집 시 스레드 공용 간격 - 보낸 요청 수만큼 토큰 사용
+            (없으면 이 스레드에서 고정 대기)
+        """
+        made = self._thread_requests() - requests_before
+        if self.rate_limiter is not None or made == 0:
+            return
+        if pacer is not None:
+            for _ in range(made):
+                pacer.acquire()
+            return
+        delay = Config.NEWS_REQUEST_DELAY_SECONDS
+        if self.deadline is not None:
+            delay = self.deadline.clip(delay)
+        time.sleep(delay)
+    
+    def _paced(self, collect, item, pacer: Optional[RateLimiter] = None):
+        """collect(item) 실행 후 종목 간 대기"""
+        requests_before = self._thread_requests()
+        result = collect(item)
+        self._pace(requests_before, pacer)
+        return result
+    
+    def _collect_within_deadline(self, ticker: str, company: str) -> List[Dict]:
+        """collect_news_for_ticker + 실행 예산 확인 (마감이면 건너뛰고 skipped에 기록)"""
+        if self.deadline is None:
+            return self.collect_news_for_ticker(ticker, company)
+        try:
+            self.deadline.check()
+            return self.collect_news_for_ticker(ticker, company)
+        except DeadlineExceeded:
+            self.deadline.skip(ticker)
+            return []
+    
+    def _map_tickers(self, collect, items: List, workers: Optional[int] = None) -> List:
+        """종목별 collect(item) 실행 (workers > 1이면 스레드로 동시 수집, 결과는 입력 순서)"""
+        workers = workers or Config.NEWS_FETCH_WORKERS
+        if workers <= 1 or len(items) <= 1:
+            return [self._paced(collect, item) for item in items]
+        
+        # 종목 간 대기는 스레드 공용 (스레드마다 대기하면 요청 속도가 workers배가 됨)
+        delay = Config.NEWS_REQUEST_DELAY_SECONDS
+        pacer = RateLimiter(rate_per_sec=1 / delay) if delay > 0 else None
+        
+        # 작업 스레드에서도 실행 계측(contextvar)이 보이도록 종목마다 현재 컨텍스트 복사
+        contexts = [contextvars.copy_context() for _ in items]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='news') as executor:
+            return list(executor.map(lambda ctx, item: ctx.run(self._paced, collect, item, pacer),
+                                     contexts, items))
+    
+    def collect_all_news(self, portfolio: List[Dict], verbose: bool = True,
+                         workers: Optional[int] = None) -> List[Dict]:
+        """포트폴리오 전체 뉴스 수집
         
-        for idx, item in enumerate(portfolio):
+        workers(기본 Config.NEWS_FETCH_WORKERS)개 스레드로 종목을 동시에 수집합니다
+        (호스트별 동시 요청 수는 fetch_utils.HostGuard가 응답 상태에 맞춰 조절).
+        실행 예산이 끝나면 남은 종목은 요청 없이 건너뜁니다 (deadline.skipped).
+        """
+        def collect(indexed):
+            idx, item = indexed
             ticker = item['ticker']
             company = item['company']
             
-            print(f"  [{idx+1}/{len(portfolio)}] {ticker} ({company})...")
+            if verbose:
+                print(f"  [{idx+1}/{len(portfolio)}] {ticker} ({company})...")
             
-            news_items = self.collect_news_for_ticker(ticker, company)
+            news_items = self._collect_within_deadline(ticker, company)
             
             # 메타데이터 추가
             for news in news_items:
@@ -146,11 +349,34 @@ class NewsCollector:
                 news['etf'] = item['etf']
                 news['weight'] = item['weight']
             
+            return news_items
+        
+        all_news = []
+        for news_items in self._map_tickers(collect, list(enumerate(portfolio)), workers):
             all_news.extend(news_items)
-            
-            # Rate limiting
-            time.sleep(0.3)
         
-        print(f"\n✅ 총 {len(all_news)}개 뉴스 수집 완료")
+        if verbose:
+            print(f"\n✅ 총 {len(all_news)}개 뉴스 수집 완료")
         
         return all_news
+    
+    def collect_unique_news(self, universe: Dict[str, Dict], verbose: bool = True) -> Dict[str, List[Dict]]:
+        """고유 티커별로 한 번씩만 뉴스 수집 (여러 ETF에 속한 종목도 1회)
+        
+        universe: SectorETFCollector.build_universe() 결과
+        """
+        def collect(indexed):
+            idx, (ticker, entry) = indexed
+            if verbose:
+                print(f"  [{idx+1}/{len(universe)}] {ticker} ({entry['company']})...")
+            
+            news_items = self._collect_within_deadline(ticker, entry['company'])
+            return ticker, news_items
+        
+        news_by_ticker = dict(self._map_tickers(collect, list(enumerate(universe.items()))))
+        
+        if verbose:
+            total = sum(len(items) for items in news_by_ticker.values())
+            print(f"\n✅ {len(universe)}개 종목, 총 {total}개 뉴스 수집 완료")
+        
+        return news_by_ticker
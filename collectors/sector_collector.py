@@ -1,16 +1,24 @@
 """
 섹터 ETF Holdings 수집기
 """
-import yfinance as yf
-import pandas as pd
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional
 import time
 
+from config.config import Config
+from collectors.fetch_utils import get_host_guard, is_healthy_response
+from src.deadline import Deadline
+from src.instrumentation import record_fetch
+
 class SectorETFCollector:
     """섹터 ETF의 Holdings 정보 수집"""
     
-    def __init__(self):
-        self.sector_etfs = {
+    def __init__(self, sector_etfs: Optional[Dict[str, str]] = None,
+                 deadline: Optional[Deadline] = None):
+        """sector_etfs: {ETF 티커: 섹터명} - 없으면 SPDR 섹터 ETF 11개
+        deadline: 실행 예산 - 마감 후에는 요청 없이 대체 Holdings 사용
+        """
+        self.deadline = deadline
+        self.sector_etfs = sector_etfs or {
             'XLK': 'Technology',
             'XLF': 'Financials',
             'XLV': 'Health Care',
@@ -24,20 +32,31 @@ class SectorETFCollector:
             'XLU': 'Utilities'
         }
     
-    def get_etf_holdings(self, etf_ticker: str, top_n: int = 5) -> List[Dict]:
-        """ETF의 상위 Holdings 가져오기"""
+    def get_etf_holdings(self, etf_ticker: str, top_n: Optional[int] = 5) -> List[Dict]:
+        """ETF의 상위 Holdings 가져오기 (top_n=None이면 전체)"""
+        if self.deadline is not None and self.deadline.expired():
+            return self._get_fallback_holdings(etf_ticker, top_n)
+        
+        if Config.HOLDINGS_URL:
+            return self._get_holdings_from_url(etf_ticker, top_n)
+        
+        start = time.perf_counter()
         try:
+            import yfinance as yf  # 무거운 모듈이라 처음 사용할 때 로드
+            
             etf = yf.Ticker(etf_ticker)
             
             # Holdings 정보
             holdings = etf.get_holdings()
+            record_fetch('yfinance', 'yfinance', time.perf_counter() - start,
+                         ticker=etf_ticker, ok=holdings is not None and not holdings.empty)
             
             if holdings is None or holdings.empty:
                 # 대체: 주요 종목 하드코딩
                 return self._get_fallback_holdings(etf_ticker, top_n)
             
             # 상위 N개 종목
-            top_holdings = holdings.head(top_n)
+            top_holdings = holdings if top_n is None else holdings.head(top_n)
             
             result = []
             for _, row in top_holdings.iterrows():
@@ -49,11 +68,47 @@ class SectorETFCollector:
             
             return result
             
+        except Exception as e:
+            print(f"⚠️ {etf_ticker} Holdings 수집 실패: {e}")
+            record_fetch('yfinance', 'yfinance', time.perf_counter() - start,
+                         ticker=etf_ticker, ok=False)
+            return self._get_fallback_holdings(etf_ticker, top_n)
+    
+    def _get_holdings_from_url(self, etf_ticker: str, top_n: Optional[int] = 5) -> List[Dict]:
+        """Config.HOLDINGS_URL에서 Holdings JSON 가져오기
+        
+        응답 형식: [{'ticker', 'name', 'weight'}, ...] (비중 내림차순)
+        """
+        from urllib.parse import urlsplit
+        import requests
+        
+        url = Config.HOLDINGS_URL.format(etf=etf_ticker)
+        host = urlsplit(url).hostname or ''
+        timeout = (Config.FETCH_CONNECT_TIMEOUT_SECONDS, Config.FETCH_READ_TIMEOUT_SECONDS)
+        if self.deadline is not None:
+            timeout = tuple(self.deadline.clip(t) for t in timeout)
+        start = time.perf_counter()
+        response = None
+        try:
+            fetch = lambda: requests.get(url, timeout=timeout)
+            if Config.HOST_GUARD_ENABLED:
+                # 브레이커가 열려 있으면 CircuitOpenError → 대체 데이터
+                response = get_host_guard(host).call(fetch, is_healthy_response)
+            else:
+                response = fetch()
+            response.raise_for_status()
+            holdings = response.json()
+            return holdings if top_n is None else holdings[:top_n]
         except Exception as e:
             print(f"⚠️ {etf_ticker} Holdings 수집 실패: {e}")
             return self._get_fallback_holdings(etf_ticker, top_n)
+        finally:
+            record_fetch('holdings', host, time.perf_counter() - start,
+                         ticker=etf_ticker,
+                         nbytes=len(response.content) if response is not None else 0,
+                         ok=response is not None and response.status_code == 200)
     
-    def _get_fallback_holdings(self, etf_ticker: str, top_n: int = 5) -> List[Dict]:
+    def _get_fallback_holdings(self, etf_ticker: str, top_n: Optional[int] = 5) -> List[Dict]:
         """대체 Holdings 정보 (하드코딩)"""
         fallback_data = {
             'XLK': [
@@ -137,8 +192,8 @@ class SectorETFCollector:
         
         return fallback_data.get(etf_ticker, [])[:top_n]
     
-    def collect_all_sector_holdings(self, top_n: int = 5) -> Dict:
-        """모든 섹터 ETF의 Holdings 수집"""
+    def collect_all_sector_holdings(self, top_n: Optional[int] = 5) -> Dict:
+        """모든 섹터 ETF의 Holdings 수집 (top_n=None이면 전체 Holdings)"""
         all_holdings = {}
         
         for etf, sector in self.sector_etfs.items():
@@ -150,7 +205,8 @@ class SectorETFCollector:
                 'holdings': holdings
             }
             
-            time.sleep(0.5)  # Rate limiting
+            if self.deadline is None or not self.deadline.expired():
+                time.sleep(Config.HOLDINGS_REQUEST_DELAY_SECONDS)  # Rate limiting
         
         return all_holdings
     
@@ -169,3 +225,65 @@ class SectorETFCollector:
                 })
         
         return portfolio
+    
+    def iter_portfolio_chunks(self, holdings_data: Dict, chunk_size: int) -> Iterator[List[Dict]]:
+        """포트폴리오를 chunk_size 종목씩 나눠서 생성 (전체 리스트를 만들지 않음)"""
+        chunk = []
+        
+        for sector, data in holdings_data.items():
+            for holding in data['holdings']:
+                chunk.append({
+                    'sector': sector,
+                    'etf': data['etf'],
+                    'ticker': holding['ticker'],
+                    'company': holding['name'],
+                    'weight': holding['weight']
+                })
+                
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        
+        if chunk:
+            yield chunk
+    
+    def build_universe(self, holdings_data: Dict) -> Dict[str, Dict]:
+        """Holdings를 고유 티커 기준으로 정리
+        
+        Returns:
+            {ticker: {'company': 회사명,
+                      'memberships': [{'sector', 'etf', 'weight'}, ...]}}
+        """
+        universe = {}
+        
+        for sector, data in holdings_data.items():
+            for holding in data['holdings']:
+                ticker = holding['ticker']
+                if not ticker:
+                    continue
+                
+                entry = universe.setdefault(ticker, {
+                    'company': holding['name'],
+                    'memberships': []
+                })
+                entry['memberships'].append({
+                    'sector': sector,
+                    'etf': data['etf'],
+                    'weight': holding['weight']
+                })
+        
+        return universe
+    
+    def join_news_to_memberships(self, news_by_ticker: Dict[str, List[Dict]],
+                                 universe: Dict[str, Dict]) -> List[Dict]:
+        """티커별 (분석된) 뉴스를 모든 (ETF, 비중) 소속에 복사해서 연결"""
+        joined = []
+        
+        for ticker, news_items in news_by_ticker.items():
+            memberships = universe.get(ticker, {}).get('memberships', [])
+            
+            for membership in memberships:
+                for news in news_items:
+                    joined.append({**news, **membership})
+        
+        return joined
@@ -11,6 +11,9 @@ class Config:
     # 데이터 디렉토리
     DATA_DIR = BASE_DIR / "data"
     REPORT_DIR = DATA_DIR / "reports"
+    HISTORY_DB_PATH = DATA_DIR / "history.db"
+    ARCHIVE_DIR = DATA_DIR / "archive"  # 날짜별 Parquet 파티션 + manifest
+    METRICS_DIR = DATA_DIR / "metrics"  # 실행 계측 JSON lines / 프로파일
     
     # API 키 (환경 변수에서 로드)
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
@@ -30,6 +33,12 @@ class Config:
         'XLU': 'Utilities'
     }
     
+    # 수집 엔드포인트 ({ticker}/{etf} 자리에 티커 대입 - 벤치마크는 로컬 서버로 교체)
+    YAHOO_RSS_URL = "https://finance.yahoo.com/rss/headline?s={ticker}"
+    MARKETWATCH_SEARCH_URL = "https://www.marketwatch.com/search?q={ticker}&ts=0&tab=All%20News"
+    MARKETWATCH_BASE_URL = "https://www.marketwatch.com"  # 상대 링크 보정용
+    HOLDINGS_URL = os.getenv("HOLDINGS_URL", "")  # 비어 있으면 yfinance, 예: http://host/holdings/{etf}
+    
     # RSS 피드
     RSS_FEEDS = {
         'yahoo_finance': 'https://finance.yahoo.com/rss/',
@@ -41,9 +50,56 @@ class Config:
     SENTIMENT_THRESHOLD_POSITIVE = 0.2
     SENTIMENT_THRESHOLD_NEGATIVE = -0.2
     
+    # 유사 중복 뉴스 (MinHash LSH)
+    DEDUP_ENABLED = True
+    DEDUP_THRESHOLD = 0.5  # 추정 Jaccard 유사도
+    
     # 뉴스 수집 설정
     NEWS_DAYS = 3  # 최근 3일
     MAX_NEWS_PER_TICKER = 10
+    NEWS_REQUEST_DELAY_SECONDS = 0.3  # 공유 limiter가 없을 때 종목 간 대기 (동시 수집이면 스레드 합산 간격)
+    HOLDINGS_REQUEST_DELAY_SECONDS = 0.5  # ETF 간 고정 대기
+    NEWS_FETCH_WORKERS = 4  # 종목 동시 수집 스레드 수 (1이면 순차)
+    FETCH_CONNECT_TIMEOUT_SECONDS = 3  # 연결 타임아웃
+    FETCH_READ_TIMEOUT_SECONDS = 10  # 응답 타임아웃
+    PIPELINE_CHUNK_SIZE = 50  # 청크 모드 티커 묶음 크기
+    STREAMING_REPORT_MIN_ROWS = 5000  # 이 이상이면 write-only 스트리밍 리포트
+    REFRESH_INTERVAL_MINUTES = 15  # 대시보드 뉴스/점수 캐시 유지 시간
+    HOLDINGS_CACHE_TTL_HOURS = 24  # 대시보드 Holdings 캐시 유지 시간
+    DASHBOARD_SHARED_REFRESH = True  # 프로세스 공용 백그라운드 새로 고침 (False면 세션별 실행)
+    SNAPSHOT_WAIT_SECONDS = 120  # 첫 스냅샷 대기 시간
+    PIPELINE_MIN_INTERVAL_SECONDS = 60  # 같은 파이프라인 재실행 최소 간격 (0이면 제한 없음)
+    DASHBOARD_BUDGET_SECONDS = 45  # 대시보드 수집/분석 시간 예산 (넘으면 부분 결과 + 섹터별 수집률)
+    BUDGET_FETCH_SHARE = 0.8  # 시간 예산 중 Holdings/뉴스 수집 몫 (나머지는 감성 분석)
+    METRICS_ENABLED = True  # CLI 파이프라인 실행 계측 (METRICS_DIR에 JSON lines 기록)
+    
+    # 호스트별 상태 (AIMD 동시 요청 한도 + 서킷 브레이커)
+    HOST_GUARD_ENABLED = True
+    HOST_INITIAL_CONCURRENCY = 2  # 호스트별 첫 동시 요청 한도
+    HOST_MAX_CONCURRENCY = 8
+    BREAKER_FAILURE_THRESHOLD = 5  # 연속 실패 이 횟수면 브레이커 열림
+    BREAKER_COOLDOWN_SECONDS = 30  # 열린 뒤 시험 요청까지 대기
+    
+    # 수집 데몬 (종목별 적응형 조회 간격)
+    DAEMON_STATE_PATH = DATA_DIR / "daemon_state.json"
+    DAEMON_INITIAL_POLL_MINUTES = 30  # 상태가 없는 종목의 첫 간격
+    DAEMON_MIN_POLL_MINUTES = 5
+    DAEMON_MAX_POLL_MINUTES = 240
+    DAEMON_TARGET_NEW_PER_POLL = 0.2  # 조회 1회당 기대 새 기사 수 (간격 = 목표 / 속도)
+    DAEMON_VELOCITY_HALF_LIFE_HOURS = 6  # 뉴스 속도 가중 평균 반감기
+    DAEMON_REQUESTS_PER_SEC = 2.0  # 데몬 전체 요청 속도 제한
+    DAEMON_RETRY_MINUTES = 5  # 조회 실패 후 첫 재시도 간격 (연속 실패마다 2배, 최대 DAEMON_MAX_POLL_MINUTES)
+    DAEMON_REPORT_MINUTES = 60  # 상태 요약 출력 주기
+    
+    # 트렌드 설정
+    TREND_WINDOWS = (1, 7, 30)  # 롤링 윈도우 (일)
+    TREND_SIGNAL_WINDOW = 7  # 트렌드 아이콘 판단 기준 윈도우
+    TREND_HALF_LIFE_DAYS = 7  # 시간 감쇠 반감기
+    TREND_LOOKBACK_DAYS = 365  # 히스토리 조회 기간
+    
+    # 백필 설정
+    BACKFILL_WORKERS = 8
+    BACKFILL_REQUESTS_PER_SEC = 5.0  # 모든 작업 합산
     
     @classmethod
     def ensure_directories(cls):
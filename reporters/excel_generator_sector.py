@@ -2,38 +2,69 @@
 섹터 ETF 엑셀 리포트 생성기
 """
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.formatting.rule import FormulaRule
 from openpyxl.utils import get_column_letter
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 import pandas as pd
 import numpy as np
 
+from config.config import Config
+from analyzers.trend_engine import SentimentTrendEngine
+
 class SectorETFExcelGenerator:
     """섹터 ETF 엑셀 리포트 생성"""
     
-    def __init__(self, output_dir: Path):
+    NEWS_HEADERS = [
+        'ETF', 'Sector', 'Ticker', 'Company', 'Weight (%)',
+        'Category', 'Title', 'URL', 'Pub Date', 'Highlights', 'Sentiment'
+    ]
+    NEWS_COLUMN_WIDTHS = [10, 25, 12, 25, 10, 12, 60, 15, 12, 50, 10]
+    
+    _CENTER = Alignment(horizontal='center')
+    
+    SENTIMENT_COLUMN = 'K'
+    
+    # 조건부 서식 색상 (채우기, 글자)
+    SENTIMENT_COLORS = {
+        'positive': ('C6EFCE', '006100'),  # 초록
+        'negative': ('FFC7CE', '9C0006'),  # 빨강
+        'neutral': ('FFEB9C', '9C6500'),   # 노랑
+    }
+    
+    def __init__(self, output_dir: Path, conditional_colors: bool = True):
+        """
+        conditional_colors: Sentiment 색상을 조건부 서식 규칙 3개로 표현
+            (False면 셀마다 채우기/글자 스타일 지정 - 벤치마크 비교용)
+        """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.conditional_colors = conditional_colors
     
     def generate_sector_report(self, analyzed_news: List[Dict], 
-                               sector_holdings: Dict, date_str: str) -> str:
-        """섹터 리포트 생성"""
+                               sector_holdings: Dict, date_str: str,
+                               trend: Optional[Dict] = None) -> str:
+        """섹터 리포트 생성
+        
+        trend: SentimentTrendEngine.compute() 결과 (없으면 analyzed_news로 계산)
+        """
         
         print("\n엑셀 생성 시작...")
         print(f"  분석된 뉴스: {len(analyzed_news)}개")
         
         wb = Workbook()
         wb.remove(wb.active)  # 기본 시트 제거
+        wb.add_named_style(self._link_style())
         
         # 시트 1: Daily News Monitor
         ws_news = wb.create_sheet("Daily News Monitor", 0)
         self._create_news_sheet(ws_news, analyzed_news, sector_holdings)
         
-        # 시트 2: Sentiment Trend (선택사항)
+        # 시트 2: Sentiment Trend
         ws_trend = wb.create_sheet("Sentiment Trend", 1)
-        self._create_trend_sheet(ws_trend, analyzed_news)
+        self._create_trend_sheet(ws_trend, analyzed_news, trend)
         
         # 파일 저장
         filename = f"Market_Monitor_{date_str}.xlsx"
@@ -50,10 +81,7 @@ class SectorETFExcelGenerator:
         """Daily News Monitor 시트 생성"""
         
         # 헤더
-        headers = [
-            'ETF', 'Sector', 'Ticker', 'Company', 'Weight (%)',
-            'Category', 'Title', 'URL', 'Pub Date', 'Highlights', 'Sentiment'
-        ]
+        headers = self.NEWS_HEADERS
         
         ws.append(headers)
         
@@ -132,72 +160,69 @@ class SectorETFExcelGenerator:
             
             # 뉴스 데이터
             for news in news_list:
-                row_data = [
-                    etf,
-                    sector,
-                    news.get('ticker', ''),
-                    news.get('company_name', ''),
-                    news.get('weight', 0.0),
-                    news.get('category', 'General'),
-                    news.get('title', ''),
-                    news.get('url', ''),
-                    news.get('published_at', '')[:10],
-                    news.get('summary', '')[:100] + '...' if news.get('summary') else '',
-                    news.get('sentiment_score', 0.0)
-                ]
-                
-                ws.append(row_data)
+                ws.append(self._news_row(etf, sector, news))
                 
-                # Sentiment 색상
+                # Sentiment 서식 (색상은 조건부 서식으로 일괄 적용)
                 sentiment_cell = ws.cell(row_num, 11)
-                self._apply_sentiment_color(sentiment_cell, news.get('sentiment_score', 0.0))
+                if self.conditional_colors:
+                    sentiment_cell.number_format = '0.0000'
+                    sentiment_cell.alignment = self._CENTER
+                else:
+                    self._apply_sentiment_color(sentiment_cell, news.get('sentiment_score', 0.0))
                 
                 # URL 하이퍼링크
                 url_cell = ws.cell(row_num, 8)
                 if news.get('url'):
                     url_cell.hyperlink = news['url']
-                    url_cell.font = Font(color='0563C1', underline='single')
+                    url_cell.style = 'mm_link'
                 
                 row_num += 1
         
         # 열 너비 조정
-        column_widths = [10, 25, 12, 25, 10, 12, 60, 15, 12, 50, 10]
-        for i, width in enumerate(column_widths, 1):
+        for i, width in enumerate(self.NEWS_COLUMN_WIDTHS, 1):
             ws.column_dimensions[get_column_letter(i)].width = width
         
         # 필터 추가
         ws.auto_filter.ref = f"A1:{get_column_letter(len(headers))}1"
         
+        if self.conditional_colors:
+            self._add_sentiment_rules(ws, row_num - 1)
+        
         print(f"✅ 메인 시트 완료: {row_num-1}행")
     
-    def _create_trend_sheet(self, ws, analyzed_news: List[Dict]):
-        """Sentiment Trend 시트 생성"""
+    @staticmethod
+    def _link_style() -> NamedStyle:
+        """URL 셀 공용 Named Style (워크북마다 새로 만들어 등록)"""
+        return NamedStyle(name='mm_link', font=Font(color='0563C1', underline='single'))
+    
+    @staticmethod
+    def _news_row(etf: str, sector: str, news: Dict) -> List:
+        """Daily News Monitor 뉴스 한 행"""
+        return [
+            etf,
+            sector,
+            news.get('ticker', ''),
+            news.get('company_name', ''),
+            news.get('weight', 0.0),
+            news.get('category', 'General'),
+            news.get('title', ''),
+            news.get('url', ''),
+            (news.get('published_at') or '')[:10],
+            news.get('summary', '')[:100] + '...' if news.get('summary') else '',
+            news.get('sentiment_score', 0.0)
+        ]
+    
+    def _create_trend_sheet(self, ws, analyzed_news: List[Dict], trend: Optional[Dict] = None):
+        """Sentiment Trend 시트 생성 (롤링 평균 / 시간 감쇠 / 기간별 변화)"""
         
-        # 티커별로 그룹화
-        ticker_sentiments = {}
+        if trend is None:
+            engine = SentimentTrendEngine.from_config()
+            trend = engine.compute(engine.frame_from_news(analyzed_news))
         
-        for news in analyzed_news:
-            ticker = news.get('ticker', '')
-            if not ticker:
-                continue
-            
-            if ticker not in ticker_sentiments:
-                ticker_sentiments[ticker] = {
-                    'company': news.get('company_name', ''),
-                    'sector': news.get('sector', ''),
-                    'dates': {}
-                }
-            
-            date = news.get('published_at', '')[:10]
-            sentiment = news.get('sentiment_score', 0.0)
-            
-            if date not in ticker_sentiments[ticker]['dates']:
-                ticker_sentiments[ticker]['dates'][date] = []
-            
-            ticker_sentiments[ticker]['dates'][date].append(sentiment)
+        windows = trend['windows'] if trend else tuple(Config.TREND_WINDOWS)
         
         # 헤더
-        headers = ['Ticker', 'Company', 'Sector', 'Date -2', 'Date -1', 'Today', 'Trend', 'Change']
+        headers = self._trend_headers(windows)
         ws.append(headers)
         
         # 헤더 스타일
@@ -210,62 +235,90 @@ class SectorETFExcelGenerator:
             cell.font = header_font
             cell.alignment = Alignment(horizontal='center')
         
-        # 데이터
         row_num = 2
-        dates = sorted(set(date for data in ticker_sentiments.values() 
-                          for date in data['dates'].keys()), reverse=True)[:3]
         
-        for ticker, data in sorted(ticker_sentiments.items()):
-            if len(dates) < 2:
-                continue
-            
-            # 각 날짜별 평균
-            date_avgs = []
-            for date in reversed(dates):  # 오래된 날짜부터
-                if date in data['dates']:
-                    avg = np.mean(data['dates'][date])
-                    date_avgs.append(avg)
-                else:
-                    date_avgs.append(None)
-            
-            # 최소 2개 날짜 필요
-            if len([x for x in date_avgs if x is not None]) < 2:
-                continue
-            
-            # 트렌드 계산
-            valid_values = [x for x in date_avgs if x is not None]
-            if len(valid_values) >= 2:
-                change = valid_values[-1] - valid_values[0]
-                trend = "📈" if change > 0.1 else "📉" if change < -0.1 else "➡️"
-            else:
-                change = 0.0
-                trend = "➡️"
-            
-            # 행 데이터
-            row_data = [
-                ticker,
-                data['company'],
-                data['sector']
-            ]
-            
-            # 날짜별 값 (최대 3개)
-            for i in range(3):
-                if i < len(date_avgs):
-                    row_data.append(date_avgs[i] if date_avgs[i] is not None else '')
-                else:
-                    row_data.append('')
-            
-            row_data.extend([trend, change])
+        if trend:
+            # 섹터 요약 행
+            for sector, data in self._trend_records(trend['sectors']):
+                ws.append(self._trend_row('', '', sector, data, windows))
+                for col in range(1, len(headers) + 1):
+                    cell = ws.cell(row_num, col)
+                    cell.font = Font(bold=True)
+                    cell.fill = PatternFill(start_color='E7E6E6', end_color='E7E6E6', fill_type='solid')
+                row_num += 1
             
-            ws.append(row_data)
-            row_num += 1
+            # 티커 행
+            for ticker, data in self._trend_records(trend['tickers'].sort_index()):
+                ws.append(self._trend_row(ticker, data['company_name'], data['sector'], data, windows))
+                row_num += 1
+        
+        # 숫자 서식
+        for row in ws.iter_rows(min_row=2, max_row=row_num - 1, min_col=4, max_col=len(headers) - 1):
+            for cell in row:
+                cell.number_format = '0.0000'
         
         # 열 너비
-        column_widths = [12, 25, 20, 12, 12, 12, 8, 12]
+        column_widths = [12, 25, 20] + [12] * (len(windows) * 2 + 1) + [8]
         for i, width in enumerate(column_widths, 1):
             ws.column_dimensions[get_column_letter(i)].width = width
         
-        print(f"✅ 트렌드 시트 완료: {row_num-1}행")
+        as_of = trend['as_of'] if trend else '-'
+        print(f"✅ 트렌드 시트 완료: {row_num-1}행 (기준일 {as_of})")
+    
+    @staticmethod
+    def _trend_records(summary: pd.DataFrame):
+        """(인덱스, 행 dict) 순회 - iterrows보다 빠름"""
+        return zip(summary.index, summary.to_dict('records'))
+    
+    @staticmethod
+    def _trend_headers(windows) -> List[str]:
+        """트렌드 시트 헤더"""
+        return (['Ticker', 'Company', 'Sector']
+                + [f'{w}D Avg' for w in windows]
+                + ['Decayed']
+                + [f'{w}D Change' for w in windows]
+                + ['Trend'])
+    
+    @staticmethod
+    def _trend_row(ticker: str, company: str, sector: str, data, windows) -> List:
+        """트렌드 시트 한 행 구성 (NaN은 빈칸)"""
+        def value(key):
+            v = data.get(key)
+            return '' if v is None or pd.isna(v) else float(v)
+        
+        return ([ticker, company or '', sector or '']
+                + [value(f'mean_{w}d') for w in windows]
+                + [value('decayed')]
+                + [value(f'change_{w}d') for w in windows]
+                + [data.get('trend', '➡️')])
+    
+    def _add_sentiment_rules(self, ws, last_row: int):
+        """Sentiment 열에 색상 조건부 서식 3개 (긍정/부정/중립) 적용
+        
+        섹터 점수 행처럼 빈 셀은 ISNUMBER로 제외
+        """
+        if last_row < 2:
+            return
+        
+        col = self.SENTIMENT_COLUMN
+        cell_range = f"{col}2:{col}{last_row}"
+        first = f"{col}2"
+        positive = Config.SENTIMENT_THRESHOLD_POSITIVE
+        negative = Config.SENTIMENT_THRESHOLD_NEGATIVE
+        
+        formulas = {
+            'positive': f"AND(ISNUMBER({first}),{first}>{positive})",
+            'negative': f"AND(ISNUMBER({first}),{first}<{negative})",
+            'neutral': f"AND(ISNUMBER({first}),{first}>={negative},{first}<={positive})",
+        }
+        
+        for band, formula in formulas.items():
+            fill_color, font_color = self.SENTIMENT_COLORS[band]
+            ws.conditional_formatting.add(cell_range, FormulaRule(
+                formula=[formula],
+                fill=PatternFill(start_color=fill_color, end_color=fill_color, fill_type='solid'),
+                font=Font(color=font_color)
+            ))
     
     def _apply_sentiment_color(self, cell, sentiment: float):
         """Sentiment에 따른 색상 적용"""
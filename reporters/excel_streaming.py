@@ -0,0 +1,231 @@
+"""
+스트리밍 엑셀 리포트 생성기 - openpyxl write-only 모드 + 공유 Named Style
+"""
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+from openpyxl.utils import get_column_letter
+from typing import Dict, Iterable, List, Optional
+
+from config.config import Config
+from analyzers.aggregation import SectorScoreAccumulator
+from analyzers.trend_engine import SentimentTrendEngine
+from reporters.excel_generator_sector import SectorETFExcelGenerator
+
+class StreamingSectorExcelGenerator(SectorETFExcelGenerator):
+    """행을 만들자마자 디스크로 내보내는 리포트 생성기
+
+    - write-only 워크북: 셀 객체를 메모리에 쌓지 않음
+    - 스타일은 워크북당 한 번 등록한 Named Style을 이름으로 참조
+    - Sentiment 색상은 조건부 서식 규칙 3개 (conditional_colors=False면 셀별 Named Style)
+    - URL은 링크 스타일을 준 셀 값으로 기록 (셀별 하이퍼링크는 저장 시간이 행 수의 제곱으로 늘어남)
+    """
+
+    def _register_styles(self, wb: Workbook):
+        """워크북 공용 Named Style 등록"""
+        styles = [
+            NamedStyle(
+                name='mm_header',
+                font=Font(bold=True, color='FFFFFF'),
+                fill=PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid'),
+                alignment=Alignment(horizontal='center', vertical='center')
+            ),
+            NamedStyle(
+                name='mm_group',
+                font=Font(bold=True),
+                fill=PatternFill(start_color='E7E6E6', end_color='E7E6E6', fill_type='solid')
+            ),
+            NamedStyle(
+                name='mm_positive',
+                font=Font(color='006100'),
+                fill=PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid'),
+                alignment=Alignment(horizontal='center'),
+                number_format='0.0000'
+            ),
+            NamedStyle(
+                name='mm_negative',
+                font=Font(color='9C0006'),
+                fill=PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid'),
+                alignment=Alignment(horizontal='center'),
+                number_format='0.0000'
+            ),
+            NamedStyle(
+                name='mm_neutral',
+                font=Font(color='9C6500'),
+                fill=PatternFill(start_color='FFEB9C', end_color='FFEB9C', fill_type='solid'),
+                alignment=Alignment(horizontal='center'),
+                number_format='0.0000'
+            ),
+            NamedStyle(
+                name='mm_sentiment',
+                alignment=Alignment(horizontal='center'),
+                number_format='0.0000'
+            ),
+            self._link_style(),
+            NamedStyle(name='mm_number', number_format='0.0000'),
+            NamedStyle(
+                name='mm_group_number',
+                font=Font(bold=True),
+                fill=PatternFill(start_color='E7E6E6', end_color='E7E6E6', fill_type='solid'),
+                number_format='0.0000'
+            ),
+        ]
+
+        for style in styles:
+            wb.add_named_style(style)
+
+    @staticmethod
+    def _cell(ws, value, style: Optional[str] = None) -> WriteOnlyCell:
+        cell = WriteOnlyCell(ws, value=value)
+        if style:
+            cell.style = style
+        return cell
+
+    def _sentiment_style(self, sentiment: float) -> str:
+        if self.conditional_colors:
+            # 색상은 시트 끝에서 조건부 서식으로 일괄 적용
+            return 'mm_sentiment'
+        if sentiment > Config.SENTIMENT_THRESHOLD_POSITIVE:
+            return 'mm_positive'
+        if sentiment < Config.SENTIMENT_THRESHOLD_NEGATIVE:
+            return 'mm_negative'
+        return 'mm_neutral'
+
+    def generate_sector_report(self, analyzed_news: Iterable[Dict],
+                               sector_holdings: Dict, date_str: str,
+                               trend: Optional[Dict] = None,
+                               sector_scores: Optional[Dict] = None) -> str:
+        """섹터 리포트 생성 (스트리밍)
+
+        analyzed_news: 섹터 순으로 정렬된 이터러블 (예: 저장소 커서)
+        sector_scores: {섹터: {'simple', 'weighted', ...}}
+            - 함께 주면 뉴스를 한 번만 순회하며 바로 기록 (메모리 일정)
+            - 없으면 뉴스를 리스트로 모아 정렬/집계한 뒤 기록
+        trend: SentimentTrendEngine.compute() 결과 (없으면 기록한 뉴스로 계산 - 기본 생성기와 같음)
+        """
+        print("\n엑셀 생성 시작 (스트리밍)...")
+
+        if sector_scores is None:
+            analyzed_news = sorted(analyzed_news, key=lambda n: n.get('sector', 'Unknown'))
+            accumulator = SectorScoreAccumulator()
+            accumulator.add(analyzed_news)
+            sector_scores = accumulator.scores()
+
+        wb = Workbook(write_only=True)
+        self._register_styles(wb)
+
+        # 트렌드가 없으면 뉴스를 기록하면서 트렌드 계산에 필요한 열만 모음
+        trend_news = [] if trend is None else None
+
+        ws_news = wb.create_sheet("Daily News Monitor")
+        rows = self._stream_news_sheet(ws_news, analyzed_news, sector_holdings, sector_scores,
+                                       trend_news)
+
+        if trend_news is not None:
+            engine = SentimentTrendEngine.from_config()
+            trend = engine.compute(engine.frame_from_news(trend_news))
+
+        ws_trend = wb.create_sheet("Sentiment Trend")
+        self._stream_trend_sheet(ws_trend, trend)
+
+        filepath = self.output_dir / f"Market_Monitor_{date_str}.xlsx"
+        wb.save(filepath)
+
+        print(f"✅ 엑셀 저장: {filepath} ({rows}행)")
+
+        return str(filepath)
+
+    def _stream_news_sheet(self, ws, analyzed_news: Iterable[Dict],
+                           sector_holdings: Dict, sector_scores: Dict,
+                           trend_news: Optional[List[Dict]] = None) -> int:
+        """Daily News Monitor 시트 (행 단위 기록)
+
+        trend_news: 주면 뉴스마다 트렌드 계산용 열(티커/회사/섹터/날짜/점수)만 추가
+        """
+        # write-only 시트는 열 너비/필터를 행 기록 전에 지정
+        for i, width in enumerate(self.NEWS_COLUMN_WIDTHS, 1):
+            ws.column_dimensions[get_column_letter(i)].width = width
+        ws.auto_filter.ref = f"A1:{get_column_letter(len(self.NEWS_HEADERS))}1"
+
+        ws.append([self._cell(ws, h, 'mm_header') for h in self.NEWS_HEADERS])
+
+        rows = 1
+        current_sector = None
+
+        for news in analyzed_news:
+            sector = news.get('sector', 'Unknown')
+            etf = news.get('etf') or sector_holdings.get(sector, {}).get('etf', '')
+
+            # 섹터가 바뀌면 섹터 점수 행
+            if sector != current_sector:
+                current_sector = sector
+                scores = sector_scores.get(sector)
+                if scores:
+                    ws.append([
+                        self._cell(ws, etf, 'mm_group'),
+                        self._cell(ws, sector, 'mm_group'),
+                        self._cell(ws, f"Simple: {scores['simple']:.4f}", 'mm_group'),
+                        self._cell(ws, f"Weighted: {scores['weighted']:.4f}", 'mm_group'),
+                    ])
+                    rows += 1
+
+            values = self._news_row(etf, sector, news)
+            url = values[7]
+            sentiment = values[10] or 0.0
+
+            if url:
+                values[7] = self._cell(ws, url, 'mm_link')
+            values[10] = self._cell(ws, sentiment, self._sentiment_style(sentiment))
+
+            ws.append(values)
+            rows += 1
+
+            if trend_news is not None:
+                trend_news.append({
+                    'ticker': news.get('ticker', ''),
+                    'company_name': news.get('company_name', ''),
+                    'sector': sector,
+                    'published_at': news.get('published_at') or '',
+                    'sentiment_score': sentiment
+                })
+
+        # write-only 시트도 조건부 서식은 저장 시점에 기록되므로 마지막 행을 알고 나서 추가
+        if self.conditional_colors:
+            self._add_sentiment_rules(ws, rows)
+
+        print(f"✅ 메인 시트 완료: {rows}행")
+        return rows
+
+    def _stream_trend_sheet(self, ws, trend: Optional[Dict]):
+        """Sentiment Trend 시트 (행 단위 기록)"""
+        windows = trend['windows'] if trend else tuple(Config.TREND_WINDOWS)
+        headers = self._trend_headers(windows)
+
+        column_widths = [12, 25, 20] + [12] * (len(windows) * 2 + 1) + [8]
+        for i, width in enumerate(column_widths, 1):
+            ws.column_dimensions[get_column_letter(i)].width = width
+
+        ws.append([self._cell(ws, h, 'mm_header') for h in headers])
+
+        if not trend:
+            print("✅ 트렌드 시트 완료: 1행 (기준일 -)")
+            return
+
+        rows = 1
+        number_cols = range(3, len(headers) - 1)
+
+        def styled(values: List, text_style: Optional[str], number_style: str) -> List:
+            return [self._cell(ws, v, number_style if i in number_cols else text_style)
+                    for i, v in enumerate(values)]
+
+        for sector, data in self._trend_records(trend['sectors']):
+            values = self._trend_row('', '', sector, data, windows)
+            ws.append(styled(values, 'mm_group', 'mm_group_number'))
+            rows += 1
+
+        for ticker, data in self._trend_records(trend['tickers'].sort_index()):
+            values = self._trend_row(ticker, data['company_name'], data['sector'], data, windows)
+            ws.append(styled(values, None, 'mm_number'))
+            rows += 1
+
+        print(f"✅ 트렌드 시트 완료: {rows}행 (기준일 {trend['as_of']})")
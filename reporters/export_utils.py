@@ -0,0 +1,125 @@
+"""
+대시보드 / 파이프라인 내보내기 (CSV / Excel / Parquet / Arrow IPC)
+"""
+import hashlib
+import io
+from pathlib import Path
+from typing import Dict, List
+
+import pandas as pd
+
+def dataset_version(df: pd.DataFrame) -> str:
+    """DataFrame 내용 기반 버전 ID (같은 데이터면 같은 값)"""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    digest = hashlib.sha1(row_hashes.tobytes())
+    digest.update(','.join(map(str, df.columns)).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    """CSV (Excel 한글 호환 utf-8-sig)"""
+    return df.to_csv(index=False).encode('utf-8-sig')
+
+def to_xlsx_bytes(df: pd.DataFrame, scores: Dict) -> bytes:
+    """News / Scores 시트 엑셀"""
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df.to_excel(writer, sheet_name='News', index=False)
+        pd.DataFrame([
+            {'Sector': s, 'ETF': i['etf'], 'Simple': i['simple'], 'Weighted': i['weighted']}
+            for s, i in scores.items()
+        ]).to_excel(writer, sheet_name='Scores', index=False)
+    return output.getvalue()
+
+# 대시보드/내보내기 공용 컬럼 (뉴스가 없어도 같은 컬럼의 빈 DataFrame)
+FRAME_COLUMNS = ['ETF', 'Sector', 'Ticker', 'Company', 'Weight (%)', 'Category',
+                 'Title', 'URL', 'Pub Date', 'Highlights', 'Sentiment']
+
+def news_to_frame(analyzed_news: List[Dict], sector_holdings: Dict) -> pd.DataFrame:
+    """분석 뉴스 → 대시보드와 같은 컬럼의 DataFrame"""
+    rows = []
+    for news in analyzed_news:
+        sector = news.get('sector', 'Unknown')
+        summary = news.get('summary', '')
+        rows.append({
+            'ETF': news.get('etf') or sector_holdings.get(sector, {}).get('etf', ''),
+            'Sector': sector,
+            'Ticker': news.get('ticker', ''),
+            'Company': news.get('company_name', ''),
+            'Weight (%)': news.get('weight', 0.0),
+            'Category': news.get('category', 'General'),
+            'Title': news.get('title', ''),
+            'URL': news.get('url', ''),
+            'Pub Date': news.get('published_at', '')[:10],
+            'Highlights': summary[:100] + '...' if summary else '',
+            'Sentiment': news.get('sentiment_score', 0.0)
+        })
+    return pd.DataFrame(rows, columns=FRAME_COLUMNS)
+
+# 타입이 정해진 컬럼 (Arrow 스키마)
+DICTIONARY_COLUMNS = ['ETF', 'Sector', 'Ticker', 'Company', 'Category', 'Pub Date']
+FLOAT32_COLUMNS = ['Sentiment', 'Weight (%)']
+
+def to_arrow_table(df: pd.DataFrame):
+    """타입 지정 Arrow 테이블 (감성 float32, 섹터/티커/카테고리 등 dictionary 인코딩)"""
+    import pyarrow as pa
+
+    arrays: List = []
+    fields: List = []
+
+    for column in df.columns:
+        series = df[column]
+
+        if column in FLOAT32_COLUMNS:
+            array = pa.array(series.to_numpy(dtype='float32', na_value=float('nan')), type=pa.float32())
+        elif column in DICTIONARY_COLUMNS:
+            array = pa.array(series.astype(str), type=pa.string()).dictionary_encode()
+        else:
+            array = pa.Array.from_pandas(series)
+
+        arrays.append(array)
+        fields.append(pa.field(column, array.type))
+
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+def to_parquet_bytes(df: pd.DataFrame) -> bytes:
+    """Parquet (zstd 압축)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = pa.BufferOutputStream()
+    pq.write_table(to_arrow_table(df), sink, compression='zstd')
+    return sink.getvalue().to_pybytes()
+
+def to_arrow_ipc_bytes(df: pd.DataFrame) -> bytes:
+    """Arrow IPC 파일 (프로세스 내 소비자용, 메모리 매핑으로 무복사 로드 가능)"""
+    import pyarrow as pa
+
+    table = to_arrow_table(df)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+EXPORT_FORMATS = {
+    'csv': ('csv', to_csv_bytes),
+    'parquet': ('parquet', to_parquet_bytes),
+    'arrow': ('arrow', to_arrow_ipc_bytes),
+}
+
+def write_export(df: pd.DataFrame, output_dir: Path, name: str, fmt: str) -> Path:
+    """파일로 내보내기 (fmt: csv / parquet / arrow) → 저장 경로"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"지원하지 않는 형식: {fmt} ({', '.join(EXPORT_FORMATS)})")
+
+    extension, writer = EXPORT_FORMATS[fmt]
+    path = Path(output_dir) / f"{name}.{extension}"
+    path.write_bytes(writer(df))
+    return path
+
+def read_arrow_ipc(path: Path, memory_map: bool = True):
+    """Arrow IPC 파일을 Arrow 테이블로 로드 (memory_map=True면 무복사)"""
+    import pyarrow as pa
+
+    source = pa.memory_map(str(path), 'r') if memory_map else pa.OSFile(str(path), 'rb')
+    with pa.ipc.open_file(source) as reader:
+        return reader.read_all()
@@ -0,0 +1,162 @@
+"""
+백그라운드 리포트 작업 큐 - 점수 계산과 엑셀 서식 작업 분리
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config.config import Config
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+def report_job_id(analyzed_news: List[Dict], date_str: str) -> str:
+    """같은 날짜 + 같은 분석 결과면 같은 작업 ID"""
+    digest = hashlib.sha1(date_str.encode('utf-8'))
+    for news in analyzed_news:
+        digest.update('|'.join([
+            news.get('etf', ''),
+            news.get('sector', ''),
+            news.get('ticker', ''),
+            news.get('url') or news.get('title', ''),
+            f"{news.get('sentiment_score', 0.0):.4f}"
+        ]).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+class ReportJobQueue:
+    """리포트 생성 요청을 큐에 넣고 백그라운드 스레드에서 렌더링
+
+    - 상태는 REPORT_DIR/jobs/{job_id}.json 에 기록 (다른 프로세스에서도 조회 가능)
+    - 대기/실행 중인 같은 요청은 하나로 합침
+    - 이미 완료된 요청은 파일이 남아 있으면 다시 만들지 않음
+    - 작업마다 Market_Monitor_{날짜}_{작업 ID}.xlsx 로 저장 (임시 폴더에서 만든 뒤 이름 변경)
+    """
+
+    def __init__(self, output_dir: Optional[Path] = None, workers: int = 1):
+        self.output_dir = Path(output_dir or Config.REPORT_DIR)
+        self.jobs_dir = self.output_dir / "jobs"
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report-job')
+        self._jobs: Dict[str, Dict] = {}
+        self._events: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def _status_path(self, job_id: str) -> Path:
+        return self.jobs_dir / f"{job_id}.json"
+
+    def _report_path(self, job_id: str, date_str: str) -> Path:
+        return self.output_dir / f"Market_Monitor_{date_str}_{job_id}.xlsx"
+
+    def _write_status(self, job: Dict):
+        self._status_path(job['job_id']).write_text(json.dumps(job, ensure_ascii=False, indent=2),
+                                                    encoding='utf-8')
+
+    def _update(self, job_id: str, **fields) -> Dict:
+        with self._lock:
+            job = dict(self._jobs.get(job_id, {'job_id': job_id}), **fields)
+            self._jobs[job_id] = job
+
+        self._write_status(job)
+        return job
+
+    def submit(self, analyzed_news: List[Dict], sector_holdings: Dict, date_str: str,
+               trend: Optional[Dict] = None) -> str:
+        """리포트 요청 등록 → 작업 ID (바로 반환)"""
+        job_id = report_job_id(analyzed_news, date_str)
+
+        with self._lock:
+            current = self._jobs.get(job_id) or self._read_status(job_id)
+            if current and current['status'] in (QUEUED, RUNNING) and job_id in self._events:
+                return job_id
+            # 이 작업 이름의 파일만 재사용 (다른 작업 결과나 쓰는 중인 파일이 아님)
+            report_path = (current or {}).get('report_path') or ''
+            if (current and current['status'] == DONE
+                    and Path(report_path) == self._report_path(job_id, date_str)
+                    and Path(report_path).exists()):
+                self._jobs[job_id] = current
+                return job_id
+
+            # 상태와 이벤트를 같은 잠금 안에서 기록 (동시에 들어온 같은 요청은 위에서 합쳐짐)
+            self._events[job_id] = threading.Event()
+            job = {'job_id': job_id, 'status': QUEUED, 'rows': len(analyzed_news),
+                   'date': date_str, 'report_path': None, 'error': None,
+                   'submitted_at': datetime.now().isoformat(timespec='seconds'),
+                   'finished_at': None}
+            self._jobs[job_id] = job
+
+        self._write_status(job)
+        self._executor.submit(self._render, job_id, analyzed_news, sector_holdings,
+                              date_str, trend)
+        return job_id
+
+    def _render(self, job_id: str, analyzed_news: List[Dict], sector_holdings: Dict,
+                date_str: str, trend: Optional[Dict]):
+        from reporters.excel_generator_sector import SectorETFExcelGenerator
+        from reporters.excel_streaming import StreamingSectorExcelGenerator
+
+        self._update(job_id, status=RUNNING)
+        work_dir = self.jobs_dir / f"tmp-{job_id}"
+        try:
+            # 작업 전용 폴더에서 만든 뒤 최종 이름으로 교체 (쓰는 중인 파일을 다른 작업이 보지 않게)
+            work_dir.mkdir(exist_ok=True)
+            if len(analyzed_news) >= Config.STREAMING_REPORT_MIN_ROWS:
+                generator = StreamingSectorExcelGenerator(work_dir)
+            else:
+                generator = SectorETFExcelGenerator(work_dir)
+            rendered = generator.generate_sector_report(
+                analyzed_news, sector_holdings, date_str, trend=trend
+            )
+            report_path = self._report_path(job_id, date_str)
+            os.replace(rendered, report_path)
+            self._update(job_id, status=DONE, report_path=str(report_path),
+                         finished_at=datetime.now().isoformat(timespec='seconds'))
+        except Exception as e:
+            print(f"❌ 리포트 작업 실패 ({job_id}): {e}")
+            self._update(job_id, status=FAILED, error=str(e),
+                         finished_at=datetime.now().isoformat(timespec='seconds'))
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            self._events[job_id].set()
+
+    def _read_status(self, job_id: str) -> Optional[Dict]:
+        path = self._status_path(job_id)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding='utf-8'))
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """작업 상태 {'job_id', 'status', 'report_path', 'error', ...} (없으면 None)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return dict(job) if job else self._read_status(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict]:
+        """작업이 끝날 때까지 대기 후 상태 반환"""
+        event = self._events.get(job_id)
+        if event is not None:
+            event.wait(timeout)
+        return self.status(job_id)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+_default_queue: Optional[ReportJobQueue] = None
+_default_lock = threading.Lock()
+
+def get_report_queue() -> ReportJobQueue:
+    """프로세스 공용 리포트 큐 (Config.REPORT_DIR)"""
+    global _default_queue
+    with _default_lock:
+        if _default_queue is None:
+            Config.ensure_directories()
+            _default_queue = ReportJobQueue(Config.REPORT_DIR)
+        return _default_queue
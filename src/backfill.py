@@ -0,0 +1,132 @@
+"""
+히스토리 백필 - 날짜 범위를 일 단위 작업으로 나눠 병렬 수집/분석
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+
+from config.config import Config
+from collectors.sector_collector import SectorETFCollector
+from collectors.news_collector import NewsCollector
+from collectors.fetch_utils import RateLimiter, FetchCache
+from analyzers.sentiment_analyzer import SentimentAnalyzer
+from storage.history_store import SentimentHistoryStore
+
+def split_days(start_date: str, end_date: str) -> List[str]:
+    """[start, end] 날짜 범위를 일 단위로 분할 ('YYYY-MM-DD')"""
+    start = datetime.strptime(start_date, '%Y-%m-%d')
+    end = datetime.strptime(end_date, '%Y-%m-%d')
+
+    if end < start:
+        raise ValueError(f"종료일({end_date})이 시작일({start_date})보다 빠릅니다")
+
+    return [(start + timedelta(days=i)).strftime('%Y-%m-%d')
+            for i in range((end - start).days + 1)]
+
+def _run_day(day: str, portfolio: List[Dict], analyzer: SentimentAnalyzer,
+             store: SentimentHistoryStore,
+             rate_limiter: RateLimiter, cache: FetchCache, offset: int = 0) -> Tuple[int, bool]:
+    """하루치 작업: 수집 → 분석 → 저장 → 완료 기록 → (뉴스 수, 완료 여부)
+
+    실패한 소스 조회가 없고 그날이 이미 지난 경우에만 완료로 기록합니다
+    (뉴스가 0건이어도 모든 조회가 성공했다면 완료).
+
+    offset: 포트폴리오 시작 위치 - 동시에 도는 작업들이 서로 다른 티커부터
+    요청하도록 돌려서, 같은 피드를 기다리며 직렬화되지 않게 함
+    """
+    day_start = datetime.strptime(day, '%Y-%m-%d')
+    day_end = day_start + timedelta(days=1)
+    collector = NewsCollector(
+        start_date=day_start,
+        end_date=day_end,
+        rate_limiter=rate_limiter,
+        cache=cache
+    )
+
+    offset = offset % len(portfolio) if portfolio else 0
+    rotated = portfolio[offset:] + portfolio[:offset]
+    # 날짜 단위로 이미 병렬이므로 하루치는 순서대로 (offset 회전 유지)
+    news = collector.collect_all_news(rotated, verbose=False, workers=1)
+
+    analyzed = analyzer.batch_analyze(news, verbose=False) if news else []
+
+    store.save_news(analyzed)
+    complete = collector.failures == 0 and day_end <= datetime.now()
+    if complete:
+        store.mark_backfill_day(day, len(analyzed))
+
+    return len(analyzed), complete
+
+def run_backfill(start_date: str, end_date: str, workers: int = None,
+                 requests_per_sec: float = None, top_n: int = 5,
+                 force: bool = False) -> Dict[str, int]:
+    """날짜 범위 백필 실행
+
+    - 일 단위 작업을 스레드 풀에서 병렬 실행
+    - 속도 제한/응답 캐시는 모든 작업이 공유 (같은 피드는 한 번만 요청)
+    - 완료된 날짜는 저장소에 기록되어 재실행 시 건너뜀 (force=True면 다시 실행)
+    - 오늘/미래 날짜는 아직 뉴스가 다 나오지 않았으므로 건너뜀
+    - 뉴스는 (뉴스 ID, ETF) 키로 덮어쓰므로 재실행해도 중복 저장되지 않음
+
+    참고: RSS/검색 결과는 최근 뉴스만 제공하므로, 오래된 날짜는 소스에
+    남아 있는 만큼만 채워집니다.
+    """
+    workers = workers or Config.BACKFILL_WORKERS
+    requests_per_sec = requests_per_sec or Config.BACKFILL_REQUESTS_PER_SEC
+
+    print("\n" + "="*70)
+    print(f"히스토리 백필: {start_date} ~ {end_date}")
+    print("="*70)
+
+    Config.ensure_directories()
+    store = SentimentHistoryStore(Config.HISTORY_DB_PATH)
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    days = split_days(start_date, end_date)
+    open_days = [day for day in days if day >= today]
+    done = set() if force else store.completed_backfill_days()
+    pending = [day for day in days if day not in done and day < today]
+
+    print(f"  전체 {len(days)}일 / 완료 {len(days) - len(pending) - len(open_days)}일 / "
+          f"실행 {len(pending)}일")
+    if open_days:
+        print(f"  ⏭️ 오늘 이후 {len(open_days)}일은 건너뜀 ({open_days[0]}~)")
+    if not pending:
+        print("✅ 백필할 날짜 없음")
+        return {}
+
+    # 공용 리소스 (Holdings, 분석기, 속도 제한, 캐시)
+    sector_collector = SectorETFCollector()
+    sector_holdings = sector_collector.collect_all_sector_holdings(top_n=top_n)
+    portfolio = sector_collector.get_portfolio_for_news(sector_holdings)
+
+    analyzer = SentimentAnalyzer(use_finbert=False)
+    rate_limiter = RateLimiter(rate_per_sec=requests_per_sec, burst=workers)
+    cache = FetchCache()
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_run_day, day, portfolio, analyzer, store,
+                            rate_limiter, cache,
+                            (idx % workers) * len(portfolio) // workers): day
+            for idx, day in enumerate(pending)
+        }
+
+        for future in as_completed(futures):
+            day = futures[future]
+            try:
+                results[day], complete = future.result()
+                if complete:
+                    print(f"  ✅ {day}: {results[day]}개")
+                else:
+                    print(f"  ⚠️ {day}: {results[day]}개 (일부 소스 실패 - 다음 실행 때 재시도)")
+            except Exception as e:
+                # 실패한 날짜는 완료 기록이 없으므로 다음 실행 때 재시도
+                print(f"  ⚠️ {day} 백필 실패: {e}")
+
+    stats = cache.stats()
+    print(f"\n✅ 백필 완료: {len(results)}/{len(pending)}일, {sum(results.values())}개 뉴스")
+    print(f"   캐시 적중률 {stats['hit_rate']:.1%} ({stats['hits']}/{stats['hits'] + stats['misses']})")
+
+    return results
@@ -0,0 +1,114 @@
+"""
+청크 파이프라인 - 대형 유니버스를 고정 크기 티커 묶음으로 처리
+"""
+from datetime import datetime
+from pathlib import Path
+import uuid
+from typing import Dict, Optional
+
+from config.config import Config
+from collectors.sector_collector import SectorETFCollector
+from collectors.news_collector import NewsCollector
+from analyzers.aggregation import SectorScoreAccumulator
+from analyzers.trend_engine import SentimentTrendEngine
+from reporters.excel_streaming import StreamingSectorExcelGenerator
+from storage.history_store import SentimentHistoryStore
+
+def run_chunked_pipeline(chunk_size: int = None, top_n: int = 5,
+                         sector_holdings: Optional[Dict] = None,
+                         news_collector: Optional[NewsCollector] = None,
+                         analyzer=None,
+                         store: Optional[SentimentHistoryStore] = None,
+                         report_dir: Optional[Path] = None,
+                         generate_report: bool = True,
+                         verbose: bool = True) -> Dict:
+    """청크 단위 수집 → 분석 → 집계 → 저장
+
+    각 청크의 뉴스는 저장소에 기록한 뒤 바로 버리고, 섹터 점수는 누적 합계만
+    유지하므로 최대 메모리는 유니버스 크기가 아니라 청크 크기에 비례합니다.
+
+    리포트는 이 실행이 저장한 행(run_id)만 저장소 커서로 섹터 순으로 읽어
+    write-only 워크북에 바로 기록합니다 (다른 실행/모드가 저장한 뉴스는 제외).
+
+    sector_holdings/news_collector/analyzer/store/report_dir를 넘기면 그대로
+    사용합니다 (벤치마크/대형 유니버스용).
+
+    Returns:
+        {'sector_scores', 'tickers', 'news_count', 'chunks', 'report_path', 'run_id'}
+    """
+    chunk_size = chunk_size or Config.PIPELINE_CHUNK_SIZE
+
+    if verbose:
+        print("\n" + "="*70)
+        print(f"섹터 ETF 감성분석 - 청크 모드 (청크 {chunk_size}종목)")
+        print("="*70)
+
+    Config.ensure_directories()
+
+    sector_collector = SectorETFCollector()
+    if sector_holdings is None:
+        sector_holdings = sector_collector.collect_all_sector_holdings(top_n=top_n)
+
+    if news_collector is None:
+        news_collector = NewsCollector(days=Config.NEWS_DAYS)
+
+    if analyzer is None:
+        from analyzers.sentiment_analyzer import SentimentAnalyzer
+        analyzer = SentimentAnalyzer(use_finbert=False)
+
+    if store is None:
+        store = SentimentHistoryStore(Config.HISTORY_DB_PATH)
+
+    accumulator = SectorScoreAccumulator()
+    run_id = uuid.uuid4().hex
+    tickers = 0
+    chunks = 0
+
+    for chunk in sector_collector.iter_portfolio_chunks(sector_holdings, chunk_size):
+        news = news_collector.collect_all_news(chunk, verbose=False)
+        analyzed = analyzer.batch_analyze(news, verbose=False) if news else []
+
+        accumulator.add(analyzed)
+        store.save_news(analyzed, run_id=run_id)
+
+        tickers += len(chunk)
+        chunks += 1
+
+        if verbose:
+            print(f"  [청크 {chunks}] {tickers}종목 / 누적 뉴스 {accumulator.total_count}개")
+
+        # 다음 청크 전에 참조 해제
+        del chunk, news, analyzed
+
+    sector_scores = accumulator.scores()
+
+    if verbose:
+        print(f"\n✅ {tickers}종목, {accumulator.total_count}개 뉴스 저장 완료 "
+              f"({datetime.now().strftime('%Y-%m-%d %H:%M')})")
+        for sector, score in sorted(sector_scores.items()):
+            print(f"  {sector}: Simple {score['simple']:.4f} / Weighted {score['weighted']:.4f}")
+
+    # 스트리밍 리포트 (이 실행이 저장한 행을 저장소에서 읽음 - 반환하는 sector_scores와 같은 뉴스)
+    report_path = None
+    if generate_report:
+        today = datetime.now().strftime('%Y-%m-%d')
+        trend = SentimentTrendEngine.from_config().compute_from_store(
+            store, today, lookback_days=Config.TREND_LOOKBACK_DAYS
+        )
+        generator = StreamingSectorExcelGenerator(report_dir or Config.REPORT_DIR)
+        report_path = generator.generate_sector_report(
+            store.iter_news(run_id=run_id),
+            sector_holdings,
+            today,
+            trend=trend,
+            sector_scores=store.sector_scores(run_id=run_id)
+        )
+
+    return {
+        'sector_scores': sector_scores,
+        'tickers': tickers,
+        'news_count': accumulator.total_count,
+        'chunks': chunks,
+        'report_path': report_path,
+        'run_id': run_id
+    }
@@ -0,0 +1,330 @@
+"""
+수집 데몬 - 종목별로 따로 예약하고, 뉴스가 나오는 속도에 맞춰 조회 간격 조절
+"""
+import heapq
+import json
+import statistics
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from config.config import Config
+from collectors.sector_collector import SectorETFCollector
+from collectors.news_collector import NewsCollector
+from collectors.fetch_utils import RateLimiter, host_guard_stats
+from analyzers.dedup import (NearDuplicateDetector, analyze_deduplicated, drop_sector_duplicates,
+                             sector_key)
+from storage.history_store import SentimentHistoryStore
+
+SEEN_PER_TICKER = 200  # 종목별로 기억하는 최근 URL 수
+
+def published_epoch(news: Dict) -> Optional[float]:
+    """'published_ts'(UTC) → epoch 초 (없으면 None)"""
+    ts = news.get('published_ts')
+    if not ts:
+        return None
+    return datetime.fromisoformat(ts).replace(tzinfo=timezone.utc).timestamp()
+
+class TickerSchedule:
+    """종목 하나의 조회 상태
+
+    velocity: 새 기사 수/시간 (지수 가중 평균, 반감기 Config.DAEMON_VELOCITY_HALF_LIFE_HOURS)
+    interval: 다음 조회까지 분 = 목표 새 기사 수 / velocity (최소/최대 간격으로 제한)
+    failures/retry_at: 연속 실패 수와 재시도 시각 (실패는 last_poll/속도에 반영하지 않음)
+    """
+
+    def __init__(self, ticker: str, state: Optional[Dict] = None):
+        state = state or {}
+        self.ticker = ticker
+        self.velocity: float = state.get('velocity', 0.0)
+        self.interval: float = state.get('interval', Config.DAEMON_INITIAL_POLL_MINUTES)
+        self.last_poll: Optional[float] = state.get('last_poll')
+        self.polls: int = state.get('polls', 0)
+        self.seen: List[str] = state.get('seen', [])
+        self._seen_set = set(self.seen)
+        self.failures: int = state.get('failures', 0)
+        self.retry_at: Optional[float] = state.get('retry_at')
+
+    def next_due(self) -> float:
+        if self.retry_at is not None:
+            return self.retry_at
+        if self.last_poll is None:
+            return 0.0
+        return self.last_poll + self.interval * 60
+
+    @staticmethod
+    def _key(news: Dict) -> str:
+        return news.get('url') or news.get('title', '')
+
+    def new_items(self, news_items: List[Dict]) -> List[Dict]:
+        """처음 보는 기사만 (URL 없으면 제목 기준) - 저장 후 mark_seen()으로 기록"""
+        fresh = []
+        keys = set()
+        for news in news_items:
+            key = self._key(news)
+            if key and key not in self._seen_set and key not in keys:
+                keys.add(key)
+                fresh.append(news)
+        return fresh
+
+    def mark_seen(self, fresh: List[Dict]):
+        """저장까지 끝난 기사를 본 목록에 기록 (최근 SEEN_PER_TICKER개만 유지)"""
+        for news in fresh:
+            key = self._key(news)
+            if key and key not in self._seen_set:
+                self._seen_set.add(key)
+                self.seen.append(key)
+
+        if len(self.seen) > SEEN_PER_TICKER:
+            for key in self.seen[:-SEEN_PER_TICKER]:
+                self._seen_set.discard(key)
+            self.seen = self.seen[-SEEN_PER_TICKER:]
+
+    def observe(self, fresh: List[Dict], now: float):
+        """조회 결과로 속도/간격 갱신"""
+        if self.last_poll is None:
+            # 첫 조회: 밀린 기사는 속도로 세지 않고 최근 24시간 발행 건수로 추정
+            recent = sum(1 for n in fresh if (published_epoch(n) or 0) >= now - 24 * 3600)
+            self.velocity = recent / 24
+        else:
+            hours = max((now - self.last_poll) / 3600, 1e-6)
+            weight = 1 - 0.5 ** (hours / Config.DAEMON_VELOCITY_HALF_LIFE_HOURS)
+            self.velocity += weight * (len(fresh) / hours - self.velocity)
+
+        if self.velocity > 0:
+            minutes = Config.DAEMON_TARGET_NEW_PER_POLL / self.velocity * 60
+        else:
+            minutes = Config.DAEMON_MAX_POLL_MINUTES
+        self.interval = min(Config.DAEMON_MAX_POLL_MINUTES,
+                            max(Config.DAEMON_MIN_POLL_MINUTES, minutes))
+        self.last_poll = now
+        self.polls += 1
+        self.failures = 0
+        self.retry_at = None
+
+    def fail(self, now: float):
+        """조회 실패 → 재시도 예약 (Config.DAEMON_RETRY_MINUTES부터 연속 실패마다 2배)"""
+        self.failures += 1
+        minutes = Config.DAEMON_RETRY_MINUTES * 2 ** min(self.failures - 1, 16)
+        self.retry_at = now + min(minutes, Config.DAEMON_MAX_POLL_MINUTES) * 60
+
+    def to_state(self) -> Dict:
+        return {'velocity': round(self.velocity, 4), 'interval': round(self.interval, 2),
+                'last_poll': self.last_poll, 'polls': self.polls, 'seen': self.seen,
+                'failures': self.failures, 'retry_at': self.retry_at}
+
+class CollectorDaemon:
+    """종목별 예약 큐(다음 조회 시각 순)에서 때가 된 종목만 수집 → 분석 → 저장
+
+    - 새 기사만 분석해 히스토리 저장소에 바로 기록 (실행 중에도 대시보드/리포트에서 조회 가능)
+    - 종목별 상태(속도, 간격, 본 URL)는 Config.DAEMON_STATE_PATH에 저장해 재시작 후 이어서 사용
+    - Holdings는 Config.HOLDINGS_CACHE_TTL_HOURS마다 다시 수집해 종목 추가/제외 반영
+    """
+
+    def __init__(self, top_n: int = 5, analyzer=None,
+                 store: Optional[SentimentHistoryStore] = None,
+                 news_collector: Optional[NewsCollector] = None,
+                 sector_collector: Optional[SectorETFCollector] = None,
+                 state_path: Optional[Path] = None,
+                 clock: Callable[[], float] = time.time):
+        if analyzer is None:
+            from analyzers.sentiment_analyzer import SentimentAnalyzer
+            analyzer = SentimentAnalyzer(use_finbert=False)
+
+        self.top_n = top_n
+        self.analyzer = analyzer
+        self.store = store or SentimentHistoryStore(Config.HISTORY_DB_PATH)
+        self.news_collector = news_collector or NewsCollector(
+            days=Config.NEWS_DAYS,
+            rate_limiter=RateLimiter(rate_per_sec=Config.DAEMON_REQUESTS_PER_SEC)
+        )
+        self.sector_collector = sector_collector or SectorETFCollector()
+        self.state_path = Path(state_path or Config.DAEMON_STATE_PATH)
+        self.clock = clock
+        self.detector = (NearDuplicateDetector(threshold=Config.DEDUP_THRESHOLD)
+                         if Config.DEDUP_ENABLED else None)
+        self._sector_clusters = set()  # 저장한 (클러스터 ID, 섹터) - 다른 종목 조회의 같은 기사 제외
+
+        self.universe: Dict[str, Dict] = {}
+        self.schedules: Dict[str, TickerSchedule] = {}
+        self._queue: List = []
+        self._holdings_at: Optional[float] = None
+        self._stopped = threading.Event()
+
+        self.started_at = clock()
+        self.saved = 0
+        self.freshness: List[float] = []  # 새 기사 발행 → 수집까지 분 (최근 1000건)
+
+    # ---------- 상태 ----------
+
+    def load_state(self) -> Dict:
+        if not self.state_path.exists():
+            return {}
+        return json.loads(self.state_path.read_text(encoding='utf-8')).get('tickers', {})
+
+    def save_state(self):
+        state = {'saved_at': datetime.now().isoformat(timespec='seconds'),
+                 'tickers': {t: s.to_state() for t, s in self.schedules.items()}}
+        tmp_path = self.state_path.with_suffix('.json.tmp')
+        tmp_path.write_text(json.dumps(state, ensure_ascii=False), encoding='utf-8')
+        tmp_path.replace(self.state_path)
+
+    # ---------- 예약 ----------
+
+    def refresh_universe(self):
+        """Holdings 다시 수집 → 예약 목록 갱신 (기존 종목 상태는 유지)"""
+        holdings = self.sector_collector.collect_all_sector_holdings(top_n=self.top_n)
+        self.universe = self.sector_collector.build_universe(holdings)
+        saved_state = self.load_state() if not self.schedules else {}
+
+        for ticker in self.universe:
+            if ticker not in self.schedules:
+                self.schedules[ticker] = TickerSchedule(ticker, saved_state.get(ticker))
+        for ticker in set(self.schedules) - set(self.universe):
+            del self.schedules[ticker]
+
+        self._queue = [(s.next_due(), ticker) for ticker, s in self.schedules.items()]
+        heapq.heapify(self._queue)
+        self._holdings_at = self.clock()
+        print(f"📊 데몬 종목 {len(self.schedules)}개 예약")
+
+    def poll(self, ticker: str) -> int:
+        """종목 하나 조회 → 저장한 새 기사 수
+
+        저장까지 끝난 뒤에만 본 기사/조회 시각을 기록하므로, 도중에 실패하면
+        (모든 소스 실패 포함) 예외가 나고 같은 기사를 다음 재시도에서 다시 처리합니다.
+        """
+        schedule = self.schedules[ticker]
+        entry = self.universe[ticker]
+
+        failures_before = self.news_collector.failures
+        news_items = self.news_collector.collect_news_for_ticker(ticker, entry['company'])
+        if not news_items and self.news_collector.failures > failures_before:
+            raise RuntimeError("뉴스 소스 응답 실패")
+
+        now = self.clock()
+        first_poll = schedule.last_poll is None
+        fresh = schedule.new_items(news_items)
+
+        if not fresh:
+            schedule.observe(fresh, now)
+            return 0
+
+        if self.detector is not None:
+            analyzed = analyze_deduplicated(self.analyzer, fresh, self.detector, verbose=False)
+        else:
+            analyzed = self.analyzer.batch_analyze(fresh, verbose=False)
+
+        joined = self.sector_collector.join_news_to_memberships({ticker: analyzed}, self.universe)
+        if self.detector is not None:
+            joined = drop_sector_duplicates(joined, self._sector_clusters)
+        self.saved += self.store.save_news(joined)
+        if self.detector is not None:
+            self._sector_clusters.update((n['cluster_id'], sector_key(n)) for n in joined)
+        schedule.mark_seen(fresh)
+        schedule.observe(fresh, now)
+
+        # 첫 조회의 밀린 기사는 수집 지연에서 제외
+        if not first_poll:
+            for news in fresh:
+                published = published_epoch(news)
+                if published is not None:
+                    self.freshness.append(max(0.0, now - published) / 60)
+            del self.freshness[:-1000]
+        return len(analyzed)
+
+    def run_once(self) -> Optional[str]:
+        """때가 된 종목 하나 조회 → 조회한 종목 (없으면 None)"""
+        if not self._queue or self._queue[0][0] > self.clock():
+            return None
+
+        _, ticker = heapq.heappop(self._queue)
+        if ticker not in self.schedules:
+            return None
+
+        try:
+            self.poll(ticker)
+        except Exception as e:
+            # last_poll은 그대로 두고 (첫 조회면 None 유지) 재시도 간격만 늘림
+            schedule = self.schedules[ticker]
+            schedule.fail(self.clock())
+            print(f"  ⚠️ {ticker} 조회 실패 ({schedule.failures}회 연속): {e}")
+
+        heapq.heappush(self._queue, (self.schedules[ticker].next_due(), ticker))
+        return ticker
+
+    # ---------- 실행 ----------
+
+    def stats(self) -> Dict:
+        hours = max((self.clock() - self.started_at) / 3600, 1e-6)
+        intervals = [s.interval for s in self.schedules.values()]
+        fixed_per_hour = len(self.schedules) * 60 / Config.REFRESH_INTERVAL_MINUTES
+        return {
+            'tickers': len(self.schedules),
+            'requests_per_hour': round(self.news_collector.requests / hours, 1),
+            'fixed_polls_per_hour': round(fixed_per_hour, 1),
+            'saved': self.saved,
+            'median_interval_min': round(statistics.median(intervals), 1) if intervals else None,
+            'median_freshness_min': (round(statistics.median(self.freshness), 1)
+                                     if self.freshness else None),
+            'fastest': sorted(((t, round(s.interval, 1)) for t, s in self.schedules.items()),
+                              key=lambda item: item[1])[:5],
+            'hosts': host_guard_stats()
+        }
+
+    def print_stats(self):
+        s = self.stats()
+        print(f"📈 종목 {s['tickers']}개 | 요청 {s['requests_per_hour']}/h "
+              f"(고정 주기 {s['fixed_polls_per_hour']}회/h) | 저장 {s['saved']}건 | "
+              f"간격 중앙값 {s['median_interval_min']}분 | 수집 지연 중앙값 {s['median_freshness_min']}분")
+        print("   가장 잦은 종목: " + ", ".join(f"{t} {m}분" for t, m in s['fastest']))
+        for host, h in s['hosts'].items():
+            if h['state'] != 'closed' or h['opens']:
+                print(f"   🔌 {host} 브레이커 {h['state']} (열림 {h['opens']}회, 거절 {h['rejected']}건, "
+                      f"동시 한도 {h['limit']})")
+
+    def stop(self):
+        self._stopped.set()
+
+    def run(self, max_seconds: Optional[float] = None):
+        """stop() (또는 Ctrl+C) 전까지 실행"""
+        print("\n" + "="*70)
+        print("섹터 ETF 감성분석 - 수집 데몬")
+        print("="*70)
+
+        Config.ensure_directories()
+        self.refresh_universe()
+        last_report = last_save = last_prune = self.clock()
+
+        try:
+            while not self._stopped.is_set():
+                now = self.clock()
+                if max_seconds is not None and now - self.started_at >= max_seconds:
+                    break
+                if now - self._holdings_at >= Config.HOLDINGS_CACHE_TTL_HOURS * 3600:
+                    self.refresh_universe()
+                if self.detector is not None and now - last_prune >= 3600:
+                    # 유사 중복 색인은 수집 기간만큼만 유지
+                    cutoff = datetime.now() - timedelta(days=Config.NEWS_DAYS)
+                    self.detector.prune_before(cutoff.strftime('%Y-%m-%d'))
+                    live = self.detector.clusters()
+                    self._sector_clusters = {k for k in self._sector_clusters if k[0] in live}
+                    last_prune = now
+
+                if self.run_once() is None:
+                    wait = self._queue[0][0] - self.clock() if self._queue else 60
+                    self._stopped.wait(min(max(wait, 0.1), 60))
+
+                if self.clock() - last_save >= 60:
+                    self.save_state()
+                    last_save = self.clock()
+                if self.clock() - last_report >= Config.DAEMON_REPORT_MINUTES * 60:
+                    self.print_stats()
+                    last_report = self.clock()
+        except KeyboardInterrupt:
+            print("\n⏹️ 데몬 종료 중...")
+        finally:
+            self.save_state()
+            self.print_stats()
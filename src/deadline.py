@@ -0,0 +1,99 @@
+"""
+실행 시간 예산 - 수집/분석 단계에 마감 시각을 전달하고, 마감 후 건너뛴 종목으로 섹터별 수집률 계산
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+class DeadlineExceeded(Exception):
+    """마감 시각이 지나 요청/분석을 하지 않음"""
+
+class IncompleteResult(Exception):
+    """마감으로 일부만 끝난 결과 (캐시 함수에서 부분 결과가 저장되지 않게 예외로 전달)"""
+
+    def __init__(self, result):
+        super().__init__("마감으로 일부 결과만 수집됨")
+        self.result = result
+
+class Deadline:
+    """실행 전체의 마감 시각 (seconds=None이면 제한 없음)
+
+    - remaining()/expired(): 남은 시간 확인
+    - clip(timeout): 요청 타임아웃을 남은 시간 이하로
+    - skip(ticker): 마감으로 수집/분석하지 못한 종목 기록 (여러 스레드 공유)
+    """
+
+    def __init__(self, seconds: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.seconds = seconds
+        self.clock = clock
+        self.expires_at = clock() + seconds if seconds is not None else None
+        self.skipped: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - self.clock())
+
+    def expired(self) -> bool:
+        return self.expires_at is not None and self.clock() >= self.expires_at
+
+    def check(self):
+        if self.expired():
+            raise DeadlineExceeded(f"실행 예산 {self.seconds}초 초과")
+
+    def clip(self, timeout: float) -> float:
+        """timeout과 남은 시간 중 작은 값 (0이면 requests가 거부하므로 최소 0.01초)"""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        return max(0.01, min(timeout, remaining))
+
+    def stage(self, share: float) -> 'Deadline':
+        """남은 시간의 share만 쓰는 앞 단계용 마감 (건너뛴 종목은 공유)
+
+        예: 수집에 stage(0.8)을 주면 남은 20%는 분석 몫으로 남습니다.
+        """
+        child = Deadline(None, self.clock)
+        child.seconds = self.seconds
+        if self.expires_at is not None:
+            child.expires_at = self.clock() + self.remaining() * share
+        child.skipped = self.skipped
+        child._lock = self._lock
+        return child
+
+    def skip(self, ticker: str):
+        with self._lock:
+            self.skipped.add(ticker)
+
+def raise_if_cut(result, tickers, deadline: Optional[Deadline]):
+    """마감으로 건너뛴 종목이 tickers에 있으면 IncompleteResult (캐시에 부분 결과가 남지 않게)"""
+    if deadline is not None and deadline.skipped & set(tickers):
+        raise IncompleteResult(result)
+    return result
+
+def sector_coverage(portfolio: List[Dict], skipped: Set[str]) -> Dict[str, Dict]:
+    """{섹터: {'etf', 'expected', 'collected', 'complete'}} - 포트폴리오 종목 중 마감 전에 끝난 수"""
+    coverage: Dict[str, Dict] = {}
+    for item in portfolio:
+        c = coverage.setdefault(item['sector'], {'etf': item['etf'], 'expected': 0, 'collected': 0})
+        c['expected'] += 1
+        c['collected'] += item['ticker'] not in skipped
+    for c in coverage.values():
+        c['complete'] = c['collected'] == c['expected']
+    return coverage
+
+def is_partial(coverage: Optional[Dict[str, Dict]]) -> bool:
+    return bool(coverage) and not all(c['complete'] for c in coverage.values())
+
+def print_coverage(coverage: Dict[str, Dict]):
+    """일부만 수집된 섹터 출력"""
+    if not is_partial(coverage):
+        return
+    collected = sum(c['collected'] for c in coverage.values())
+    expected = sum(c['expected'] for c in coverage.values())
+    print(f"⚠️ 실행 예산 초과 - 부분 결과 ({collected}/{expected}개 종목)")
+    for sector, c in coverage.items():
+        if not c['complete']:
+            print(f"   {c['etf']} | {sector}: {c['collected']}/{c['expected']}")
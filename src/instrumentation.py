@@ -0,0 +1,278 @@
+"""
+파이프라인 계측 - 단계별 구간, 요청별 지연/바이트, 분석 처리량, 캐시 적중률 (JSON lines)
+"""
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+class PipelineMetrics:
+    """한 번의 실행 동안 이벤트를 모으고 JSON lines로 기록
+
+    이벤트 종류 (type):
+    - span: 단계 구간 {'name', 'seconds', ...속성}
+    - fetch: 외부 요청 {'source', 'host', 'ticker', 'seconds', 'bytes', 'ok'}
+    - analyze: 감성 분석 묶음 {'texts', 'seconds'}
+    - cache: 캐시 조회 {'cache', 'hit'}
+    - breaker: 호스트 브레이커 전환/거절 {'host', 'state'}
+    - summary: 실행 종료 시 요약 (summary() 결과)
+
+    여러 스레드에서 동시에 기록해도 됩니다.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """path: JSON lines 파일 (None이면 메모리에만 보관)"""
+        self.path = Path(path) if path else None
+        self.started_at = time.perf_counter()
+        self._events: List[Dict] = []
+        self._lock = threading.Lock()
+        self._file = None
+
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+    def emit(self, event_type: str, **fields):
+        event = {'type': event_type,
+                 't': round(time.perf_counter() - self.started_at, 4),
+                 **fields}
+        with self._lock:
+            self._events.append(event)
+            if self._file is not None:
+                self._file.write(json.dumps(event, ensure_ascii=False) + '\n')
+                self._file.flush()
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """with metrics.span('news'): ... → 구간 시간 기록 (예외가 나도 기록)"""
+        start = time.perf_counter()
+        ok = True
+        try:
+            yield
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            self.emit('span', name=name, seconds=round(time.perf_counter() - start, 4),
+                      ok=ok, **attrs)
+
+    def events(self, event_type: Optional[str] = None) -> List[Dict]:
+        with self._lock:
+            return [e for e in self._events if event_type is None or e['type'] == event_type]
+
+    def summary(self, top: int = 5) -> Dict:
+        """{'wall_seconds', 'stages', 'sources', 'hosts', 'slowest_tickers',
+            'analysis', 'caches', 'breakers'}"""
+        stages: Dict[str, float] = {}
+        for e in self.events('span'):
+            stages[e['name']] = round(stages.get(e['name'], 0.0) + e['seconds'], 4)
+
+        fetches = self.events('fetch')
+        sources = _group_latency(fetches, 'source')
+        hosts = _group_latency(fetches, 'host')
+
+        per_ticker: Dict[str, float] = {}
+        for e in fetches:
+            if e.get('ticker'):
+                per_ticker[e['ticker']] = per_ticker.get(e['ticker'], 0.0) + e['seconds']
+        slowest = sorted(per_ticker.items(), key=lambda item: -item[1])[:top]
+
+        analyses = self.events('analyze')
+        texts = sum(e['texts'] for e in analyses)
+        analyze_seconds = sum(e['seconds'] for e in analyses)
+
+        caches: Dict[str, Dict] = {}
+        for e in self.events('cache'):
+            c = caches.setdefault(e['cache'], {'hits': 0, 'misses': 0})
+            c['hits' if e['hit'] else 'misses'] += e.get('count', 1)
+        for c in caches.values():
+            total = c['hits'] + c['misses']
+            c['hit_rate'] = round(c['hits'] / total, 4) if total else 0.0
+
+        breakers: Dict[str, Dict] = {}
+        for e in self.events('breaker'):
+            b = breakers.setdefault(e['host'], {'state': 'closed', 'opens': 0, 'rejected': 0})
+            if e['state'] == 'rejected':
+                b['rejected'] += 1
+            else:
+                b['state'] = e['state']
+                b['opens'] += e['state'] == 'open'
+
+        return {
+            'wall_seconds': round(time.perf_counter() - self.started_at, 4),
+            'stages': stages,
+            'sources': sources,
+            'hosts': hosts,
+            'slowest_tickers': [{'ticker': t, 'seconds': round(s, 4)} for t, s in slowest],
+            'analysis': {
+                'texts': texts,
+                'seconds': round(analyze_seconds, 4),
+                'texts_per_sec': round(texts / analyze_seconds, 1) if analyze_seconds > 0 else None
+            },
+            'caches': caches,
+            'breakers': breakers
+        }
+
+    def print_summary(self, summary: Optional[Dict] = None):
+        s = summary or self.summary()
+        print("\n📈 실행 계측 요약")
+        print(f"  전체 {s['wall_seconds']:.2f}s")
+        for name, seconds in s['stages'].items():
+            print(f"  ⏱️ {name:<10} {seconds:>8.2f}s")
+        for host, h in s['hosts'].items():
+            print(f"  🌐 {host}: {h['requests']}건 (실패 {h['errors']}), "
+                  f"p50 {h['p50_ms']:.0f}ms / p95 {h['p95_ms']:.0f}ms, {h['bytes'] / 1024:.0f}KB")
+        if s['slowest_tickers']:
+            print("  🐢 느린 종목: " + ", ".join(f"{t['ticker']} {t['seconds']:.2f}s"
+                                               for t in s['slowest_tickers']))
+        if s['analysis']['texts']:
+            print(f"  🧠 분석 {s['analysis']['texts']}건, {s['analysis']['texts_per_sec']}건/s")
+        for name, c in s['caches'].items():
+            print(f"  💾 {name} 캐시 적중률 {c['hit_rate']:.0%} ({c['hits']}/{c['hits'] + c['misses']})")
+        for host, b in s.get('breakers', {}).items():
+            print(f"  🔌 {host} 브레이커 {b['state']} (열림 {b['opens']}회, 거절 {b['rejected']}건)")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def _group_latency(fetches: List[Dict], field: str) -> Dict[str, Dict]:
+    groups: Dict[str, List[Dict]] = {}
+    for e in fetches:
+        groups.setdefault(e.get(field) or 'unknown', []).append(e)
+
+    result = {}
+    for name, items in groups.items():
+        latencies = [e['seconds'] * 1000 for e in items]
+        result[name] = {
+            'requests': len(items),
+            'errors': sum(1 for e in items if not e.get('ok', True)),
+            'bytes': sum(e.get('bytes', 0) for e in items),
+            'p50_ms': round(_percentile(latencies, 0.5), 1),
+            'p95_ms': round(_percentile(latencies, 0.95), 1),
+            'max_ms': round(max(latencies), 1)
+        }
+    return result
+
+# ---------- 실행별 활성 계측 (없으면 기록하지 않음) ----------
+
+# 스레드/컨텍스트마다 따로 보관 - 백그라운드 새로 고침과 파이프라인 실행이 겹쳐도 섞이지 않음
+# (작업 스레드에서 기록하려면 contextvars.copy_context()로 넘겨야 함)
+_active: contextvars.ContextVar = contextvars.ContextVar('pipeline_metrics', default=None)
+
+def active_metrics() -> Optional[PipelineMetrics]:
+    return _active.get()
+
+@contextmanager
+def collect_metrics(path: Optional[Path] = None, summary: bool = True):
+    """블록 안에서 수집기/분석기가 남기는 이벤트를 한 PipelineMetrics에 모음
+
+    종료 시 summary 이벤트를 기록하고 (summary=True면) 요약을 출력합니다.
+    """
+    metrics = PipelineMetrics(path)
+    token = _active.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _active.reset(token)
+        result = metrics.summary()
+        metrics.emit('summary', **result)
+        metrics.close()
+        if summary:
+            metrics.print_summary(result)
+
+@contextmanager
+def span(name: str, **attrs):
+    """활성 계측이 있으면 구간 기록"""
+    metrics = _active.get()
+    if metrics is None:
+        yield
+        return
+    with metrics.span(name, **attrs):
+        yield
+
+def record_fetch(source: str, host: str, seconds: float, ticker: str = '',
+                 nbytes: int = 0, ok: bool = True):
+    metrics = _active.get()
+    if metrics is not None:
+        metrics.emit('fetch', source=source, host=host, ticker=ticker,
+                     seconds=round(seconds, 4), bytes=nbytes, ok=ok)
+
+def record_analysis(texts: int, seconds: float):
+    metrics = _active.get()
+    if metrics is not None and texts:
+        metrics.emit('analyze', texts=texts, seconds=round(seconds, 4))
+
+def record_cache(cache: str, hit: bool, count: int = 1):
+    metrics = _active.get()
+    if metrics is not None and count:
+        metrics.emit('cache', cache=cache, hit=hit, count=count)
+
+def record_breaker(host: str, state: str):
+    """브레이커 상태 전환 ('open', 'half_open', 'closed') 또는 거절 ('rejected')"""
+    metrics = _active.get()
+    if metrics is not None:
+        metrics.emit('breaker', host=host, state=state)
+
+def metrics_path(prefix: str = 'pipeline') -> Path:
+    """Config.METRICS_DIR/{prefix}-YYYYmmdd-HHMMSS.jsonl"""
+    from config.config import Config
+    return Config.METRICS_DIR / f"{prefix}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl"
+
+@contextmanager
+def profile_run(mode: Optional[str], output_dir: Path, top: int = 25):
+    """mode: 'cprofile' / 'pyinstrument' / None (프로파일링 안 함)
+
+    cProfile은 .prof 파일(snakeviz 등으로 열기)과 누적 시간 상위 함수를,
+    pyinstrument는 HTML 파일과 콘솔 트리를 남깁니다.
+    """
+    if not mode:
+        yield
+        return
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stem = output_dir / f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+
+    if mode == 'pyinstrument':
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("⚠️ pyinstrument가 설치되지 않아 cProfile을 사용합니다 (pip install pyinstrument)")
+            mode = 'cprofile'
+        else:
+            profiler = Profiler()
+            profiler.start()
+            try:
+                yield
+            finally:
+                profiler.stop()
+                path = stem.with_suffix('.html')
+                path.write_text(profiler.output_html(), encoding='utf-8')
+                print(profiler.output_text(unicode=True, color=False))
+                print(f"✅ 프로파일: {path}")
+            return
+
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        path = stem.with_suffix('.prof')
+        profiler.dump_stats(str(path))
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(top)
+        print(f"✅ 프로파일: {path}")
@@ -3,6 +3,7 @@
 """
 from datetime import datetime
 from pathlib import Path
+import argparse
 import sys
 
 # 프로젝트 루트 추가
@@ -13,53 +14,186 @@ from config.config import Config
 from collectors.sector_collector import SectorETFCollector
 from collectors.news_collector import NewsCollector
 from analyzers.sentiment_analyzer import SentimentAnalyzer
-from reporters.excel_generator_sector import SectorETFExcelGenerator
+from analyzers.trend_engine import SentimentTrendEngine
+from analyzers.dedup import NearDuplicateDetector, analyze_deduplicated
+from reporters.report_jobs import get_report_queue, DONE
+from storage.history_store import SentimentHistoryStore
+from storage.report_archive import ReportArchive
+from src.single_flight import SingleFlight
+from src.deadline import Deadline, print_coverage, sector_coverage
+from src.instrumentation import collect_metrics, metrics_path, profile_run, span
 
-def run_pipeline():
-    """전체 파이프라인 실행"""
+_pipeline_flight = SingleFlight(Config.PIPELINE_MIN_INTERVAL_SECONDS)
+
+def run_pipeline(export_formats=None, wait_report=True, top_n=5, budget_seconds=None):
+    """전체 파이프라인 실행 (같은 프로세스의 동시 호출은 한 번만 실행)
+
+    top_n: ETF별 상위 보유 종목 수 (None이면 전체)
+    export_formats: 엑셀 외 추가 내보내기 형식 목록 (csv / parquet / arrow)
+    wait_report: False면 엑셀 리포트를 백그라운드 작업으로 넘기고 점수 계산 직후 반환
+        (첫 번째 반환값이 리포트 경로 대신 작업 ID, get_report_queue().status()로 조회)
+    budget_seconds: Holdings/뉴스 수집과 감성 분석에 쓸 전체 시간 (None이면 제한 없음)
+        - 끝나면 남은 요청/분석을 건너뛰고 그때까지의 결과로 저장/리포트
+
+    반환: (리포트 경로 또는 작업 ID, 분석 뉴스, Holdings,
+          섹터별 수집률 {섹터: {'etf', 'expected', 'collected', 'complete'}})
+
+    같은 파라미터로 이미 실행 중이면 그 결과를 함께 받고,
+    Config.PIPELINE_MIN_INTERVAL_SECONDS 안에 끝난 실행이 있으면 그 결과를 반환합니다.
+    """
+    key = (tuple(export_formats or ()), wait_report, top_n, budget_seconds,
+           datetime.now().strftime('%Y-%m-%d'))
+    result, shared = _pipeline_flight.run(
+        key, lambda: _run_pipeline(export_formats, wait_report, top_n, budget_seconds)
+    )
+    if shared:
+        print("ℹ️ 진행 중이던(또는 방금 끝난) 파이프라인 결과를 사용합니다")
+    return result
+
+def _run_pipeline(export_formats=None, wait_report=True, top_n=5, budget_seconds=None):
+    """전체 파이프라인 1회 실행 (run_pipeline 참고)
+    
+    Config.METRICS_ENABLED면 단계별 구간/요청별 지연/분석 처리량/캐시 적중률을
+    Config.METRICS_DIR의 JSON lines 파일에 기록하고 마지막에 요약을 출력합니다.
+    """
+    if not Config.METRICS_ENABLED:
+        return _run_stages(export_formats, wait_report, top_n, budget_seconds)
     
+    path = metrics_path('pipeline')
+    with collect_metrics(path):
+        result = _run_stages(export_formats, wait_report, top_n, budget_seconds)
+    print(f"✅ 계측: {path}")
+    return result
+
+def _run_stages(export_formats=None, wait_report=True, top_n=5, budget_seconds=None):
     print("\n" + "="*70)
     print("섹터 ETF 감성분석 시스템")
     print("="*70)
     
     # 디렉토리 생성
     Config.ensure_directories()
+    deadline = Deadline(budget_seconds)
+    fetch_deadline = deadline.stage(Config.BUDGET_FETCH_SHARE)
     
     # 1. Holdings 수집
     print("\n[1/4] 섹터 ETF Holdings 수집...")
-    sector_collector = SectorETFCollector()
-    sector_holdings = sector_collector.collect_all_sector_holdings(top_n=5)
-    portfolio = sector_collector.get_portfolio_for_news(sector_holdings)
+    sector_collector = SectorETFCollector(deadline=fetch_deadline)
+    with span('holdings'):
+        sector_holdings = sector_collector.collect_all_sector_holdings(top_n=top_n)
+        portfolio = sector_collector.get_portfolio_for_news(sector_holdings)
     print(f"✅ {len(portfolio)}개 종목")
     
     # 2. 뉴스 수집
     print("\n[2/4] 뉴스 수집...")
-    news_collector = NewsCollector(days=Config.NEWS_DAYS)
-    all_news = news_collector.collect_all_news(portfolio)
+    news_collector = NewsCollector(days=Config.NEWS_DAYS, deadline=fetch_deadline)
+    with span('news', tickers=len(portfolio)):
+        all_news = news_collector.collect_all_news(portfolio)
     print(f"✅ {len(all_news)}개 뉴스")
     
     # 3. 감성 분석
     print("\n[3/4] 감성 분석...")
-    analyzer = SentimentAnalyzer(use_finbert=False)  # Streamlit에서는 VADER만
-    analyzed_news = analyzer.batch_analyze(all_news)
+    with span('analysis', texts=len(all_news)):
+        analyzer = SentimentAnalyzer(use_finbert=False)  # Streamlit에서는 VADER만
+        if Config.DEDUP_ENABLED:
+            detector = NearDuplicateDetector(threshold=Config.DEDUP_THRESHOLD)
+            analyzed_news = analyze_deduplicated(analyzer, all_news, detector, deadline=deadline)
+        else:
+            analyzed_news = analyzer.batch_analyze(all_news, deadline=deadline)
     print(f"✅ {len(analyzed_news)}개 분석 완료")
     
-    # 4. 엑셀 생성
-    print("\n[4/4] 엑셀 리포트 생성...")
-    generator = SectorETFExcelGenerator(Config.REPORT_DIR)
+    coverage = sector_coverage(portfolio, deadline.skipped)
+    print_coverage(coverage)
+    
+    # 히스토리 저장 + 트렌드 계산
     today = datetime.now().strftime('%Y-%m-%d')
-    report_path = generator.generate_sector_report(
-        analyzed_news,
-        sector_holdings,
-        today
-    )
+    with span('store'):
+        store = SentimentHistoryStore(Config.HISTORY_DB_PATH)
+        saved = store.save_news(analyzed_news)
+        trend = SentimentTrendEngine.from_config().compute_from_store(
+            store, today, lookback_days=Config.TREND_LOOKBACK_DAYS
+        )
+        print(f"✅ 히스토리 저장: {saved}개 (누적 {store.count()}개)")
+        
+        archive = ReportArchive(Config.ARCHIVE_DIR)
+        entry = archive.write_day(today, analyzed_news, sector_holdings)
+    print(f"✅ 아카이브: {today} ({entry['rows']}행, {len(entry['sectors'])}개 섹터)")
+    
+    # 4. 엑셀 생성 (백그라운드 작업)
+    print("\n[4/4] 엑셀 리포트 생성...")
+    report_queue = get_report_queue()
+    job_id = report_queue.submit(analyzed_news, sector_holdings, today, trend=trend)
+    print(f"✅ 리포트 작업 등록: {job_id}")
+    
+    # 추가 내보내기
+    if export_formats:
+        from reporters.export_utils import news_to_frame, write_export
+        with span('export', formats=list(export_formats)):
+            df = news_to_frame(analyzed_news, sector_holdings)
+            for fmt in export_formats:
+                path = write_export(df, Config.REPORT_DIR, f"Market_Monitor_{today}", fmt)
+                print(f"✅ {fmt} 내보내기: {path}")
+    
+    if not wait_report:
+        return job_id, analyzed_news, sector_holdings, coverage
+    
+    with span('report'):
+        job = report_queue.wait(job_id)
+    report_path = job['report_path'] if job['status'] == DONE else None
+    if report_path is None:
+        print(f"❌ 리포트 생성 실패: {job.get('error')}")
     
     print("\n" + "="*70)
     print("✅ 완료!")
     print(f"✅ 리포트: {report_path}")
     print("="*70 + "\n")
     
-    return report_path, analyzed_news, sector_holdings
+    return report_path, analyzed_news, sector_holdings, coverage
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="섹터 ETF 감성분석 파이프라인")
+    parser.add_argument('--backfill', nargs=2, metavar=('START', 'END'),
+                        help="날짜 범위 히스토리 백필 (YYYY-MM-DD YYYY-MM-DD)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="백필 병렬 작업 수")
+    parser.add_argument('--force', action='store_true',
+                        help="완료된 날짜도 다시 백필")
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help="청크 모드: N종목씩 수집/분석/저장 (대형 유니버스용)")
+    parser.add_argument('--top-n', type=int, default=None,
+                        help="ETF별 상위 보유 종목 수 (기본 5, 유니버스 모드는 전체)")
+    parser.add_argument('--universe', action='store_true',
+                        help="유니버스 모드: 전체 Holdings를 고유 종목 기준으로 한 번씩 수집/분석")
+    parser.add_argument('--etfs', default=None,
+                        help="유니버스 모드 ETF 목록 (예: XLK,XLF,SPY)")
+    parser.add_argument('--export-format', nargs='+', default=None,
+                        choices=['csv', 'parquet', 'arrow'],
+                        help="엑셀 외 추가 내보내기 형식 (REPORT_DIR에 저장)")
+    parser.add_argument('--daemon', action='store_true',
+                        help="데몬 모드: 종결하지 않고 종목별 적응형 간격으로 계속 수집/저장")
+    parser.add_argument('--budget', type=float, default=None,
+                        help="수집/분석 전체 시간 예산 (초) - 넘으면 부분 결과로 저장/리포트")
+    parser.add_argument('--profile', nargs='?', const='cprofile', default=None,
+                        choices=['cprofile', 'pyinstrument'],
+                        help="실행 전체 프로파일링 (METRICS_DIR에 저장, 기본 cprofile)")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    run_pipeline()
+    args = parse_args()
+    
+    with profile_run(args.profile, Config.METRICS_DIR):
+        if args.daemon:
+            from src.daemon import CollectorDaemon
+            CollectorDaemon(top_n=args.top_n or 5).run()
+        elif args.backfill:
+            from src.backfill import run_backfill
+            run_backfill(args.backfill[0], args.backfill[1],
+                         workers=args.workers, top_n=args.top_n or 5, force=args.force)
+        elif args.universe:
+            from src.universe import run_universe_pipeline, parse_etf_list
+            run_universe_pipeline(parse_etf_list(args.etfs), top_n=args.top_n)
+        elif args.chunk_size:
+            from src.chunked import run_chunked_pipeline
+            run_chunked_pipeline(chunk_size=args.chunk_size, top_n=args.top_n or 5)
+        else:
+            run_pipeline(export_formats=args.export_format, top_n=args.top_n or 5,
+                         budget_seconds=args.budget)
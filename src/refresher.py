@@ -0,0 +1,281 @@
+"""
+대시보드 공용 새로 고침 - 백그라운드에서 주기적으로 파이프라인을 돌려 스냅샷 게시
+"""
+import threading
+import time
+import traceback
+from datetime import datetime
+from functools import partial
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import pandas as pd
+
+from config.config import Config
+from collectors.fetch_utils import FetchCache
+from src.deadline import (Deadline, IncompleteResult, print_coverage, raise_if_cut,
+                          sector_coverage)
+from src.snapshot_store import SnapshotStore, get_snapshot_store
+
+class DashboardSnapshot(NamedTuple):
+    """한 번의 파이프라인 결과 (게시 후 변경하지 않음 - 모든 세션이 공유)
+
+    원본 뉴스 딕셔너리 목록은 저장/리포트 작업에 넘긴 뒤 보관하지 않습니다 (df만 유지).
+    coverage: 섹터별 수집률 {섹터: {'etf', 'expected', 'collected', 'complete'}} (실행 예산 초과 시 일부)
+    """
+    version: str
+    created_at: str
+    df: pd.DataFrame
+    sector_scores: Dict
+    sector_holdings: Dict
+    trend: Optional[Dict]
+    report_job_id: Optional[str]
+    coverage: Optional[Dict] = None
+
+def _cached_stage(cache: Optional[FetchCache], key: str, compute: Callable):
+    """cache에 key 결과가 있으면 재사용, 없으면 compute()
+
+    compute가 IncompleteResult를 내면 부분 결과만 돌려주고 캐시에는 남기지 않습니다.
+    """
+    try:
+        return cache.get_or_fetch(key, compute) if cache is not None else compute()
+    except IncompleteResult as cut:
+        return cut.result
+
+def build_snapshot(analyzer=None, top_n: int = 5,
+                   progress_callback: Optional[Callable[[str, float, Optional[Dict]], None]] = None,
+                   budget_seconds: Optional[float] = None,
+                   news_cache: Optional[FetchCache] = None,
+                   holdings_cache: Optional[FetchCache] = None) -> DashboardSnapshot:
+    """파이프라인 1회 실행 → 스냅샷 (수집 → 분석 → 저장/아카이브 → 트렌드 → 리포트 작업)
+
+    섹터 단위로 수집/분석하며, 섹터가 끝날 때마다
+    progress_callback(메시지, 진행률 0~1, {'sector', 'scores', 'news_count'})를 호출합니다.
+    수집/분석은 budget_seconds(기본 Config.DASHBOARD_BUDGET_SECONDS) 안에서만 하고,
+    넘으면 남은 종목을 건너뛴 부분 결과를 섹터별 수집률과 함께 게시합니다.
+
+    news_cache/holdings_cache를 주면 섹터별 뉴스와 Holdings를 캐시에서 재사용합니다
+    (세션별 실행의 collect_news_stage/load_sector_holdings와 같은 단위, 부분 결과는 저장 안 함).
+    """
+    from collectors.sector_collector import SectorETFCollector
+    from collectors.news_collector import NewsCollector
+    from analyzers.aggregation import SectorScoreAccumulator
+    from analyzers.dedup import NearDuplicateDetector, analyze_deduplicated
+    from analyzers.trend_engine import SentimentTrendEngine
+    from reporters.export_utils import dataset_version, news_to_frame
+    from reporters.report_jobs import get_report_queue
+    from storage.history_store import SentimentHistoryStore
+    from storage.report_archive import ReportArchive
+
+    if analyzer is None:
+        from analyzers.sentiment_analyzer import SentimentAnalyzer
+        analyzer = SentimentAnalyzer(use_finbert=False)
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    deadline = Deadline(budget_seconds or Config.DASHBOARD_BUDGET_SECONDS)
+    fetch_deadline = deadline.stage(Config.BUDGET_FETCH_SHARE)
+
+    def report(message: str, progress: float, partial: Optional[Dict] = None):
+        if progress_callback:
+            progress_callback(message, progress, partial)
+
+    report("📊 섹터 ETF Holdings 수집 중...", 0.0)
+    sector_collector = SectorETFCollector(deadline=fetch_deadline)
+
+    def collect_holdings():
+        holdings = sector_collector.collect_all_sector_holdings(top_n=top_n)
+        # 마감 후에는 대체 Holdings가 들어가므로 캐시하지 않음
+        if fetch_deadline.expired():
+            raise IncompleteResult(holdings)
+        return holdings
+
+    sector_holdings = _cached_stage(holdings_cache, f"holdings:{top_n}", collect_holdings)
+
+    news_collector = NewsCollector(days=Config.NEWS_DAYS, deadline=fetch_deadline)
+    accumulator = SectorScoreAccumulator()
+    analyzed_news: List[Dict] = []
+
+    for idx, (sector, data) in enumerate(sector_holdings.items()):
+        portfolio = sector_collector.get_portfolio_for_news({sector: data})
+        tickers = [item['ticker'] for item in portfolio]
+        sector_news = _cached_stage(
+            news_cache, f"news:{Config.NEWS_DAYS}:{today}:{','.join(tickers)}",
+            lambda: raise_if_cut(news_collector.collect_all_news(portfolio, verbose=False),
+                                 tickers, fetch_deadline))
+        # 분석이 점수/cluster_id를 기록하므로 캐시된 원본 대신 복사본 사용
+        sector_news = [dict(news) for news in sector_news]
+
+        # 중복은 섹터 안에서만 제거하므로 탐지기는 섹터마다 새로 (세션별 실행의 score_news_stage와 같음)
+        if Config.DEDUP_ENABLED:
+            detector = NearDuplicateDetector(threshold=Config.DEDUP_THRESHOLD)
+            analyzed = analyze_deduplicated(analyzer, sector_news, detector, verbose=False,
+                                            deadline=deadline)
+        else:
+            analyzed = analyzer.batch_analyze(sector_news, verbose=False, deadline=deadline)
+
+        analyzed_news.extend(analyzed)
+        accumulator.add(analyzed)
+        report(f"📰 {sector} 완료 ({idx + 1}/{len(sector_holdings)})",
+               0.9 * (idx + 1) / len(sector_holdings),
+               {'sector': sector, 'scores': accumulator.scores(), 'news_count': len(analyzed_news)})
+
+    coverage = sector_coverage(sector_collector.get_portfolio_for_news(sector_holdings),
+                               deadline.skipped)
+    print_coverage(coverage)
+
+    report("💾 히스토리 저장 및 트렌드 계산 중...", 0.9)
+    df = news_to_frame(analyzed_news, sector_holdings)
+
+    store = SentimentHistoryStore(Config.HISTORY_DB_PATH)
+    store.save_news(analyzed_news)
+    ReportArchive(Config.ARCHIVE_DIR).write_day(today, analyzed_news, sector_holdings)
+    trend = SentimentTrendEngine.from_config().compute_from_store(
+        store, today, lookback_days=Config.TREND_LOOKBACK_DAYS
+    )
+
+    report_job_id = get_report_queue().submit(analyzed_news, sector_holdings, today, trend=trend)
+    report("✅ 분석 완료!", 1.0)
+
+    return DashboardSnapshot(
+        version=dataset_version(df),
+        created_at=datetime.now().isoformat(timespec='seconds'),
+        df=df,
+        sector_scores=accumulator.scores(),
+        sector_holdings=sector_holdings,
+        trend=trend,
+        report_job_id=report_job_id,
+        coverage=coverage
+    )
+
+class SnapshotRefresher:
+    """프로세스당 하나 - 일정 간격으로 build()를 실행해 최신 스냅샷을 교체
+
+    세션은 latest()로 참조만 가져가므로 접속자 수와 관계없이
+    외부 요청은 새로 고침 주기에만 비례합니다.
+    """
+
+    def __init__(self, build: Optional[Callable[..., DashboardSnapshot]] = None,
+                 interval_seconds: Optional[float] = None,
+                 store: Optional[SnapshotStore] = None):
+        """build: progress_callback 키워드 인자를 받는 스냅샷 생성 함수
+        (기본: news_cache/holdings_cache를 쓰는 build_snapshot)
+        store: 스냅샷을 게시할 저장소 (기본: 프로세스 공용)
+        """
+        self.interval_seconds = interval_seconds or Config.REFRESH_INTERVAL_MINUTES * 60
+        # 세션별 실행의 st.cache_data 단계 캐시에 해당 (공용 모드에서는 이 캐시를 비움)
+        self.news_cache = FetchCache(ttl_seconds=self.interval_seconds)
+        self.holdings_cache = FetchCache(ttl_seconds=Config.HOLDINGS_CACHE_TTL_HOURS * 3600)
+        self.build = build or partial(build_snapshot, news_cache=self.news_cache,
+                                      holdings_cache=self.holdings_cache)
+        self.store = store or get_snapshot_store()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._published = threading.Condition(self._lock)
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.running = False
+        self.last_error: Optional[str] = None
+        self.last_duration: Optional[float] = None
+        self.next_run_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._progress: Dict = {'message': '', 'progress': 0.0, 'scores': {}, 'news_count': 0}
+
+    def start(self) -> 'SnapshotRefresher':
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='snapshot-refresher',
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def refresh_now(self) -> bool:
+        """다음 주기를 기다리지 않고 바로 새로 고침 → 요청 접수 여부
+
+        실행 중이거나 마지막 실행 후 Config.PIPELINE_MIN_INTERVAL_SECONDS가
+        지나지 않았으면 무시합니다.
+        """
+        if self.running:
+            return False
+        if (self.finished_at is not None
+                and time.monotonic() - self.finished_at < Config.PIPELINE_MIN_INTERVAL_SECONDS):
+            return False
+        self._wake.set()
+        return True
+
+    def invalidate(self, holdings: bool = False):
+        """뉴스 캐시를 비우고 (holdings=True면 Holdings도) 바로 새로 고침
+
+        refresh_now()와 달리 최소 간격을 무시하며, 실행 중이면 끝난 뒤 한 번 더 실행합니다.
+        """
+        self.news_cache.clear()
+        if holdings:
+            self.holdings_cache.clear()
+        self._wake.set()
+
+    def latest(self) -> Optional[DashboardSnapshot]:
+        return self.store.latest()
+
+    def wait_for_snapshot(self, timeout: Optional[float] = None) -> Optional[DashboardSnapshot]:
+        """첫 스냅샷이 게시될 때까지 대기"""
+        with self._published:
+            if self.store.latest() is None:
+                self._published.wait(timeout)
+            return self.store.latest()
+
+    def progress(self) -> Dict:
+        """진행 중인 새로 고침의 부분 결과 {'message', 'progress', 'scores', 'news_count'}"""
+        return self._progress
+
+    def _on_progress(self, message: str, progress: float, partial: Optional[Dict] = None):
+        # 매번 새 딕셔너리로 교체 (읽는 쪽은 잠금 없이 일관된 값을 봄)
+        current = self._progress
+        self._progress = {
+            'message': message,
+            'progress': progress,
+            'scores': partial['scores'] if partial else current['scores'],
+            'news_count': partial['news_count'] if partial else current['news_count']
+        }
+
+    def status(self) -> Dict:
+        snapshot = self.store.latest()
+        return {
+            'running': self.running,
+            'version': snapshot.version if snapshot else None,
+            'created_at': snapshot.created_at if snapshot else None,
+            'last_error': self.last_error,
+            'last_duration': self.last_duration,
+            'next_run_in': (max(0.0, self.next_run_at - time.monotonic())
+                            if self.next_run_at else None)
+        }
+
+    def _refresh(self):
+        self.running = True
+        self._progress = {'message': '', 'progress': 0.0, 'scores': {}, 'news_count': 0}
+        start = time.perf_counter()
+        try:
+            snapshot = self.build(progress_callback=self._on_progress)
+            with self._published:
+                self.store.publish(snapshot)
+                self._published.notify_all()
+            self.last_error = None
+            print(f"✅ 스냅샷 게시: {snapshot.version} ({len(snapshot.df)}행)")
+        except Exception as e:
+            # 실패해도 이전 스냅샷은 그대로 유지
+            self.last_error = str(e)
+            print(f"❌ 스냅샷 새로 고침 실패: {e}")
+            traceback.print_exc()
+        finally:
+            self.last_duration = time.perf_counter() - start
+            self.finished_at = time.monotonic()
+            self.running = False
+
+    def _loop(self):
+        while not self._stopped.is_set():
+            self._refresh()
+
+            self.next_run_at = time.monotonic() + self.interval_seconds
+            self._wake.wait(self.interval_seconds)
+            self._wake.clear()
@@ -0,0 +1,87 @@
+"""
+파이프라인 실행 합치기 (single-flight) - 같은 파라미터의 동시 실행은 한 번만
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """키별로 실행 중인 작업이 있으면 새로 시작하지 않고 그 결과를 함께 받음
+
+    min_interval_seconds > 0 이면 같은 키의 마지막 실행이 끝난 지 그 시간이
+    지나지 않았을 때 다시 실행하지 않고 직전 결과를 돌려줍니다 (외부 요청 간격 보장).
+    직전 결과는 최소 간격 동안만 보관합니다 (0이면 보관하지 않음).
+    """
+
+    def __init__(self, min_interval_seconds: float = 0.0):
+        self.min_interval_seconds = min_interval_seconds
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._last: Dict[Hashable, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def run(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """fn() 결과 → (값, 공유 여부)
+
+        공유 여부가 True면 다른 호출자의 실행(진행 중이거나 최소 간격 안의 직전 결과)을
+        받은 것입니다. 실행 중 예외는 기다리던 호출자 모두에게 전달됩니다.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                last = self._last.get(key)
+                if (last is not None and self.min_interval_seconds > 0
+                        and time.monotonic() - last[0] < self.min_interval_seconds):
+                    return last[1], True
+
+                flight = self._flights[key] = _Flight()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value, True
+
+        try:
+            flight.value = fn()
+            if self.min_interval_seconds > 0:
+                with self._lock:
+                    self._remember(key, flight.value)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+        return flight.value, False
+
+    def _remember(self, key: Hashable, value: Any):
+        """직전 결과 저장 (_lock 안에서 호출) - 최소 간격이 지난 다른 키의 결과는 버림"""
+        now = time.monotonic()
+        expired = [k for k, (finished_at, _) in self._last.items()
+                   if now - finished_at >= self.min_interval_seconds]
+        for k in expired:
+            del self._last[k]
+        self._last[key] = (now, value)
+
+    def in_flight(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._flights
+
+    def forget(self, key: Optional[Hashable] = None):
+        """직전 결과 삭제 (다음 호출은 최소 간격과 관계없이 실행)"""
+        with self._lock:
+            if key is None:
+                self._last.clear()
+            else:
+                self._last.pop(key, None)
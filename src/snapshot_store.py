@@ -0,0 +1,97 @@
+"""
+프로세스 공용 스냅샷 저장소 - 세션은 버전 ID만 들고 같은 객체를 참조
+"""
+import threading
+import weakref
+from typing import Dict, Optional
+
+class SnapshotLease:
+    """세션이 들고 있는 스냅샷 참조 (세션 상태와 함께 사라지면 자동 반납)"""
+
+    def __init__(self, store: 'SnapshotStore', version: str):
+        self.version = version
+        self._store = store
+        self._finalizer = weakref.finalize(self, store.release, version)
+
+    @property
+    def snapshot(self):
+        return self._store.get(self.version)
+
+    def release(self):
+        """명시적 반납 (여러 번 호출해도 한 번만 반납)"""
+        self._finalizer()
+
+class SnapshotStore:
+    """버전 ID별 스냅샷 1개씩 보관 + 참조 카운트
+
+    - 같은 버전을 다시 게시하면 기존 객체를 그대로 사용 (세션 수만큼 복사하지 않음)
+    - 최신 버전과 참조 중인 버전만 유지하고, 마지막 참조가 반납되면 해제
+    - 게시된 스냅샷은 읽기 전용으로 취급 (수정하면 모든 세션에 보임)
+    """
+
+    def __init__(self):
+        self._snapshots: Dict[str, object] = {}
+        self._refs: Dict[str, int] = {}
+        self._latest: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def publish(self, snapshot):
+        """스냅샷 등록 후 최신으로 지정 → 저장소에 있는 객체 (같은 버전이 있으면 기존 객체)"""
+        with self._lock:
+            version = snapshot.version
+            stored = self._snapshots.setdefault(version, snapshot)
+            self._refs.setdefault(version, 0)
+
+            if self._latest != version:
+                previous, self._latest = self._latest, version
+                self._evict(previous)
+            return stored
+
+    def lease(self, version: str) -> SnapshotLease:
+        """버전 참조 획득 (없는 버전이면 KeyError)"""
+        with self._lock:
+            if version not in self._snapshots:
+                raise KeyError(version)
+            self._refs[version] += 1
+        return SnapshotLease(self, version)
+
+    def release(self, version: str):
+        with self._lock:
+            if version not in self._refs:
+                return
+            self._refs[version] -= 1
+            self._evict(version)
+
+    def _evict(self, version: Optional[str]):
+        # 잠금을 잡은 상태에서 호출
+        if version is None or version == self._latest or self._refs.get(version, 0) > 0:
+            return
+        self._snapshots.pop(version, None)
+        self._refs.pop(version, None)
+
+    def get(self, version: str):
+        return self._snapshots.get(version)
+
+    def latest(self):
+        snapshot_id = self._latest
+        return self._snapshots.get(snapshot_id) if snapshot_id else None
+
+    def stats(self) -> Dict:
+        """{'versions', 'latest', 'refs': {버전: 참조 수}}"""
+        with self._lock:
+            return {
+                'versions': len(self._snapshots),
+                'latest': self._latest,
+                'refs': dict(self._refs)
+            }
+
+_default_store: Optional[SnapshotStore] = None
+_default_lock = threading.Lock()
+
+def get_snapshot_store() -> SnapshotStore:
+    """프로세스 공용 스냅샷 저장소"""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = SnapshotStore()
+        return _default_store
@@ -0,0 +1,103 @@
+"""
+유니버스 모드 - 여러 ETF의 전체 Holdings를 고유 티커 기준으로 수집/분석
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from config.config import Config
+from collectors.sector_collector import SectorETFCollector
+from collectors.news_collector import NewsCollector
+from analyzers.sentiment_analyzer import SentimentAnalyzer
+from analyzers.trend_engine import SentimentTrendEngine
+from analyzers.dedup import NearDuplicateDetector, analyze_deduplicated, drop_sector_duplicates
+from reporters.excel_generator_sector import SectorETFExcelGenerator
+from reporters.excel_streaming import StreamingSectorExcelGenerator
+from storage.history_store import SentimentHistoryStore
+from storage.report_archive import ReportArchive
+
+def parse_etf_list(etfs: Optional[str]) -> Optional[Dict[str, str]]:
+    """'XLK,XLF,SPY' → {ETF: 섹터명} (섹터 ETF가 아니면 ETF 티커를 섹터명으로)"""
+    if not etfs:
+        return None
+
+    tickers = [t.strip().upper() for t in etfs.split(',') if t.strip()]
+    return {t: Config.SECTOR_ETFS.get(t, t) for t in tickers}
+
+def run_universe_pipeline(sector_etfs: Optional[Dict[str, str]] = None,
+                          top_n: Optional[int] = None):
+    """전체 Holdings 유니버스 파이프라인
+
+    1. 모든 ETF의 Holdings 수집 (top_n=None이면 전체)
+    2. 고유 티커 집합으로 정리 → 티커당 한 번만 수집/분석
+    3. 분석 결과를 각 (ETF, 비중) 소속에 다시 연결
+
+    요청 수는 전체 Holdings 수가 아니라 고유 티커 수에 비례합니다.
+    """
+    print("\n" + "="*70)
+    print("섹터 ETF 감성분석 - 유니버스 모드")
+    print("="*70)
+
+    Config.ensure_directories()
+
+    # 1. Holdings 수집
+    print("\n[1/4] ETF Holdings 수집...")
+    sector_collector = SectorETFCollector(sector_etfs)
+    sector_holdings = sector_collector.collect_all_sector_holdings(top_n=top_n)
+    universe = sector_collector.build_universe(sector_holdings)
+
+    total_holdings = sum(len(d['holdings']) for d in sector_holdings.values())
+    print(f"✅ {len(sector_holdings)}개 ETF, Holdings {total_holdings}개 → 고유 종목 {len(universe)}개")
+
+    # 2. 고유 티커 뉴스 수집
+    print("\n[2/4] 뉴스 수집 (고유 종목 기준)...")
+    news_collector = NewsCollector(days=Config.NEWS_DAYS)
+    news_by_ticker = news_collector.collect_unique_news(universe)
+
+    # 3. 고유 뉴스 분석 (티커당 1회)
+    print("\n[3/4] 감성 분석...")
+    analyzer = SentimentAnalyzer(use_finbert=False)
+    unique_news: List[Dict] = [n for items in news_by_ticker.values() for n in items]
+    if Config.DEDUP_ENABLED:
+        detector = NearDuplicateDetector(threshold=Config.DEDUP_THRESHOLD)
+        kept = analyze_deduplicated(analyzer, unique_news, detector)
+        news_by_ticker = {}
+        for news in kept:
+            news_by_ticker.setdefault(news['ticker'], []).append(news)
+        unique_news = kept
+    else:
+        analyzer.batch_analyze(unique_news)  # 딕셔너리를 직접 갱신
+
+    analyzed_news = sector_collector.join_news_to_memberships(news_by_ticker, universe)
+    if Config.DEDUP_ENABLED:
+        # 고유 종목 단위로는 섹터를 몰라 소속 연결 후 섹터 안 중복 제거
+        analyzed_news = drop_sector_duplicates(analyzed_news)
+    print(f"✅ 고유 뉴스 {len(unique_news)}개 분석 → 소속별 {len(analyzed_news)}행")
+
+    # 히스토리 저장 + 트렌드
+    today = datetime.now().strftime('%Y-%m-%d')
+    store = SentimentHistoryStore(Config.HISTORY_DB_PATH)
+    store.save_news(analyzed_news)
+    ReportArchive(Config.ARCHIVE_DIR).write_day(today, analyzed_news, sector_holdings)
+    trend = SentimentTrendEngine.from_config().compute_from_store(
+        store, today, lookback_days=Config.TREND_LOOKBACK_DAYS
+    )
+
+    # 4. 엑셀 생성
+    print("\n[4/4] 엑셀 리포트 생성...")
+    if len(analyzed_news) >= Config.STREAMING_REPORT_MIN_ROWS:
+        generator = StreamingSectorExcelGenerator(Config.REPORT_DIR)
+    else:
+        generator = SectorETFExcelGenerator(Config.REPORT_DIR)
+    report_path = generator.generate_sector_report(
+        analyzed_news,
+        sector_holdings,
+        today,
+        trend=trend
+    )
+
+    print("\n" + "="*70)
+    print("✅ 완료!")
+    print(f"✅ 리포트: {report_path}")
+    print("="*70 + "\n")
+
+    return report_path, analyzed_news, sector_holdings
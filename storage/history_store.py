@@ -0,0 +1,228 @@
+"""
+감성 히스토리 저장소 - SQLite 기반
+"""
+import hashlib
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+NEWS_COLUMNS = [
+    'news_id', 'etf', 'sector', 'ticker', 'company_name', 'weight',
+    'category', 'title', 'url', 'summary', 'source', 'published_at',
+    'sentiment_score', 'collected_at'
+]
+
+class SentimentHistoryStore:
+    """분석된 뉴스를 날짜별로 누적 저장"""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_schema()
+
+    @contextmanager
+    def _connect(self):
+        """커넥션 열기 (정상 종료 시 커밋, 항상 닫기)"""
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _init_schema(self):
+        """테이블/인덱스 생성"""
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS news (
+                    news_id TEXT NOT NULL,
+                    etf TEXT NOT NULL DEFAULT '',
+                    sector TEXT,
+                    ticker TEXT,
+                    company_name TEXT,
+                    weight REAL,
+                    category TEXT,
+                    title TEXT,
+                    url TEXT,
+                    summary TEXT,
+                    source TEXT,
+                    published_at TEXT,
+                    sentiment_score REAL,
+                    collected_at TEXT,
+                    run_id TEXT,
+                    PRIMARY KEY (news_id, etf)
+                )
+            """)
+            # 이전 버전 DB에는 run_id 열이 없음
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(news)")}
+            if 'run_id' not in existing:
+                conn.execute("ALTER TABLE news ADD COLUMN run_id TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_news_date ON news (published_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_news_run ON news (run_id)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_news_ticker ON news (ticker, published_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS backfill_days (
+                    day TEXT PRIMARY KEY,
+                    news_count INTEGER,
+                    completed_at TEXT
+                )
+            """)
+
+    @staticmethod
+    def make_news_id(news: Dict) -> str:
+        """티커 + URL(없으면 제목) 기반 뉴스 ID"""
+        key = news.get('url') or news.get('title', '')
+        raw = f"{news.get('ticker', '')}|{key}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def save_news(self, analyzed_news: Iterable[Dict], run_id: Optional[str] = None) -> int:
+        """분석된 뉴스 저장 (같은 뉴스는 덮어쓰기)
+
+        run_id: 저장한 실행 표시 - iter_news/sector_scores에서 이 실행이 쓴 행만 조회할 때 사용
+        """
+        collected_at = datetime.now().isoformat(timespec='seconds')
+
+        rows = []
+        for news in analyzed_news:
+            rows.append((
+                self.make_news_id(news),
+                news.get('etf', '') or '',
+                news.get('sector', ''),
+                news.get('ticker', ''),
+                news.get('company_name', ''),
+                news.get('weight', 0.0),
+                news.get('category', 'General'),
+                news.get('title', ''),
+                news.get('url', ''),
+                news.get('summary', ''),
+                news.get('source', ''),
+                news.get('published_at', '')[:10],
+                news.get('sentiment_score', 0.0),
+                collected_at,
+                run_id
+            ))
+
+        if not rows:
+            return 0
+
+        columns = NEWS_COLUMNS + ['run_id']
+        placeholders = ", ".join("?" * len(columns))
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO news ({', '.join(columns)}) VALUES ({placeholders})",
+                rows
+            )
+
+        return len(rows)
+
+    def load_frame(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                   columns: Optional[List[str]] = None, unique_news: bool = False) -> pd.DataFrame:
+        """기간별 뉴스 DataFrame 조회 (날짜는 'YYYY-MM-DD')
+
+        unique_news: 여러 ETF에 속한 종목의 같은 뉴스를 한 행으로 (티커 단위 통계용)
+        """
+        columns = columns or NEWS_COLUMNS
+        query = f"SELECT {', '.join(columns)} FROM news WHERE 1=1"
+        params = []
+
+        if start_date:
+            query += " AND published_at >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND published_at <= ?"
+            params.append(end_date)
+        if unique_news:
+            query += " GROUP BY news_id"
+
+        with self._connect() as conn:
+            return pd.read_sql_query(query, conn, params=params)
+
+    def iter_news(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                  batch_size: int = 1000, run_id: Optional[str] = None) -> Iterator[Dict]:
+        """기간별 뉴스를 섹터/티커 순으로 한 행씩 반환 (스트리밍 리포트용)
+
+        run_id: 주면 그 실행이 저장한 행만
+        """
+        query = f"SELECT {', '.join(NEWS_COLUMNS)} FROM news WHERE 1=1"
+        params = []
+
+        if run_id:
+            query += " AND run_id = ?"
+            params.append(run_id)
+        if start_date:
+            query += " AND published_at >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND published_at <= ?"
+            params.append(end_date)
+        query += " ORDER BY sector, ticker, published_at DESC"
+
+        with self._connect() as conn:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(zip(NEWS_COLUMNS, row))
+
+    def sector_scores(self, start_date: Optional[str] = None,
+                      end_date: Optional[str] = None,
+                      run_id: Optional[str] = None) -> Dict[str, Dict]:
+        """기간별 섹터 Simple / Weighted 평균 (SQL 집계, run_id를 주면 그 실행이 저장한 행만)"""
+        query = """
+            SELECT sector, MAX(etf), AVG(sentiment_score),
+                   SUM(sentiment_score * weight), SUM(weight), COUNT(*)
+            FROM news WHERE 1=1
+        """
+        params = []
+
+        if run_id:
+            query += " AND run_id = ?"
+            params.append(run_id)
+        if start_date:
+            query += " AND published_at >= ?"
+            params.append(start_date)
+        if end_date:
+            query += " AND published_at <= ?"
+            params.append(end_date)
+        query += " GROUP BY sector"
+
+        scores = {}
+        with self._connect() as conn:
+            for sector, etf, simple, weighted_sum, weight_sum, count in conn.execute(query, params):
+                weighted = weighted_sum / weight_sum if weight_sum else simple
+                scores[sector] = {
+                    'etf': etf,
+                    'simple': round(simple, 4),
+                    'weighted': round(weighted, 4),
+                    'count': count
+                }
+
+        return scores
+
+    def count(self) -> int:
+        """저장된 뉴스 수"""
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM news").fetchone()[0]
+
+    def completed_backfill_days(self) -> set:
+        """백필 완료된 날짜 목록 (그날이 끝나기 전에 기록된 항목은 미완료로 봄)"""
+        with self._connect() as conn:
+            return {row[0] for row in conn.execute(
+                "SELECT day FROM backfill_days WHERE completed_at >= date(day, '+1 day')"
+            )}
+
+    def mark_backfill_day(self, day: str, news_count: int):
+        """백필 날짜 완료 기록 (재실행 시 건너뛰기용)"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO backfill_days (day, news_count, completed_at) VALUES (?, ?, ?)",
+                (day, news_count, datetime.now().isoformat(timespec='seconds'))
+            )
@@ -0,0 +1,248 @@
+"""
+리포트 아카이브 - 날짜별 Parquet 파티션 + 섹터별 row group + manifest 색인
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from analyzers.aggregation import SectorScoreAccumulator
+
+MANIFEST_NAME = 'manifest.json'
+LOCK_NAME = '.archive.lock'
+
+# 아카이브 루트별 프로세스 내 잠금 (ReportArchive 인스턴스를 매번 새로 만들어도 공유)
+_root_locks: Dict[str, threading.Lock] = {}
+_root_locks_guard = threading.Lock()
+
+def _root_lock(root: Path) -> threading.Lock:
+    key = str(root.resolve())
+    with _root_locks_guard:
+        return _root_locks.setdefault(key, threading.Lock())
+
+@contextmanager
+def _file_lock(path: Path):
+    """다른 프로세스(대시보드/CLI)와의 배타 잠금 - POSIX는 fcntl, Windows는 msvcrt"""
+    with open(path, 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+class ReportArchive:
+    """하루치 분석 결과를 date=YYYY-MM-DD/news.parquet 하나로 저장
+
+    - 섹터마다 row group 하나 (섹터만 읽을 때 해당 row group만 디코딩)
+    - manifest.json에 날짜/섹터별 행 수, 집계 합계, row group 번호와 파일 오프셋 기록
+    - 여러 날짜 요약/추이는 manifest만 읽어 계산
+    - 쓰기는 루트별 잠금(스레드) + 잠금 파일(프로세스)로 직렬화, 파티션은 임시 파일 후 이름 변경
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.root / MANIFEST_NAME
+        self._lock = _root_lock(self.root)
+
+    # ---------- manifest ----------
+
+    def load_manifest(self) -> Dict:
+        """{'days': {날짜: {'path', 'rows', 'bytes', 'written_at', 'sectors': {...}}}}"""
+        if not self.manifest_path.exists():
+            return {'days': {}}
+        return json.loads(self.manifest_path.read_text(encoding='utf-8'))
+
+    def _save_manifest(self, manifest: Dict):
+        # 쓰는 도중 읽어도 깨진 파일을 보지 않도록 교체 방식으로 기록
+        tmp_path = self.manifest_path.with_suffix(f'.json.{os.getpid()}.tmp')
+        tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=1), encoding='utf-8')
+        tmp_path.replace(self.manifest_path)
+
+    def days(self) -> List[str]:
+        return sorted(self.load_manifest()['days'])
+
+    # ---------- 쓰기 ----------
+
+    @contextmanager
+    def _writing(self):
+        with self._lock, _file_lock(self.root / LOCK_NAME):
+            yield
+
+    def write_day(self, date_str: str, analyzed_news: Iterable[Dict],
+                  sector_holdings: Dict) -> Dict:
+        """하루치 파티션 기록 (같은 날짜는 덮어씀) → manifest 항목"""
+        import pyarrow.parquet as pq
+        from reporters.export_utils import news_to_frame, to_arrow_table
+
+        analyzed_news = sorted(analyzed_news, key=lambda n: n.get('sector', 'Unknown'))
+        df = news_to_frame(analyzed_news, sector_holdings)
+
+        accumulator = SectorScoreAccumulator()
+        accumulator.add(analyzed_news)
+        totals = accumulator.totals()
+
+        day_dir = self.root / f"date={date_str}"
+        day_dir.mkdir(exist_ok=True)
+        path = day_dir / "news.parquet"
+        tmp_path = day_dir / f"news.parquet.{os.getpid()}.{threading.get_ident()}.tmp"
+
+        sectors = []
+        if len(df):
+            # 임시 파일에 쓴 뒤 잠금 안에서 교체 (읽는 쪽은 항상 완성된 파일만 봄)
+            table = to_arrow_table(df)
+            with pq.ParquetWriter(str(tmp_path), table.schema, compression='zstd') as writer:
+                start = 0
+                for sector, rows in df.groupby('Sector', sort=False).size().items():
+                    writer.write_table(table.slice(start, rows), row_group_size=rows)
+                    sectors.append(sector)
+                    start += rows
+
+            metadata = pq.ParquetFile(str(tmp_path)).metadata
+            nbytes = tmp_path.stat().st_size
+
+        entry = {
+            'path': str(path.relative_to(self.root)) if sectors else None,
+            'rows': len(df),
+            'bytes': nbytes if sectors else 0,
+            'written_at': datetime.now().isoformat(timespec='seconds'),
+            'sectors': {}
+        }
+
+        for i, sector in enumerate(sectors):
+            row_group = metadata.row_group(i)
+            sector_totals = totals[sector]
+            entry['sectors'][sector] = {
+                'etf': sector_totals['etf'] or sector_holdings.get(sector, {}).get('etf', ''),
+                'rows': row_group.num_rows,
+                'sum': sector_totals['sum'],
+                'weighted_sum': sector_totals['weighted_sum'],
+                'weight_sum': sector_totals['weight_sum'],
+                'row_group': i,
+                'offset': row_group.column(0).file_offset,
+                'bytes': row_group.total_byte_size
+            }
+
+        try:
+            self._commit_day(date_str, entry, tmp_path if sectors else None, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        return entry
+
+    def _commit_day(self, date_str: str, entry: Dict, tmp_path: Optional[Path], path: Path):
+        """파티션 교체 + manifest 갱신 (잠금 안에서)"""
+        with self._writing():
+            if tmp_path is not None:
+                os.replace(tmp_path, path)
+            elif path.exists():
+                path.unlink()
+            manifest = self.load_manifest()
+            manifest['days'][date_str] = entry
+            self._save_manifest(manifest)
+
+    # ---------- 읽기 ----------
+
+    def _selected_days(self, manifest: Dict, start_date: Optional[str],
+                       end_date: Optional[str]) -> List[str]:
+        return [d for d in sorted(manifest['days'])
+                if (start_date is None or d >= start_date)
+                and (end_date is None or d <= end_date)]
+
+    def sector_daily(self, start_date: Optional[str] = None,
+                     end_date: Optional[str] = None) -> pd.DataFrame:
+        """날짜별/섹터별 집계 (manifest만 사용)
+
+        Returns:
+            columns: date, sector, etf, count, simple, weighted
+        """
+        manifest = self.load_manifest()
+        records = []
+
+        for day in self._selected_days(manifest, start_date, end_date):
+            for sector, info in manifest['days'][day]['sectors'].items():
+                simple = info['sum'] / info['rows']
+                weighted = (info['weighted_sum'] / info['weight_sum']
+                            if info['weight_sum'] > 0 else simple)
+                records.append({
+                    'date': day,
+                    'sector': sector,
+                    'etf': info['etf'],
+                    'count': info['rows'],
+                    'simple': round(simple, 4),
+                    'weighted': round(weighted, 4)
+                })
+
+        return pd.DataFrame(records, columns=['date', 'sector', 'etf', 'count', 'simple', 'weighted'])
+
+    def sector_scores(self, start_date: Optional[str] = None,
+                      end_date: Optional[str] = None) -> Dict[str, Dict]:
+        """기간 전체 섹터 점수 {섹터: {'etf', 'simple', 'weighted', 'count'}} (manifest만 사용)"""
+        manifest = self.load_manifest()
+        totals: Dict[str, Dict] = {}
+
+        for day in self._selected_days(manifest, start_date, end_date):
+            for sector, info in manifest['days'][day]['sectors'].items():
+                t = totals.setdefault(sector, {'etf': info['etf'], 'sum': 0.0,
+                                               'weighted_sum': 0.0, 'weight_sum': 0.0,
+                                               'count': 0})
+                t['sum'] += info['sum']
+                t['weighted_sum'] += info['weighted_sum']
+                t['weight_sum'] += info['weight_sum']
+                t['count'] += info['rows']
+
+        result = {}
+        for sector, t in totals.items():
+            simple = t['sum'] / t['count']
+            weighted = t['weighted_sum'] / t['weight_sum'] if t['weight_sum'] > 0 else simple
+            result[sector] = {
+                'etf': t['etf'],
+                'simple': round(simple, 4),
+                'weighted': round(weighted, 4),
+                'count': t['count']
+            }
+        return result
+
+    def read(self, start_date: Optional[str] = None, end_date: Optional[str] = None,
+             sectors: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """기간/섹터의 뉴스 행 (필요한 파티션의 필요한 row group만 읽음)"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        manifest = self.load_manifest()
+        wanted = set(sectors) if sectors is not None else None
+        tables = []
+
+        for day in self._selected_days(manifest, start_date, end_date):
+            entry = manifest['days'][day]
+            groups = [info['row_group'] for sector, info in entry['sectors'].items()
+                      if wanted is None or sector in wanted]
+            if not groups:
+                continue
+
+            parquet_file = pq.ParquetFile(str(self.root / entry['path']))
+            table = parquet_file.read_row_groups(sorted(groups))
+            tables.append(table.append_column('Report Date', pa.array([day] * table.num_rows)))
+
+        if not tables:
+            return pd.DataFrame()
+
+        # 날짜마다 dictionary가 달라 합칠 때 통합
+        return pa.concat_tables(tables, promote_options='default').unify_dictionaries().to_pandas()